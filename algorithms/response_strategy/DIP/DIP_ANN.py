@@ -1,3 +1,6 @@
+from functools import lru_cache
+
+import numpy as np
 import torch
 import torch.nn as nn
 from torch.utils.data import DataLoader,Dataset
@@ -7,6 +10,7 @@ E_min = 0.005
 T_max = 10
 learning_rate = 0.1
 
+@lru_cache(maxsize=None)
 def select_device():
     # 检查CUDA是否可用
     if torch.cuda.is_available():
@@ -77,10 +81,40 @@ def train(model: ANN, input, target, X_Low, X_Upp):
         E = epoch_loss / len(dataloader)
         T = T + 1
 
+def train_fast(model: ANN, input, target, X_Low, X_Upp, batch_size=0):
+    """
+    快速训练：不使用 DataLoader，数据一次性放到设备上，整批（batch_size<=0）或按小批量训练。
+    每轮只同步一次损失（用于终止判断），不再逐个样本调用 loss.item()
+    """
+    device = model.device
+    model = model.to(device)
+    input_norm = torch.as_tensor(data_normalize(input, X_Low, X_Upp), dtype=torch.float32, device=device)
+    target_norm = torch.as_tensor(data_normalize(target, X_Low, X_Upp), dtype=torch.float32, device=device)
+    optimizer = optim.SGD(model.parameters(), lr=learning_rate, momentum=0.8)
+
+    n = input_norm.size(0)
+    batch_size = n if batch_size <= 0 else min(int(batch_size), n)
+    T = 0
+    E = 1
+    while E > E_min and T < T_max:
+        order = torch.randperm(n, device=device)
+        epoch_loss = torch.zeros((), device=device)
+        for start in range(0, n, batch_size):
+            index = order[start:start + batch_size]
+            loss = criterion(model(input_norm[index]), target_norm[index])
+            epoch_loss += loss.detach() * len(index)
+            optimizer.zero_grad()
+            loss.backward()
+            optimizer.step()
+        E = epoch_loss.item() / n
+        T = T + 1
+
 def predict_by_ann(model: ANN, input, X_Low, X_Upp):
-    input_norm = torch.Tensor(data_normalize(input, X_Low, X_Upp)).to(model.device)
-    logits = model(input_norm)
-    result = inverse_data(logits.detach().cpu(), X_Low, X_Upp)
+    with torch.no_grad():
+        input_norm = torch.as_tensor(np.asarray(data_normalize(input, X_Low, X_Upp)), dtype=torch.float32,
+                                     device=model.device)
+        logits = model(input_norm)
+    result = inverse_data(logits.cpu(), X_Low, X_Upp)
     result = result.numpy()
     return result
 
@@ -0,0 +1,37 @@
+import numpy as np
+
+# 目标值在 logit 空间求解时的截断，避免 logit(0)/logit(1) 发散
+EPS = 1e-6
+
+
+def _sigmoid(x):
+    return 1 / (1 + np.exp(-x))
+
+
+class LstsqANN:
+    def __init__(self, dim, hidden):
+        """
+        纯 NumPy 的小网络，结构与 DIP_ANN.ANN 相同（dim -> hidden -> dim，两层 Sigmoid）。
+        隐藏层权重按 nn.Linear 的默认范围随机初始化后固定，输出层权重在 logit 空间用最小二乘一次求出，
+        不需要 torch，也不需要迭代训练
+        """
+        bound = 1 / np.sqrt(dim)
+        self.W1 = np.random.uniform(-bound, bound, size=(dim, hidden))
+        self.b1 = np.random.uniform(-bound, bound, size=hidden)
+        self.W2 = None
+
+    def _features(self, x):
+        H = _sigmoid(x @ self.W1 + self.b1)
+        return np.hstack([H, np.ones((len(H), 1))])
+
+    def fit(self, input, target, X_Low, X_Upp):
+        """按论文的方式把数据标准化到 [0, 1] 后求解输出层权重"""
+        x = (input - X_Low) / (X_Upp - X_Low)
+        y = np.clip((target - X_Low) / (X_Upp - X_Low), EPS, 1 - EPS)
+        self.W2 = np.linalg.lstsq(self._features(x), np.log(y / (1 - y)), rcond=None)[0]
+        return self
+
+    def predict(self, input, X_Low, X_Upp):
+        x = (input - X_Low) / (X_Upp - X_Low)
+        y = _sigmoid(self._features(x) @ self.W2)
+        return y * (X_Upp - X_Low) + X_Low
@@ -1,14 +1,25 @@
 import math
 import numpy as np
 
-from algorithms.response_strategy.DIP import DIP_ANN
 from algorithms.response_strategy.ResponseStrategy import ResponseStrategy
 from components.Population import Population
 from utils.evolution_tools import getNonDominate
 
+# 网络训练方式：paper 按论文逐个样本训练；fast 张量整批/小批量训练；lstsq 纯 NumPy 最小二乘求解（不需要 torch）
+TRAIN_MODES = ('paper', 'fast', 'lstsq')
+
 class DIP(ResponseStrategy):
-    def __init__(self):
+    def __init__(self, mode='paper', batch_size=0):
+        """
+        :param mode: 网络训练方式，见 TRAIN_MODES
+        :param batch_size: fast 模式的批大小，0 表示整批。整批时每轮只更新一次参数（最多 T_max 轮），
+                           拟合比逐样本训练弱，样本较多时建议设置小批量
+        """
         super().__init__()
+        if mode not in TRAIN_MODES:
+            raise ValueError(f"Unknown DIP mode: {mode}")
+        self.mode = mode
+        self.batch_size = int(batch_size)
 
     def response(self,population, problem, algorithm):
         X_Low = problem.xl
@@ -32,13 +43,28 @@ class DIP(ResponseStrategy):
             env_1_last_eval = list(env_1.keys())[-1]
             PS1 = env_1[env_1_last_eval]
 
-            ann = DIP_ANN.ANN(DIM, 5)
             input, target = get_input_target(PS2, PS1, N)
-            DIP_ANN.train(ann, input, target, X_Low, X_Upp)
-            population = DIP_init_pop(input, target, PS1.get_decision_matrix(), PS2.get_decision_matrix(), ann, X_Low, X_Upp, N)
+            predict = self.train_predictor(input, target, X_Low, X_Upp, DIM)
+            population = DIP_init_pop(input, target, PS1.get_decision_matrix(), PS2.get_decision_matrix(), predict, X_Low, X_Upp, N)
             population.update_objective_constrain(problem)
         return population
 
+    def train_predictor(self, input, target, X_Low, X_Upp, DIM):
+        """训练预测网络，返回预测函数 predict(X)"""
+        if self.mode == 'lstsq':
+            from algorithms.response_strategy.DIP.DIP_lstsq import LstsqANN
+            ann = LstsqANN(DIM, 5).fit(input, target, X_Low, X_Upp)
+            return lambda X: ann.predict(X, X_Low, X_Upp)
+
+        # DIP_ANN 依赖 torch，第一次需要预测时才导入
+        from algorithms.response_strategy.DIP import DIP_ANN
+        ann = DIP_ANN.ANN(DIM, 5)
+        if self.mode == 'fast':
+            DIP_ANN.train_fast(ann, input, target, X_Low, X_Upp, self.batch_size)
+        else:
+            DIP_ANN.train(ann, input, target, X_Low, X_Upp)
+        return lambda X: DIP_ANN.predict_by_ann(ann, X, X_Low, X_Upp)
+
 def get_input_target(PS2, PS1, N):
     non_pop1 = getNonDominate(PS1)
     non_pop2 = getNonDominate(PS2)
@@ -67,8 +93,8 @@ def get_input_target(PS2, PS1, N):
         target = x1
     return input, target
 
-def DIP_init_pop(input, target, PS1, PS2, ann, X_Low, X_Upp, N):
-    xl = DIP_ANN.predict_by_ann(ann, target, X_Low, X_Upp)
+def DIP_init_pop(input, target, PS1, PS2, predict, X_Low, X_Upp, N):
+    xl = predict(target)
     ns = xl.shape[0]
     need = N - ns
     random_factors1 = np.random.random(size=ns)[:, np.newaxis]
@@ -78,19 +104,16 @@ def DIP_init_pop(input, target, PS1, PS2, ann, X_Low, X_Upp, N):
     xp = target + part1 + part2
 
     #随机选取x_fill直到满足数量需要
-    x_fill = DIP_ANN.predict_by_ann(ann, PS1, X_Low, X_Upp)
+    x_fill = predict(PS1)
     rand_arr = np.random.choice(np.arange(len(x_fill)), size=need, replace=True)
     x_add = x_fill[rand_arr]
     #合并
     new_xp = np.vstack([xp, x_add])
 
-    # 边界处理
-    for i in range(N):
-        for j in range(new_xp.shape[1]):
-            if new_xp[i, j] < X_Low[j]:
-                new_xp[i, j] = 0.5 * (PS1[i, j] + X_Low[j])
-            if new_xp[i, j] > X_Upp[j]:
-                new_xp[i, j] = 0.5 * (PS1[i, j] + X_Upp[j])
+    # 边界处理（矢量化）：越界的分量取 PS1 对应分量与边界的中点，先处理下界再处理上界
+    PS1 = PS1[:N]
+    new_xp = np.where(new_xp < X_Low, 0.5 * (PS1 + X_Low), new_xp)
+    new_xp = np.where(new_xp > X_Upp, 0.5 * (PS1 + X_Upp), new_xp)
 
     population = Population(xl=X_Low, xu=X_Upp, X = new_xp)
     return population
\ No newline at end of file
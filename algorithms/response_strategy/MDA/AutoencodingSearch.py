@@ -3,6 +3,29 @@ import numpy as np
 from components.Population import Population
 
 
+def _solve_regularized(A, B, lambda_reg):
+    """
+    求解 (A + λI) X = B，A 为对称半正定矩阵。
+    优先使用 Cholesky 分解，矩阵数值上不正定时退回最小二乘（等价于伪逆）
+    """
+    from scipy.linalg import cho_factor, cho_solve  # 用到时再导入 scipy.linalg
+
+    regularized = A + lambda_reg * np.eye(A.shape[0])
+    try:
+        return cho_solve(cho_factor(regularized), B)
+    except np.linalg.LinAlgError:
+        return np.linalg.lstsq(regularized, B, rcond=None)[0]
+
+
+def _repair(ans, O, problem):
+    """矢量化边界处理：越界的分量取 O 中对应的值"""
+    xl_expanded = problem.xl.reshape(1, -1)
+    xu_expanded = problem.xu.reshape(1, -1)
+    ans = np.where(ans < xl_expanded, O, ans)
+    ans = np.where(ans > xu_expanded, O, ans)
+    return ans
+
+
 def linear_autoencoder(G, O, problem, lambda_reg=1e-6):
     """
     线性自编码器的映射矩阵 M
@@ -11,27 +34,10 @@ def linear_autoencoder(G, O, problem, lambda_reg=1e-6):
     lambda_reg: 正则化系数，防止矩阵奇异
     :return: 映射矩阵M
     """
-    # 计算 M = O @ G.T @ (G @ G.T + λI)^(-1)
+    # 原实现为 M = O @ G.T @ inv(inv(G @ G.T + λI))，两次求逆相互抵消，这里直接相乘，不再显式求逆
     GGT = G @ G.T
-    GGT_reg = GGT + lambda_reg * np.eye(GGT.shape[0])  # 添加正则化项
-    try:
-        # 尝试计算逆矩阵
-        GGT_inv = np.linalg.inv(GGT_reg)
-    except np.linalg.LinAlgError:
-        # 如果仍然奇异，使用伪逆
-        GGT_inv = np.linalg.pinv(GGT_reg)
-    M = O @ G.T @ np.linalg.inv(GGT_inv)
-    ans1 = M @ O
-    # 矢量化边界处理
-    # 将 xl 和 xu 扩展为与 next_population 相同的形状
-    xl_expanded = problem.xl.reshape(1, -1)
-    xu_expanded = problem.xu.reshape(1, -1)
-
-    below_lower_bound = ans1 < xl_expanded
-    above_upper_bound = ans1 > xu_expanded
-
-    ans1 = np.where(below_lower_bound, O, ans1)
-    ans1 = np.where(above_upper_bound, O, ans1)
+    M = (O @ G.T) @ (GGT + lambda_reg * np.eye(GGT.shape[0]))
+    ans1 = _repair(M @ O, O, problem)
     return Population(xl=problem.xl, xu=problem.xu, X=ans1)
 
 def kernel_autoencoder(G, O, problem, kernel='rbf', gamma=1.0, lambda_reg=1e-6):
@@ -45,46 +51,32 @@ def kernel_autoencoder(G, O, problem, kernel='rbf', gamma=1.0, lambda_reg=1e-6):
     :return: 映射矩阵Mk
     """
     # 计算核矩阵K(G, G)
-    K_GG = compute_kernel_matrix(G, kernel_type=kernel, gamma=gamma)
-    K_OO = compute_kernel_matrix(O, kernel_type=kernel, gamma=gamma)
-    # 计算 K(G, G) @ K(G, G)^T + λI
-    K_GGK_GGT = K_GG @ K_GG.T
-    K_GGK_GGT_reg = K_GGK_GGT + lambda_reg * np.eye(K_GGK_GGT.shape[0])  # 添加正则化项
-    try:
-        # 尝试计算逆矩阵
-        K_GGK_GGT_inv = np.linalg.inv(K_GGK_GGT_reg)
-    except np.linalg.LinAlgError:
-        # 如果仍然奇异，使用伪逆
-        K_GGK_GGT_inv = np.linalg.pinv(K_GGK_GGT_reg)
-    # 计算映射矩阵Mk (根据论文公式(5))
-    Mk = (O @ K_GG.T) @ K_GGK_GGT_inv
-    ans2 = Mk @ K_OO
-    # 矢量化边界处理
-    # 将 xl 和 xu 扩展为与 next_population 相同的形状
-    xl_expanded = problem.xl.reshape(1, -1)
-    xu_expanded = problem.xu.reshape(1, -1)
-
-    below_lower_bound = ans2 < xl_expanded
-    above_upper_bound = ans2 > xu_expanded
-
-    ans2 = np.where(below_lower_bound, O, ans2)
-    ans2 = np.where(above_upper_bound, O, ans2)
+    K_GG = compute_kernel_matrix(G, kernel, gamma)
+    K_OO = compute_kernel_matrix(O, kernel, gamma)
+    # 计算映射矩阵Mk (根据论文公式(5))：Mk = O K_GG^T (K_GG K_GG^T + λI)^(-1)
+    # 正则化矩阵对称，转置后用 Cholesky 分解求解，不显式求逆
+    Mk = _solve_regularized(K_GG @ K_GG.T, K_GG @ O.T, lambda_reg).T
+    ans2 = _repair(Mk @ K_OO, O, problem)
     return Population(xl=problem.xl, xu=problem.xu, X=ans2)
 
-def compute_kernel_matrix(P, kernel_type='rbf', gamma=1.0):
+def compute_kernel_matrix(P, kernel_type='rbf', gamma=1.0, gram=None):
     """
     计算核矩阵 K(P, P)。
     :param P: 形状为[d, N]的numpy数组，表示N个d维数据点
     :param kernel_type: 核函数类型
     :param gamma: 核函数的参数
+    :param gram: 已计算的 P.T @ P，可省略
     :return: 形状为 [N, N] 的核矩阵
     """
+    if gram is None:
+        gram = P.T @ P
     if kernel_type == 'rbf':
-        pairwise_differences = P[:, np.newaxis, :] - P[:, :, np.newaxis]
-        squared_distances = np.sum(pairwise_differences ** 2, axis=0)
+        # ||p_i - p_j||^2 = ||p_i||^2 + ||p_j||^2 - 2 p_i·p_j，不构造 [d, N, N] 的差值张量
+        squared_norms = np.diag(gram)
+        squared_distances = np.maximum(squared_norms[:, np.newaxis] + squared_norms[np.newaxis, :] - 2 * gram, 0)
         K = np.exp(-gamma * squared_distances)
     elif kernel_type == 'poly':
-        K = (P.T @ P + 1) ** gamma
+        K = (gram + 1) ** gamma
     else:
         raise ValueError("Unsupported kernel type")
     return K
@@ -4,7 +4,7 @@ from algorithms.response_strategy.MDA.AutoencodingSearch import linear_autoencod
 from algorithms.response_strategy.ResponseStrategy import ResponseStrategy
 from components.Population import Population
 from utils.evolution_tools import getNonDominate, quick_non_dominate_sort, crowd_selection
-from scipy.stats import mannwhitneyu
+from utils.rank_test import mann_whitney_u
 
 class MDA(ResponseStrategy):
     def __init__(self):
@@ -48,10 +48,12 @@ class MDA(ResponseStrategy):
             O_np = crowd_selection(O, Np)
             G_np = crowd_selection(G, Np)
             """Step2.1:这里G_np作为输入集，O_np作为输出集，通过线性自编码器映射预测新解集"""
-            Pl = linear_autoencoder(G_np.get_decision_matrix(), O_np.get_decision_matrix(), problem)
+            G_dec = G_np.get_decision_matrix()
+            O_dec = O_np.get_decision_matrix()
+            Pl = linear_autoencoder(G_dec, O_dec, problem)
             Pl.update_objective_constrain(problem)
             """Step2.2:同样，G_np作为输入集，O_np作为输出集，通过核自编码器（这里使用径向基函数RBF核）映射预测新解集"""
-            Pnl = kernel_autoencoder(G_np.get_decision_matrix(), O_np.get_decision_matrix(), problem, kernel='rbf', gamma=1.0)
+            Pnl = kernel_autoencoder(G_dec, O_dec, problem, kernel='rbf', gamma=1.0)
             Pnl.update_objective_constrain(problem)
             """Step2.2:基于U检验的Pb"""
             Pb = u_test_based_adjustment(O_np, G_np, problem)
@@ -199,11 +201,8 @@ def u_test_based_adjustment(O, G, problem):
     centroid_O = np.mean(O_matrix, axis=0)
     centroid_G = np.mean(G_matrix, axis=0)
     delta = centroid_O - centroid_G
-    # 对每个决策变量进行U检验（矢量化p值计算）
-    p_values = np.array([
-        mannwhitneyu(O_matrix[:, i], G_matrix[:, i], alternative='two-sided').pvalue
-        for i in range(problem.decision_num)
-    ])
+    # 对所有决策变量一次性进行U检验（矢量化p值计算）
+    _, p_values = mann_whitney_u(O_matrix, G_matrix, alternative='two-sided')
     # 创建显著变化标志向量
     significant_flags = p_values < 0.05
     # 生成随机扰动矩阵（一次性生成所有随机数）
@@ -1,14 +1,12 @@
+from functools import lru_cache
+
 import torch
 import torch.nn as nn
 import torch.optim as optim
 import numpy as np
-from python_utils.time import epoch
 
 from torch.utils.data import DataLoader,Dataset
 
-# 启用异常检测
-torch.autograd.set_detect_anomaly(True)
-
 class mydataset(Dataset):
     def __init__(self, input, target):
         self.input = input
@@ -21,6 +19,7 @@ class mydataset(Dataset):
         return self.input[idx], self.target[idx]
 
 
+@lru_cache(maxsize=None)
 def select_device():
     # 检查CUDA是否可用
     if torch.cuda.is_available():
@@ -57,7 +56,13 @@ class RNN(nn.Module):
         return Ht.cpu().detach().numpy(), output
 
 
-def train(model: RNN, input, target, Ht1, lr=0.0001):
+def train(model: RNN, input, target, Ht1, lr=0.0001, epoch_num=50, detect_anomaly=False):
+    """按论文逐个样本（batch_size=1）训练；detect_anomaly 只在本次训练内开启 autograd 异常检测（很慢，仅调试用）"""
+    with torch.autograd.set_detect_anomaly(bool(detect_anomaly)):
+        return _train_per_sample(model, input, target, Ht1, lr, epoch_num)
+
+
+def _train_per_sample(model, input, target, Ht1, lr, epoch_num):
     model = model.to(select_device())
     model.train()
     #确保数据符合规范
@@ -72,8 +77,7 @@ def train(model: RNN, input, target, Ht1, lr=0.0001):
     dataloader = DataLoader(dataset=data, batch_size=1, shuffle=True)
     optimizer = optim.Adam(model.parameters(), lr=lr)
 
-    #训练epoch设置为50
-    epoch_num = 50
+    #训练epoch默认为50
     H_temp = None
     L = []
     for epoch in range(epoch_num):
@@ -91,7 +95,8 @@ def train(model: RNN, input, target, Ht1, lr=0.0001):
             if epoch == epoch_num - 1:
                 L.append(loss.item())
 
-            loss.backward(retain_graph=True)
+            # Ht1 是常量，各步的计算图互不相连，不需要 retain_graph
+            loss.backward()
             torch.nn.utils.clip_grad_norm_(model.parameters(), 1.)
             optimizer.step()
     return H_temp, np.mean(L)
@@ -99,31 +104,54 @@ def train(model: RNN, input, target, Ht1, lr=0.0001):
 criterion = nn.MSELoss()
 
 
-def predict_by_rnn(model: RNN, input, Ht1):
-    model.eval()
-    model.to(select_device())
-
-    input = torch.Tensor(input)
-    input = input.to(select_device())
-    Ht1 = torch.Tensor(Ht1)
-    Ht1 = Ht1.to(select_device())
-
-    # 初始化一个列表来存储预测结果
-    outputs = []
-
-    # 逐个处理输入数据中的每个个体
-    for i in range(input.size(0)):
-        # 获取当前个体的输入
-        current_input = input[i].unsqueeze(0)  # 增加一个批次维度，形状变为 [1, 10]
+def train_fast(model: RNN, input, target, Ht1, lr=0.0001, epoch_num=50, batch_size=0, optimizer=None,
+               detect_anomaly=False):
+    """
+    快速训练：不使用 DataLoader，直接在设备上的张量上整批（batch_size<=0）或按小批量训练
+    :param optimizer: 上一次训练的优化器，传入时继续使用（配合跨环境保留的网络权重）
+    :return: (隐藏状态 H [1, hidden_size], 最后一轮的平均损失, 优化器)
+    """
+    device = select_device()
+    model = model.to(device)
+    model.train()
+    input_t = torch.as_tensor(np.asarray(input), dtype=torch.float32, device=device)
+    target_t = torch.as_tensor(np.asarray(target), dtype=torch.float32, device=device)
+    Ht1 = torch.as_tensor(np.asarray(Ht1), dtype=torch.float32, device=device)
+    if optimizer is None:
+        optimizer = optim.Adam(model.parameters(), lr=lr)
+
+    n = input_t.size(0)
+    batch_size = n if batch_size <= 0 else min(int(batch_size), n)
+    H_temp = None
+    L = []
+    with torch.autograd.set_detect_anomaly(bool(detect_anomaly)):
+        for epoch in range(epoch_num):
+            order = torch.randperm(n, device=device)
+            for start in range(0, n, batch_size):
+                index = order[start:start + batch_size]
+                optimizer.zero_grad()
+                H_temp, pred = model(input_t[index], Ht1.expand(len(index), -1))
+                loss = criterion(pred, target_t[index]) * 0.5
+                if epoch == epoch_num - 1:
+                    L.append(loss.item())
+                loss.backward()
+                torch.nn.utils.clip_grad_norm_(model.parameters(), 1.)
+                optimizer.step()
+    # 最后一个批次中各样本隐藏状态的平均作为下一环境的 H
+    return H_temp.mean(axis=0, keepdims=True), np.mean(L), optimizer
 
-        # 使用 RNN 进行预测
-        _, output = model(current_input, Ht1)
 
-        # 将预测结果从张量转换为 NumPy 数组并存储
-        outputs.append(output.cpu().detach().numpy())
+def predict_by_rnn(model: RNN, input, Ht1):
+    """一次前向计算所有个体的预测结果（评估模式下与逐个预测结果相同）"""
+    device = select_device()
+    model.eval()
+    model.to(device)
 
-    # 将所有预测结果合并为一个 NumPy 数组
-    outputs = np.vstack(outputs)
+    with torch.no_grad():
+        input = torch.as_tensor(np.asarray(input), dtype=torch.float32, device=device)
+        Ht1 = torch.as_tensor(np.asarray(Ht1), dtype=torch.float32, device=device)
+        _, output = model(input, Ht1.expand(input.size(0), -1))
 
-    return outputs
+    # 将预测结果从张量转换为 NumPy 数组
+    return output.cpu().numpy()
 
@@ -1,21 +1,42 @@
 import random
 import numpy as np
 
-from algorithms.response_strategy.RNN import RNN_prediction
 from algorithms.response_strategy.ResponseStrategy import ResponseStrategy
 from components.Population import Population
 from utils.evolution_tools import quick_non_dominate_sort, crowd_selection
+from utils.rank_test import mann_whitney_u
+
+# 解修正时判断决策变量是否显著变化的方式：severity 为原实现的变化程度指标，rank_sum 为 Mann-Whitney U 检验
+U_TEST_METHODS = ('severity', 'rank_sum')
 
 class RNN(ResponseStrategy):
-    def __init__(self, u = 10, hidden_size = 10, dropout = 0.2, lr = 0.0001):
+    def __init__(self, u = 10, hidden_size = 10, dropout = 0.2, lr = 0.0001, fast = 0, epochs = 50, batch_size = 0,
+                 detect_anomaly = 0, u_test = 'severity'):
+        """
+        :param fast: 快速模式。1 时网络权重和优化器在各环境间保留并继续训练，使用张量整批/小批量训练；
+                     0 时按论文每次环境变化新建网络，逐个样本训练
+        :param epochs: 每次环境变化的训练轮数
+        :param batch_size: 快速模式的批大小，0 表示整批
+        :param detect_anomaly: 训练时开启 autograd 异常检测（很慢，仅调试用）
+        :param u_test: 解修正时判断显著变化的方式，见 U_TEST_METHODS
+        """
         super().__init__()
+        if u_test not in U_TEST_METHODS:
+            raise ValueError(f"Unknown u_test method: {u_test}")
         self.u = u
         self.hidden_size = hidden_size
         self.dropout = dropout
         self.lr = lr
+        self.fast = bool(fast)
+        self.epochs = int(epochs)
+        self.batch_size = int(batch_size)
+        self.detect_anomaly = bool(detect_anomaly)
+        self.u_test = u_test
         self.X_arr = []  # 用于存储输入数据
         self.L_arr = []  # 用于存储损失
         self.H = None
+        self.model = None  # 快速模式下跨环境保留的网络
+        self.optimizer = None
 
     def response(self,population, problem, algorithm):
         if self.H is None:
@@ -44,10 +65,21 @@ class RNN(ResponseStrategy):
 
             """Step1:论文原文Algorithm 2（PSRNN）"""
             #神经网络训练，H初始为全0，则可视为无H，否则使用上一时刻得到的H
+            # RNN_prediction 依赖 torch，第一次需要预测时才导入
+            from algorithms.response_strategy.RNN import RNN_prediction
             input_size = problem.decision_num
             output_size = problem.decision_num
-            rnn = RNN_prediction.RNN(input_size, self.hidden_size, output_size, self.dropout)
-            H_new, L = RNN_prediction.train(rnn, self.X_arr[-2], self.X_arr[-1], self.H, self.lr)
+            if self.fast:
+                if self.model is None:
+                    self.model = RNN_prediction.RNN(input_size, self.hidden_size, output_size, self.dropout)
+                rnn = self.model
+                H_new, L, self.optimizer = RNN_prediction.train_fast(
+                    rnn, self.X_arr[-2], self.X_arr[-1], self.H, self.lr, self.epochs, self.batch_size,
+                    self.optimizer, self.detect_anomaly)
+            else:
+                rnn = RNN_prediction.RNN(input_size, self.hidden_size, output_size, self.dropout)
+                H_new, L = RNN_prediction.train(rnn, self.X_arr[-2], self.X_arr[-1], self.H, self.lr, self.epochs,
+                                                self.detect_anomaly)
 
             O = RNN_prediction.predict_by_rnn(rnn, X1, self.H)
 
@@ -105,7 +137,7 @@ class RNN(ResponseStrategy):
 
             """Step2.2:论文原文Algorithm 3（AS）第二部分：基于U检验的解修正"""
             good = population.get_decision_matrix()[:int(0.2 * problem.solution_num), :]
-            new_good = U_test(good, X1, X2)
+            new_good = U_test(good, X1, X2, self.u_test)
 
             # 矢量化边界处理
             # 将 xl 和 xu 扩展为与 next_population 相同的形状
@@ -159,14 +191,19 @@ def random_strategy(chromosome, xl, xu):
     chromosome = np.random.random(len(chromosome)) * (xu - xl) + xl
     return chromosome
 
-def U_test(good, X1, X2):
+def U_test(good, X1, X2, method='severity'):
     result = good.copy()  # 避免修改原数组
     centroid_1 = np.mean(X1, axis=0)
     centroid_2 = np.mean(X2, axis=0)
-    severity = calculate_severity(X1, X2)
 
     # 创建布尔掩码
-    mask = severity > 0.05
+    if method == 'rank_sum':
+        # 所有决策变量一次性做 U 检验，与 MDA 共用同一实现
+        _, p_values = mann_whitney_u(X1, X2, alternative='two-sided')
+        mask = p_values < 0.05
+    else:
+        severity = calculate_severity(X1, X2)
+        mask = severity > 0.05
     # 矢量化更新结果
     result[:, mask] += (centroid_1[mask] - centroid_2[mask])
 
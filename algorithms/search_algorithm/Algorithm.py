@@ -3,15 +3,33 @@ import os
 import time
 from multiprocessing import current_process
 
+from components.MetricAccumulator import MetricAccumulator
+from components.SnapshotStore import SnapshotStore
+from utils.change_detection import create_detector
+from utils.stream_protocol import StreamSender
+
 class Algorithm:
-    def __init__(self,state=None,pip=None,mode='test'):
+    def __init__(self,state=None,pip=None,mode='test',snapshot_retention='all',snapshot_dtype='float64',detector='random',metrics='IGD,GD',stream_dtype='float64'):
         """
         基础算法抽象类。
         :param state: 进程状态
         :param pip: 进程间通信管道
         :param mode: 运行模式，'test'或'experiment'
+        :param snapshot_retention: 历史快照保留策略，'all'、'last'或每k代保留一次的整数k
+        :param snapshot_dtype: 历史快照精度，'float64'或'float32'
+        :param detector: 环境变化检测策略，'random'、'fixed'或'archive'
+        :param metrics: 运行中按环境累积的指标，逗号分隔，默认'IGD,GD'；HV 计算较慢（高维时为蒙特卡洛估计），需要时显式加入，例如'IGD,GD,HV'
+        :param stream_dtype: 测试模式下每代发送给界面的 X/F 精度，'float64'或'float32'
         """
-        self.history = {"runtime":{},"settings": None}  # 用于记录信息
+        self.snapshot_retention = snapshot_retention
+        self.snapshot_dtype = snapshot_dtype
+        self.detector = detector
+        self.change_detector = create_detector(detector)
+        self.metrics = metrics
+        self.stream_dtype = stream_dtype
+        self._stream = None  # 测试模式的流式发送器，第一次发送时创建
+        self.history = {"runtime": SnapshotStore(snapshot_retention, snapshot_dtype), "settings": None,
+                        "metrics": MetricAccumulator(metrics)}  # 用于记录信息
         self.state = state
         self.pip = pip
         self.mode = mode  # 保存运行模式
@@ -23,6 +41,15 @@ class Algorithm:
         """
         raise NotImplementedError
 
+    def finish(self, problem):
+        """
+        运行结束（正常结束或被停止）后调用：记录最后一个环境的指标，
+        该环境没有在环境变化时结束（例如被提前停止）时也会被记录；测试模式下把它发送给界面
+        """
+        self.history["metrics"].finalize(problem)
+        if self.pip is not None and self.mode == 'test' and self._stream is not None:
+            self._stream.send_metrics(self.history["metrics"])
+
     def collect_information(self, population, problem, response_strategy):
         if self.history["settings"] is None:
             def extract_simple_attrs(obj):
@@ -39,24 +66,17 @@ class Algorithm:
                 "search_algorithm_params": extract_simple_attrs(self),
                 "response_strategy_params":  extract_simple_attrs(response_strategy),
             }
-        # 记录
-        if problem.t not in self.history["runtime"]:
-            self.history["runtime"][problem.t] = {}
-
-        self.history["runtime"][problem.t][problem.evaluate_time] = population.copy()
+        # 记录（只保存紧凑的 X/F 快照）
+        self.history["runtime"].record(problem.t, problem.evaluate_time, population)
+        # 环境结束时计算一次该环境的指标
+        self.history["metrics"].update(population, problem)
 
         if self.pip is not None:
             if self.mode == 'test':
-                # 测试模式：发送完整信息
-                self.pip.send({
-                    "settings": self.history["settings"],
-                    'POS': problem.get_pareto_set(),
-                    "POF": problem.get_pareto_front(),
-                    "bound": [problem.xl, problem.xu],
-                    't': problem.t,
-                    'evaluate_times': problem.evaluate_time,
-                    'population': population
-                })
+                # 测试模式：POS/POF/边界/settings 每个环境只发一次，每代只发 X/F
+                if self._stream is None:
+                    self._stream = StreamSender(self.pip, self.stream_dtype)
+                self._stream.send(problem, population, self.history["settings"], self.history["metrics"])
             elif self.mode == 'experiment':
                 # 实验模式：只发送进度信息
                 progress = ((problem.t + 1) / (problem.total_change_time)) * 100
@@ -1,9 +1,8 @@
-import matplotlib.pyplot as plt
 import numpy as np
 
 from algorithms.search_algorithm.Algorithm import Algorithm
-from components.Population import Population
-from utils.evolution_tools import quick_non_dominate_sort, crowd_selection, detection
+from components.ArrayPopulation import ArrayPopulation
+from utils.evolution_tools import crowd_selection
 
 
 class NSGA2(Algorithm):
@@ -16,19 +15,19 @@ class NSGA2(Algorithm):
 
     def optimize(self, problem, response_strategy):
         # 初始化种群
-        pop = Population(xl=problem.xl, xu=problem.xu, n_init=problem.solution_num)
+        pop = ArrayPopulation(xl=problem.xl, xu=problem.xu, n_init=problem.solution_num)
         pop.update_objective_constrain(problem)
         while not problem.is_ended() and self.control_process():
             # 检测环境变化
-            if detection(pop, problem, int(0.1 * problem.solution_num)) == 1:
-                pop = response_strategy.response(pop, problem, self)
+            if self.change_detector.detect(pop, problem) == 1:
+                pop = ArrayPopulation.from_population(response_strategy.response(pop, problem, self))
                 self.collect_information(pop, problem, response_strategy)  # 收集运行信息
                 continue
             # 生成子代
             offspring = self._variation(pop, problem)
             offspring.update_objective_constrain(problem)
             # 合并父代和子代
-            combined = Population(individuals=pop.individuals + offspring.individuals, xl=problem.xl, xu=problem.xu)
+            combined = pop.merge(offspring)
             # 环境选择
             pop = self._environmental_selection(combined, problem)
 
@@ -37,7 +36,7 @@ class NSGA2(Algorithm):
     def _variation(self, pop, problem):
         child = self._sbx_crossover(pop.get_decision_matrix(), problem.solution_num, problem.decision_num, self.proC, self.disC)
         child = self._polynomial_mutation(child, self.proM, self.disM, problem)
-        return Population(X=child, xl=problem.xl, xu=problem.xu)
+        return ArrayPopulation(X=child, xl=problem.xl, xu=problem.xu)
 
     def _sbx_crossover(self, pop, n, D, proC, disC):
         parent_1 = pop[0:n // 2]
@@ -86,7 +85,7 @@ class NSGA2(Algorithm):
         return offspring
 
     def _environmental_selection(self, population, problem):
-        quick_non_dominate_sort(population)
+        # 排序与拥挤度选择一次完成，被选个体的 rank 一并写入
         return crowd_selection(population, problem.solution_num)
 
 # from problems.benchmark.DP1.main import DP1
@@ -2,89 +2,130 @@ import numpy as np
 import random
 import math
 
-def LocalPCA(PopDec, M, K):
-    N, D = np.shape(PopDec)  # Dimensions
-    Model = [{'mean': PopDec[k],  # The mean of the model
-              'PI': np.eye(D),  # The matrix PI
-              'eVector': [],  # The eigenvectors
-              'eValue': [],  # The eigenvalues
-              'a': [],  # The lower bound of the projections
-              'b': []} for k in range(K)]  # The upper bound of the projections
-
-    ## Modeling
-    iter = 1
-    update = K
-    repartion = 1
-    total = 0
-    while((iter <= 200 and update > 0) or (repartion > 0)):
-        total = total + 1
-        if(total > 200):
-            break
-        # Calculte the distance between each solution and its projection in
-        # affine principal subspace of each cluster
-        distance = np.zeros((N, K))  # matrix of zeros N*K
-        for k in range(K):
-            distance[:, k] = np.sum(np.dot((PopDec - np.tile(Model[k]['mean'], (N, 1))), Model[k]['PI']) * (
-                        PopDec - np.tile(Model[k]['mean'], (N, 1))), axis=1)
 
-        # Partition
-        partition = np.argmin(distance, axis=1)
-        id = np.eye(K)
-        cindex = id[partition,:]
+class LocalPCAModeler:
+    def __init__(self, M, K, max_iter=200, warm_start=True):
+        """
+        Local PCA 建模（RM-MEDA）。
+        - warm_start 时以上一代的模型（均值和主成分）作为本代聚类的初始值，种群变化不大时几轮即可收敛
+        - 协方差矩阵对称，使用 np.linalg.eigh；聚类样本数少于维度时改用截断 SVD
+        - 投影距离 ||x - mean||^2 - ||(x - mean) V||^2（V 为前 M-1 个主成分）对 K 个聚类一次性计算
+        每次 fit 后 diagnostics 记录迭代次数、是否收敛等信息
+        :param M: 目标数，主成分个数为 M-1
+        :param K: 聚类数
+        :param max_iter: 最大迭代次数
+        :param warm_start: 是否从上一代的模型开始迭代
+        """
+        self.M = M
+        self.K = K
+        self.max_iter = max_iter
+        self.warm_start = warm_start
+        self.diagnostics = {}
+        self._means = None  # 上一代的聚类均值 (K, D)
+        self._vectors = None  # 上一代的主成分 (K, D, M-1)，没有主成分的聚类为 0
+
+    def reset(self):
+        """丢弃上一代的模型（例如环境变化后），下一次 fit 从头聚类"""
+        self._means = None
+        self._vectors = None
 
+    def _principal_components(self, cy):
+        """返回降序排列的特征值（长度 D）和对应的特征向量（每列一个）"""
+        count, D = cy.shape
+        if count < D and count >= self.M:
+            # 协方差的秩不超过 count-1，截断 SVD 比分解 D×D 矩阵便宜
+            _, s, vt = np.linalg.svd(cy, full_matrices=False)
+            eva = np.zeros(D)
+            eva[:len(s)] = s ** 2 / (count - 1)
+            return eva, vt.T
+        eva, eve = np.linalg.eigh(cy.T @ cy / (count - 1))
+        return eva[::-1], eve[:, ::-1]
+
+    def fit(self, PopDec):
+        """
+        对种群建模
+        :return: (Model, cn)，Model[k] 包含 mean、eVector、eValue、a、b，cn 为每个聚类生成的子代数 (1, K)
+        """
+        N, D = np.shape(PopDec)
+        M, K = self.M, self.K
+        warm = self.warm_start and self._means is not None and self._means.shape == (K, D)
+        if warm:
+            means = self._means.copy()
+            vectors = self._vectors.copy()
+        else:
+            means = PopDec[np.arange(K) % N].astype(float)
+            vectors = np.zeros((K, D, M - 1))
+        Model = [{'mean': means[k], 'eVector': [], 'eValue': [], 'a': [], 'b': []} for k in range(K)]
+
+        ## Modeling
+        iter = 1
         update = K
-        repartion = 0
+        repartion = 1
+        total = 0
+        repartitions = 0
+        while (iter <= self.max_iter and update > 0) or repartion > 0:
+            total = total + 1
+            if total > self.max_iter:
+                break
+            # 每个解到各聚类仿射主子空间的投影距离 (N, K)
+            diff = PopDec[np.newaxis, :, :] - means[:, np.newaxis, :]
+            projection = np.einsum('knd,kdm->knm', diff, vectors)
+            distance = (np.einsum('knd,knd->nk', diff, diff) - np.einsum('knm,knm->nk', projection, projection))
+
+            # Partition
+            partition = np.argmin(distance, axis=1)
+            sizes = np.bincount(partition, minlength=K)
+
+            update = K
+            repartion = 0
+            for k in range(K):
+                oldmean = means[k].copy()
+                if sizes[k] < 1:
+                    means[k] = PopDec[random.randrange(N)]
+                    vectors[k] = 0
+                    repartion = 1
+                    repartitions = repartitions + 1
+                elif sizes[k] == 1:
+                    means[k] = PopDec[partition == k][0]
+                    vectors[k] = 0
+                else:
+                    cx = PopDec[partition == k]
+                    means[k] = np.mean(cx, 0)
+                    eva, eve = self._principal_components(cx - means[k])
+                    Model[k]['eVector'] = eve
+                    Model[k]['eValue'] = eva
+                    vectors[k] = eve[:, :M - 1]
 
+                err = math.sqrt(np.sum((oldmean - means[k]) ** 2))
+                if err < 1e-5:
+                    update = update - 1
+
+            iter = iter + 1
+
+        self._means = means.copy()
+        self._vectors = vectors.copy()
+        self.diagnostics = {'iterations': total, 'converged': bool(update == 0 and repartion == 0),
+                            'moving_clusters': int(update), 'repartitions': repartitions,
+                            'warm_start': bool(warm), 'cluster_sizes': sizes.tolist()}
+
+        ## Calculate the smallest hyper-rectangle of each model
+        exist = np.zeros(K)
         for k in range(K):
-            oldmean = Model[k]['mean'].copy()
-            if(sum(cindex[:,k]) < 1):
-                index = random.sample(range(N), 1)
-                Model[k]['mean'] = PopDec[index,:]
-                Model[k]['PI'] = np.eye(D)
-                repartion = 1
-            elif(sum(cindex[:,k]) == 1):
-                Model[k]['mean'] = PopDec[cindex[:,k]>0,:]
-                Model[k]['PI'] = np.eye(D)
+            Model[k]['mean'] = means[k]
+            if sizes[k] > 1:
+                exist[k] = 1
+                hyperRectangle = (PopDec[partition == k, :] - means[k]) @ Model[k]['eVector'][:, 0:M - 1]
+                Model[k]['a'] = np.min(hyperRectangle, axis=0)
+                Model[k]['b'] = np.max(hyperRectangle, axis=0)
             else:
-                cx = PopDec[cindex[:,k]>0,:]
-                count, temp = np.shape(cx)
-                Model[k]['mean'] = np.mean(cx, 0)
-                mean_matrix = np.tile(Model[k]['mean'], [count, 1])
-                cy = cx - mean_matrix
-                eva, eve = np.linalg.eig(np.cov(np.transpose(cy)))
-                rank = np.argsort(-eva)
-                eva = -np.sort(-eva)
-                eve = eve[:,rank]
-                Model[k]['eVector'] = eve
-                Model[k]['eValue'] = eva
-                Model[k]['PI'] = np.dot(eve[:,(M-1):D], np.transpose(eve[:,(M-1):D]))
-
-            err = math.sqrt(np.sum((oldmean - Model[k]['mean']) * (oldmean - Model[k]['mean'])))
-            if(err < 1e-5):
-                update = update - 1
-
-        iter = iter + 1
-
-    for k in range(K):
-        Model[k]['eValue'] = np.real(Model[k]['eValue'])
-        Model[k]['eVector'] = np.real(Model[k]['eVector'])
-        Model[k]['PI'] = np.real(Model[k]['PI'])
-        Model[k]['mean'] = np.real(Model[k]['mean'])
-
-    ## Calculate the smallest hyper-rectangle of each model
-    exist = np.zeros(K)
-    for k in range(K):
-        if sum(cindex[:,k]) > 1:
-            exist[k] = 1
-            hyperRectangle = (PopDec[partition == k, :] - np.tile(Model[k]['mean'], (sum(partition == k), 1))).dot(
-                Model[k]['eVector'][:, 0:M - 1])
-            Model[k]['a'] = np.min(hyperRectangle, axis=0)
-            Model[k]['b'] = np.max(hyperRectangle, axis=0)
-        else:
-            exist[k] = 0
-            Model[k]['a'] = np.zeros((1, M - 1))
-            Model[k]['b'] = np.zeros((1, M - 1))
+                exist[k] = 0
+                Model[k]['a'] = np.zeros((1, M - 1))
+                Model[k]['b'] = np.zeros((1, M - 1))
+
+        return Model, _cluster_sizes(Model, exist, N, K)
 
+
+def _cluster_sizes(Model, exist, N, K):
     ## Calculate the probability of each cluster for reproduction
     volume = np.ones([1,K])
     for i in range(K):
@@ -102,4 +143,9 @@ def LocalPCA(PopDec, M, K):
         id = np.where(cn == num)[1][0]
         cn[0,id] = cn[0,id] + 1
 
-    return Model, cn 
\ No newline at end of file
+    return cn
+
+
+def LocalPCA(PopDec, M, K):
+    """不使用热启动的 Local PCA 建模，返回 (Model, cn)"""
+    return LocalPCAModeler(M, K, warm_start=False).fit(PopDec)
@@ -1,84 +1,81 @@
 from algorithms.search_algorithm.Algorithm import Algorithm
-from components.Population import Population
-from utils.evolution_tools import detection,crowd_selection,quick_non_dominate_sort
+from components.ArrayPopulation import ArrayPopulation
+from utils.evolution_tools import crowd_selection
 import numpy as np
-import random
-from algorithms.search_algorithm.RMMEDA.LocalPCA import LocalPCA
+from algorithms.search_algorithm.RMMEDA.LocalPCA import LocalPCAModeler
 
 
 class RMMEDA(Algorithm):
-    def __init__(self, K=5,**args):
+    def __init__(self, K=5, warm_start=1, **args):
+        """
+        :param K: Local PCA 聚类数
+        :param warm_start: 是否以上一代的 Local PCA 模型作为本代建模的初始值
+        """
         super().__init__(**args)
         self.K = K
+        self.warm_start = bool(warm_start)
+        self.local_pca = None  # 建模器，诊断信息见 self.local_pca.diagnostics
 
     def optimize(self, problem, response_strategy):
          # 初始化种群
-        pop = Population(xl=problem.xl, xu=problem.xu, n_init=problem.solution_num)
+        pop = ArrayPopulation(xl=problem.xl, xu=problem.xu, n_init=problem.solution_num)
         pop.update_objective_constrain(problem)
+        self.local_pca = LocalPCAModeler(problem.n_obj, self.K, warm_start=self.warm_start)
         while not problem.is_ended() and self.control_process():
             # 检测环境变化
-            if detection(pop, problem, int(0.1 * problem.solution_num)) == 1:
-                pop = response_strategy.response(pop, problem, self)
+            if self.change_detector.detect(pop, problem) == 1:
+                pop = ArrayPopulation.from_population(response_strategy.response(pop, problem, self))
+                self.local_pca.reset()  # 环境变化后上一代的模型不再适用
                 self.collect_information(pop, problem, response_strategy)  # 收集运行信息
                 continue
             # 生成子代
             offspring = self._rmmeda_operator(pop, problem)
             offspring.update_objective_constrain(problem)
             # 合并父代和子代
-            combined = Population(individuals=pop.individuals + offspring.individuals, xl=problem.xl, xu=problem.xu)
-            quick_non_dominate_sort(combined)
+            combined = pop.merge(offspring)
             pop = crowd_selection(combined,problem.solution_num)
             self.collect_information(pop, problem, response_strategy) 
 
     def _rmmeda_operator(self, pop, problem):
         # 获取决策变量
-        PopDec = np.array([ind.X for ind in pop.individuals])
+        PopDec = pop.get_decision_matrix()
         N, D = PopDec.shape
         M = problem.n_obj
         
         # 建模
-        Model, cn = LocalPCA(PopDec, M, self.K)
+        if self.local_pca is None:
+            self.local_pca = LocalPCAModeler(M, self.K, warm_start=self.warm_start)
+        Model, cn = self.local_pca.fit(PopDec)
         
-        # 生成子代
+        # 生成子代：每个聚类一次性采样隐变量和高斯噪声
         OffspringDec = np.zeros((N, D))
         tn = 0
         ast = 0
-        
+
         for k in range(self.K):
-            # 生成子代
-            LInd = np.ones([int(cn[0,k]), M-1])
-            for i in range(M-1):
-                LInd[:,i] = random.sample(range(int(cn[0,k])), int(cn[0,k]))
-                
-            for i in range(int(cn[0,k])):
-                if cn[0,k] > 2:
-                    lower = Model[k]['a'] - 0.25 * (Model[k]['b'] - Model[k]['a'])
-                    upper = Model[k]['b'] + 0.25 * (Model[k]['b'] - Model[k]['a'])
-                    trial = (LInd[i,:] - np.random.random([1,M-1]))/cn[0,k] * (upper - lower) + lower
-                    sigma = np.sum(np.abs(Model[k]['eValue'][M-1:D])) / (D - M + 1)
-                    ast = sigma
-                    OffspringDec[int(i + tn), :] = Model[k]['mean'] + np.dot(Model[k]['eVector'][:,:M-1], np.transpose(trial)).transpose() + np.random.randn(D) * np.sqrt(sigma)
-                else:
-                    OffspringDec[int(i + tn), :] = Model[k]['mean'] + np.random.randn(D) * np.sqrt(ast)
-            tn = tn + cn[0,k]
-            
-        # 边界处理
-        low = np.tile(problem.xl, (N, 1))
-        upp = np.tile(problem.xu, (N, 1))
+            count = int(cn[0, k])
+            if count > 2:
+                # 每一维隐变量取 0..count-1 的一个随机排列（分层采样）
+                LInd = np.argsort(np.random.random((count, M - 1)), axis=0)
+                lower = Model[k]['a'] - 0.25 * (Model[k]['b'] - Model[k]['a'])
+                upper = Model[k]['b'] + 0.25 * (Model[k]['b'] - Model[k]['a'])
+                trial = (LInd - np.random.random((count, M - 1))) / count * (upper - lower) + lower
+                sigma = np.sum(np.abs(Model[k]['eValue'][M-1:D])) / (D - M + 1)
+                ast = sigma
+                OffspringDec[tn:tn + count, :] = Model[k]['mean'] + trial @ Model[k]['eVector'][:, :M-1].T \
+                    + np.random.randn(count, D) * np.sqrt(sigma)
+            else:
+                OffspringDec[tn:tn + count, :] = Model[k]['mean'] + np.random.randn(count, D) * np.sqrt(ast)
+            tn = tn + count
+
+        # 边界处理：越界的分量取父代对应分量与边界的中点
+        low = problem.xl
+        upp = problem.xu
         lbnd = OffspringDec < low
         ubnd = OffspringDec > upp
-        
-        for i in range(N):
-            for j in range(D):
-                if lbnd[i, j]:
-                    OffspringDec[i, j] = 0.5 * (PopDec[i, j] + low[0, j])
-                if ubnd[i, j]:
-                    OffspringDec[i, j] = 0.5 * (PopDec[i, j] + upp[0, j])
-        
+        OffspringDec = np.where(lbnd, 0.5 * (PopDec + low), OffspringDec)
+        OffspringDec = np.where(ubnd, 0.5 * (PopDec + upp), OffspringDec)
+
         # 创建新的种群
-        offspring = Population(xl=problem.xl, xu=problem.xu, n_init=N)
-        for i in range(N):
-            offspring.individuals[i].X = OffspringDec[i]
-            
-        return offspring
+        return ArrayPopulation(X=OffspringDec, xl=problem.xl, xu=problem.xu)
         
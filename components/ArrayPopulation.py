@@ -0,0 +1,277 @@
+import numpy as np
+
+import problems.Problem
+from components.Individual import Individual
+from components.Population import Population
+
+
+class IndividualView:
+    """
+    ArrayPopulation 中某一行的个体代理，接口与 Individual 一致。
+    读写属性时直接访问种群的连续数组，不持有独立数据。
+    """
+    __slots__ = ("_pop", "_idx")
+
+    def __init__(self, pop, idx):
+        self._pop = pop
+        self._idx = idx
+
+    @property
+    def X(self):
+        return self._pop.X[self._idx]
+
+    @X.setter
+    def X(self, value):
+        self._pop.X[self._idx] = value
+
+    @property
+    def F(self):
+        if self._pop.F is None:
+            return None
+        return self._pop.F[self._idx]
+
+    @F.setter
+    def F(self, value):
+        if value is None:
+            return
+        value = np.asarray(value, dtype=float)
+        if self._pop.F is None:
+            # 第一次写入目标值时按目标数分配数组，未赋值的行保持 NaN
+            self._pop.F = np.full((len(self._pop), value.shape[-1]), np.nan)
+        self._pop.F[self._idx] = value
+
+    @property
+    def G(self):
+        if self._pop.G is None:
+            return None
+        return self._pop.G[self._idx]
+
+    @G.setter
+    def G(self, value):
+        if value is None:
+            return
+        value = np.asarray(value, dtype=float)
+        if self._pop.G is None:
+            self._pop.G = np.full((len(self._pop), value.shape[-1]), np.nan)
+        self._pop.G[self._idx] = value
+
+    @property
+    def feasible(self):
+        return bool(self._pop.feasible[self._idx])
+
+    @feasible.setter
+    def feasible(self, value):
+        self._pop.feasible[self._idx] = value
+
+    @property
+    def rank(self):
+        # rank 数组中 0 表示尚未排序，对应 Individual.rank 的 None
+        rank = self._pop.rank[self._idx]
+        return None if rank == 0 else int(rank)
+
+    @rank.setter
+    def rank(self, value):
+        self._pop.rank[self._idx] = 0 if value is None else value
+
+    @property
+    def crowding_distance(self):
+        distance = self._pop.crowding[self._idx]
+        return None if np.isnan(distance) else float(distance)
+
+    @crowding_distance.setter
+    def crowding_distance(self, value):
+        self._pop.crowding[self._idx] = np.nan if value is None else value
+
+    def copy(self):
+        """复制为独立的 Individual，与原种群不再共享数据"""
+        return self.result_copy()
+
+    def result_copy(self):
+        new_individual = Individual(self.X.copy())
+        new_individual.F = self.F.copy() if self.F is not None else None
+        new_individual.G = self.G.copy() if self.G is not None else None
+        new_individual.feasible = self.feasible
+        new_individual.rank = self.rank
+        new_individual.crowding_distance = self.crowding_distance
+        return new_individual
+
+    def __repr__(self):
+        return f"Individual(X={self.X}, F={self.F}, feasible={self.feasible})"
+
+
+class IndividualViewList(list):
+    """
+    ArrayPopulation.individuals 返回的个体视图列表。
+    列表本身是按需构建的临时对象，对它 append/赋值不会改变种群，因此这些操作直接报错；
+    修改个体属性（ind.F = ...）仍会写回种群数组。拼接（+）、切片得到的是普通列表
+    """
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("ArrayPopulation.individuals 是只读的视图列表，"
+                        "请使用 ArrayPopulation.take/merge 或新建种群来增删个体")
+
+    append = extend = insert = remove = pop = clear = sort = reverse = _read_only
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+
+
+class ArrayPopulation(Population):
+    def __init__(self, individuals=None, xl=None, xu=None, n_init=0, X=None, F=None, G=None, dtype=float):
+        """
+        结构数组（structure-of-arrays）布局的种群，X/F/G/rank/crowding 各自保存为连续数组。
+        初始化方式与 Population 相同：
+        1. individuals：传入个体列表（Individual 或 IndividualView），数据会被拷贝进数组
+        2. xl/xu + n_init：随机生成 n_init 个个体
+        3. X：直接从一个决策矩阵初始化（每行一个个体）
+        4. X + F (+ G)：从决策矩阵和目标矩阵初始化
+        dtype 为 X/F/G 的存储精度，默认 float64，可用 float32 压缩历史快照
+        """
+        self.xl = xl
+        self.xu = xu
+        self.F = None
+        self.G = None
+
+        if individuals:
+            self.X = np.array([ind.X for ind in individuals], dtype=dtype)
+            if all(ind.F is not None for ind in individuals):
+                self.F = np.array([ind.F for ind in individuals], dtype=dtype)
+            if all(ind.G is not None for ind in individuals):
+                self.G = np.array([ind.G for ind in individuals], dtype=dtype)
+            self.feasible = np.array([ind.feasible for ind in individuals], dtype=bool)
+            self.rank = np.array([ind.rank or 0 for ind in individuals], dtype=int)
+            self.crowding = np.array([np.nan if ind.crowding_distance is None else ind.crowding_distance
+                                      for ind in individuals], dtype=float)
+            return
+
+        if X is not None:
+            self.X = np.array(np.atleast_2d(X), dtype=dtype)
+            if F is not None:
+                self.F = np.array(np.atleast_2d(F), dtype=dtype)
+            if G is not None:
+                self.G = np.array(np.atleast_2d(G), dtype=dtype)
+        elif xl is not None and xu is not None and n_init > 0:
+            self.X = np.random.uniform(low=xl, high=xu, size=(n_init, len(xl))).astype(dtype)
+        else:
+            self.X = np.empty((0, len(xl) if xl is not None else 0))
+
+        n = self.X.shape[0]
+        self.feasible = np.ones(n, dtype=bool) if self.G is None else np.all(self.G <= 0, axis=1)
+        self.rank = np.zeros(n, dtype=int)
+        self.crowding = np.full(n, np.nan)
+
+    @classmethod
+    def from_population(cls, population):
+        """将任意 Population 转为 ArrayPopulation，已是 ArrayPopulation 时直接返回"""
+        if isinstance(population, cls):
+            return population
+        return cls(individuals=population.individuals, xl=population.xl, xu=population.xu)
+
+    @property
+    def n(self):
+        return self.X.shape[0]
+
+    @property
+    def individuals(self):
+        """
+        每次访问都新建一个只读的 IndividualViewList。视图按行号读写种群数组：
+        修改视图的属性会写回本种群，种群被原地更新后视图看到的也是新数据。
+        需要独立的个体时使用 ind.copy()；Population(individuals=...) 会自动拷贝传入的视图
+        """
+        return IndividualViewList(IndividualView(self, i) for i in range(len(self)))
+
+    def get_decision_matrix(self):
+        """返回决策矩阵的视图（零拷贝），调用方不应原地修改"""
+        return self.X
+
+    def get_objective_matrix(self):
+        """返回目标矩阵的视图（零拷贝），未评估时返回空数组"""
+        if self.F is None:
+            return np.array([])
+        return self.F
+
+    def get_constrain_matrix(self):
+        if self.G is None:
+            return np.array([])
+        return self.G
+
+    def update_X(self, X):
+        """
+        批量更新决策变量，形状一致时原地写入，不重新分配内存。
+        :param X: numpy array, shape: (n_individuals, n_var)
+        """
+        assert len(X) == len(self), "X 行数与个体数不一致"
+        X = np.asarray(X, dtype=float)
+        if X.shape == self.X.shape:
+            self.X[...] = X
+        else:
+            self.X = X.copy()
+
+    def update_objective_constrain(self, problem: problems.Problem):
+        F, G = problem.evaluate(self.X)
+        self.F = np.asarray(F, dtype=float)
+        if G is not None:
+            self.G = np.asarray(G, dtype=float)
+            self.feasible = np.all(self.G <= 0, axis=1)
+        else:
+            self.G = None
+            self.feasible = np.ones(len(self), dtype=bool)
+
+    def take(self, indices):
+        """按索引数组取出子种群（拷贝），用于环境选择等场景"""
+        indices = np.asarray(indices, dtype=int)
+        pop = ArrayPopulation.__new__(ArrayPopulation)
+        pop.xl = self.xl
+        pop.xu = self.xu
+        pop.X = self.X[indices]
+        pop.F = self.F[indices] if self.F is not None else None
+        pop.G = self.G[indices] if self.G is not None else None
+        pop.feasible = self.feasible[indices]
+        pop.rank = self.rank[indices]
+        pop.crowding = self.crowding[indices]
+        return pop
+
+    def merge(self, other):
+        """与另一个种群按行拼接，返回新的 ArrayPopulation（例如父代 + 子代）"""
+        other = ArrayPopulation.from_population(other)
+        pop = ArrayPopulation.__new__(ArrayPopulation)
+        pop.xl = self.xl
+        pop.xu = self.xu
+        pop.X = np.concatenate((self.X, other.X), axis=0)
+        pop.F = np.concatenate((self.F, other.F), axis=0) if self.F is not None and other.F is not None else None
+        pop.G = np.concatenate((self.G, other.G), axis=0) if self.G is not None and other.G is not None else None
+        pop.feasible = np.concatenate((self.feasible, other.feasible))
+        pop.rank = np.concatenate((self.rank, other.rank))
+        pop.crowding = np.concatenate((self.crowding, other.crowding))
+        return pop
+
+    def copy(self):
+        return self.take(np.arange(len(self)))
+
+    def __len__(self):
+        return self.X.shape[0]
+
+    def __getitem__(self, idx):
+        if isinstance(idx, (int, np.integer)):
+            if idx < -len(self) or idx >= len(self):
+                raise IndexError("population index out of range")
+            return IndividualView(self, idx % len(self))
+        return self.individuals[idx]
+
+    def __iter__(self):
+        return iter(self.individuals)
+
+    def to_dict(self, include_objectives=False):
+        result = {
+            "decision": self.X.tolist(),
+        }
+        if include_objectives:
+            if self.F is not None and not np.isnan(self.F).any():
+                result["objective"] = self.F.tolist()
+            if self.G is not None and not np.isnan(self.G).any():
+                result["constrain"] = self.G.tolist()
+        return result
+
+    def __repr__(self):
+        total = len(self)
+        evaluated = 0 if self.F is None else int(np.sum(~np.isnan(self.F).any(axis=1)))
+        feasible = int(np.sum(self.feasible))
+        return f"ArrayPopulation(size={total}, evaluated={evaluated}, feasible={feasible})"
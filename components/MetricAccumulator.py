@@ -0,0 +1,60 @@
+import numpy as np
+
+from utils.metrics import ReferenceFront, calculate_IGD, calculate_GD, calculate_HV
+
+
+class MetricAccumulator(dict):
+    # 参数为 (种群目标矩阵, ReferenceFront)
+    METRICS = {
+        'IGD': lambda pop_y, reference: calculate_IGD(pop_y, reference),
+        'GD': lambda pop_y, reference: calculate_GD(pop_y, reference),
+        # 参考点与 calculate_MHV 保持一致
+        'HV': lambda pop_y, reference: calculate_HV(pop_y, reference.points.max(axis=0) + 0.5),
+    }
+
+    def __init__(self, metrics='IGD,GD'):
+        """
+        运行过程中按环境累积的指标，结构为 {t: {指标名: 值}}。
+        每个环境只在结束时（problem.need_change 置位，或观察到 t 已推进）用该环境最后一代种群计算一次，
+        与 calculate_MIGD/MGD/MHV 事后取每个环境最后一代的口径相同。
+        :param metrics: 需要累积的指标，逗号分隔的字符串或列表，可选 IGD、GD、HV（HV 较慢，默认不计算）
+        """
+        super().__init__()
+        if isinstance(metrics, str):
+            metrics = [name.strip() for name in metrics.split(',') if name.strip()]
+        for name in metrics:
+            if name not in self.METRICS:
+                raise ValueError(f"未知的指标: {name}")
+        self.metrics = list(metrics)
+        self._open = None  # 尚未结束的环境 (t, 最后一代目标矩阵)
+
+    def update(self, population, problem):
+        """记录环境 problem.t 的最新一代种群，环境结束时计算该环境的指标"""
+        t = problem.t
+        if self._open is not None and self._open[0] != t:
+            self._close(*self._open, problem)
+        self._open = (t, np.array(population.get_objective_matrix()))
+        if problem.need_change:
+            # 下一次评估将推进时间步，当前种群就是该环境的最后一代
+            self.finalize(problem)
+
+    def finalize(self, problem):
+        """结束当前未关闭的环境（例如运行被提前终止时）"""
+        if self._open is not None:
+            self._close(*self._open, problem)
+
+    def _close(self, t, pop_y, problem):
+        self._open = None
+        if pop_y.size == 0:
+            return
+        # 每个环境只计算一次，前沿不进入全局缓存，IGD/GD/HV 共用同一个 ReferenceFront
+        reference = ReferenceFront(problem.get_pareto_front(t))
+        self[t] = {name: float(self.METRICS[name](pop_y, reference)) for name in self.metrics}
+
+    def mean(self, name):
+        """所有已结束环境上某指标的平均值，例如 mean('IGD') 即 MIGD"""
+        values = [record[name] for record in self.values() if name in record]
+        return float(np.mean(values)) if values else 0.0
+
+    def to_dict(self):
+        return {str(t): dict(record) for t, record in self.items()}
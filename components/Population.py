@@ -14,6 +14,10 @@ class Population:
         4. X + Y：从决策矩阵和目标矩阵初始化
         """
         if individuals:
+            from components.ArrayPopulation import IndividualView  # 避免循环导入
+            if any(isinstance(ind, IndividualView) for ind in individuals):
+                # 视图按行号引用 ArrayPopulation 的数组，拷贝为独立个体，避免与原种群互相影响
+                individuals = [ind.copy() if isinstance(ind, IndividualView) else ind for ind in individuals]
             self.individuals = individuals
 
         elif X is not None:
@@ -71,25 +75,23 @@ class Population:
     def __getitem__(self, idx):
         return self.individuals[idx]
 
-    def to_dict(self):
+    def to_dict(self, include_objectives=False):
+        """
+        转为可保存的字典
+        :param include_objectives: 是否同时保存目标值和约束值（所有个体都已评估时才保存）
+        """
         result = {
             "decision": [],
-            # "objective": [],
-            # "constrain": []
         }
 
         for ind in self.individuals:
             result["decision"].append(ind.X.tolist())
 
-            # if ind.F is not None:
-            #     result["objective"].append(ind.F.tolist())
-            # else:
-            #     pass
-
-            # if ind.G is not None:
-            #     result["constrain"].append(ind.G.tolist())
-            # else:
-            #     pass
+        if include_objectives:
+            if self.individuals and all(ind.F is not None for ind in self.individuals):
+                result["objective"] = [ind.F.tolist() for ind in self.individuals]
+            if self.individuals and all(ind.G is not None for ind in self.individuals):
+                result["constrain"] = [ind.G.tolist() for ind in self.individuals]
 
         return result
 
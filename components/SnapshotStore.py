@@ -0,0 +1,64 @@
+import numpy as np
+
+from components.ArrayPopulation import ArrayPopulation
+
+
+class SnapshotStore(dict):
+    def __init__(self, retention='all', dtype='float64'):
+        """
+        运行历史的种群快照存储，结构与原 history["runtime"] 相同：{t: {evaluate_time: 快照}}。
+        快照只保存 X/F/G 的紧凑数组（ArrayPopulation），不再对整个种群做 deepcopy。
+        :param retention: 保留策略
+            'all'  —— 保留每一代
+            'last' —— 每个环境只保留最后一代（响应策略与 MIGD 只读取这一代）
+            k(int) —— 每个环境保留每第 k 代，并始终保留最新一代
+        :param dtype: 快照数组精度，'float64' 或 'float32'
+        """
+        super().__init__()
+        self.retention = self._parse_retention(retention)
+        self.dtype = np.dtype(dtype)
+        self._generation = {}  # 每个环境已记录的代数
+        self._pending = {}  # 每个环境中仅因“最新一代”而保留的快照键
+
+    @staticmethod
+    def _parse_retention(retention):
+        if isinstance(retention, str) and retention.isdigit():
+            retention = int(retention)
+        if retention == 'all' or retention == 1:
+            return 'all'
+        if retention == 'last':
+            return 'last'
+        if isinstance(retention, int) and retention > 1:
+            return retention
+        raise ValueError(f"未知的快照保留策略: {retention}")
+
+    def snapshot(self, population):
+        """将种群压缩为只含 X/F/G 的 ArrayPopulation"""
+        F = population.get_objective_matrix()
+        G = population.get_constrain_matrix()
+        return ArrayPopulation(
+            X=population.get_decision_matrix(),
+            F=F if F.size else None,
+            G=G if G.size else None,
+            xl=population.xl,
+            xu=population.xu,
+            dtype=self.dtype
+        )
+
+    def record(self, t, evaluate_time, population):
+        """记录环境 t 在 evaluate_time 时刻的种群，并按保留策略丢弃旧快照"""
+        generations = self.setdefault(t, {})
+        generation = self._generation.get(t, 0)
+        self._generation[t] = generation + 1
+
+        if self.retention == 'last':
+            generations.clear()
+        elif self.retention != 'all':
+            # 上一次仅作为最新一代保留的快照已不再是最新，丢弃
+            pending = self._pending.pop(t, None)
+            if pending is not None:
+                generations.pop(pending, None)
+            if generation % self.retention != 0:
+                self._pending[t] = evaluate_time
+
+        generations[evaluate_time] = self.snapshot(population)
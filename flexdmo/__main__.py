@@ -0,0 +1,54 @@
+# 命令行入口：python -m flexdmo run grid.yaml
+# 只依赖算法、问题和结果保存模块，不导入 tkinter / ttkbootstrap / matplotlib，可在无界面的计算节点上运行
+import argparse
+import os
+import sys
+
+import utils.information_parser
+
+# 插件根目录为仓库根目录（多进程以 spawn 方式启动时子进程也会执行到这里）
+utils.information_parser.ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m flexdmo", description="FlexDMO 无界面实验运行器")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="按实验网格（JSON/YAML）运行实验")
+    run_parser.add_argument("grid", help="实验网格文件路径")
+    run_parser.add_argument("--save-path", default=None, help="结果保存路径，覆盖网格文件中的 save_path")
+    run_parser.add_argument("--workers", type=int, default=1, help="并行进程数，默认 1")
+
+    convert_parser = subparsers.add_parser("convert", help="转换已有结果文件的格式")
+    convert_parser.add_argument("path", help="结果文件或文件夹（递归处理）")
+    convert_parser.add_argument("--to", default="npz", help="目标格式，默认 npz")
+    convert_parser.add_argument("--remove", action="store_true", help="转换成功后删除原文件")
+
+    startup_parser = subparsers.add_parser("startup", help="测量界面启动和工作进程到第一代的时间")
+    startup_parser.add_argument("--problem", default="DF1", help="测量用的问题，默认 DF1")
+    startup_parser.add_argument("--strategy", default="MDP", help="测量用的响应策略，默认 MDP")
+    startup_parser.add_argument("--algorithm", default="NSGAII", help="测量用的搜索算法，默认 NSGAII")
+    startup_parser.add_argument("--runs", type=int, default=2, help="同一工作进程上依次运行的任务数，默认 2")
+    startup_parser.add_argument("--no-window", action="store_true", help="不测量主窗口显示时间（无图形界面时使用）")
+
+    args = parser.parse_args(argv)
+    if args.command == "startup":
+        from utils.experiment_runner import expand_grid
+        from utils.startup_benchmark import run_startup_benchmark
+        task = expand_grid({"problems": [args.problem], "strategies": [args.strategy],
+                            "algorithms": [args.algorithm]})[0]
+        run_startup_benchmark(task, window=not args.no_window, runs=args.runs)
+        return 0
+    if args.command == "convert":
+        from utils.result_store import convert_results
+        convert_results(args.path, args.to, args.remove)
+        return 0
+    if args.command == "run":
+        from utils.experiment_runner import load_grid, run_grid
+        failures = run_grid(load_grid(args.grid), save_path=args.save_path, workers=args.workers)
+        return 1 if failures else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,7 +4,7 @@ from matplotlib import pyplot as plt
 import numpy as np
 from matplotlib.collections import LineCollection
 
-from utils.metrics import calculate_IGD
+from utils.metrics import calculate_IGD, problem_key
 from views.common.GlobalVar import global_vars
 
 
@@ -74,6 +74,13 @@ def draw_IGD_curve(information, ax):
     # ===== 2. 准备数据 =====
     # 获取历史信息并初始化数据收集列表
     history = global_vars['test_module'].get("runtime_populations", {})
+    # 子进程在每个环境结束时已计算好的指标
+    metrics = information.get("metrics") if isinstance(information, dict) else None
+    if metrics is None:
+        metrics = global_vars['test_module'].get("metrics", {})
+    # 参考前沿按 (问题, t) 缓存，重绘时不再重复转换前沿
+    settings = information.get("settings") if isinstance(information, dict) else None
+    problem = problem_key(settings or global_vars['test_module'].get("runtime_historical_config"))
     times = []          # 存储时间步
     igd_values = []     # 存储对应的 IGD 值
     
@@ -90,13 +97,18 @@ def draw_IGD_curve(information, ax):
             continue
             
         try:
+            # 已累积的环境直接读取
+            if 'IGD' in metrics.get(t_hist, {}):
+                times.append(t_hist)
+                igd_values.append(metrics[t_hist]['IGD'])
+                continue
             # 获取最后一个环境的种群数据
             last_env = list(info_hist.values())[-1]
             if 'POF' in last_env and 'population' in last_env:
                 # 计算并存储 IGD 值
                 pof = last_env['POF']
-                pop_y = np.array([ind.F for ind in last_env['population']])
-                igd = calculate_IGD(pop_y, pof)
+                pop_y = last_env['population'].get_objective_matrix()
+                igd = calculate_IGD(pop_y, pof, key=(problem, t_hist) if problem is not None else None)
                 times.append(t_hist)  # 已经确保是整数
                 igd_values.append(igd)
         except Exception as e:
@@ -110,8 +122,8 @@ def draw_IGD_curve(information, ax):
             if 'POF' in current_env and 'population' in current_env:
                 # 计算并存储当前时间点的 IGD 值
                 pof = current_env['POF']
-                pop_y = np.array([ind.F for ind in current_env['population']])
-                igd = calculate_IGD(pop_y, pof)
+                pop_y = current_env['population'].get_objective_matrix()
+                igd = calculate_IGD(pop_y, pof, key=(problem, t_now) if problem is not None else None)
                 times.append(t_now)
                 igd_values.append(igd)
     except Exception as e:
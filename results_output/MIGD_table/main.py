@@ -5,8 +5,7 @@ from collections import defaultdict
 from scipy.stats import ranksums
 from openpyxl import Workbook
 from openpyxl.styles import Alignment, PatternFill
-from utils.metrics import calculate_MIGD
-from utils.result_io import load_result_from_files
+from utils.result_io import load_metrics_from_files
 
 def extract_info_from_settings(settings):
     """从settings中提取算法名、问题名、n和tau
@@ -80,17 +79,14 @@ def run(config):
     # 结构: {响应策略: {搜索算法: {问题名: {(n,tau): [MIGD值列表]}}}}
     results = defaultdict(lambda: defaultdict(lambda: defaultdict(lambda: defaultdict(list))))
     
-    # 使用生成器处理文件加载
-    for result in load_result_from_files(input_paths):
+    # 在进程池中并行加载文件并计算MIGD，主进程只接收每个文件的MIGD值
+    for result in load_metrics_from_files(input_paths, 'MIGD', workers=config.get("workers"),
+                                          use_cache=config.get("use_cache", True)):
         # 从settings中获取信息
-        settings = result.get('settings', {})
-        response, search, problem, n, tau = extract_info_from_settings(settings)
-        
-        # 计算MIGD值
-        migd_value = calculate_MIGD(result['runtime_populations'])
+        response, search, problem, n, tau = extract_info_from_settings(result['settings'])
         
         # 存储结果
-        results[response][search][problem][(n, tau)].append(migd_value)
+        results[response][search][problem][(n, tau)].append(result['value'])
     
     # 创建excel文件
     workbook = Workbook()
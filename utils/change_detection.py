@@ -0,0 +1,184 @@
+import numpy as np
+
+
+class ChangeDetector:
+    def __init__(self, number_detector=None, ratio=0.1, chunk_size=None):
+        """
+        环境变化检测器基类：对哨兵个体批量重评估，发现目标值不一致即判定环境变化。
+        :param number_detector: 每代参与检测的个体数，None 时取 ratio * problem.solution_num
+        :param ratio: 检测个体占种群规模的比例
+        :param chunk_size: 每次批量评估的个体数，None 表示一次评估全部；分块时遇到第一个不一致即提前退出
+        """
+        self.number_detector = number_detector
+        self.ratio = ratio
+        self.chunk_size = chunk_size
+        # 检测开销统计
+        self.calls = 0  # 检测次数
+        self.evaluate_calls = 0  # problem.evaluate 调用次数
+        self.evaluations = 0  # 重评估的个体数
+        self.changes = 0  # 检测到的环境变化次数
+
+    def _number(self, problem, pop_size):
+        number = self.number_detector
+        if number is None:
+            number = int(self.ratio * problem.solution_num)
+        return min(int(number), pop_size)
+
+    def _evaluate(self, problem, X):
+        self.evaluate_calls += 1
+        self.evaluations += X.shape[0]
+        F, _ = problem.evaluate(X, False)
+        return F
+
+    def _first_mismatch(self, problem, X, F):
+        """
+        分块批量评估 X，并与记录的目标值 F 比较
+        :return: (第一个不一致个体的下标或 None, 已评估部分的新目标值)
+        """
+        n = X.shape[0]
+        chunk = n if self.chunk_size is None else max(1, int(self.chunk_size))
+        new_F = []
+        for start in range(0, n, chunk):
+            f = self._evaluate(problem, X[start:start + chunk])
+            new_F.append(f)
+            same = np.all(np.isclose(f, F[start:start + chunk]), axis=1)
+            if not np.all(same):
+                return start + int(np.argmin(same)), np.concatenate(new_F, axis=0)
+        return None, np.concatenate(new_F, axis=0) if new_F else F[:0]
+
+    def _sentinels(self, pop, problem):
+        """返回本次检测使用的哨兵 (X, F)，由具体策略实现"""
+        raise NotImplementedError
+
+    def _on_result(self, pop, problem, changed, evaluated_F):
+        """检测结束后的回调，供具体策略更新自身状态"""
+        pass
+
+    def detect(self, pop, problem):
+        """检测环境变化
+
+        Args:
+            pop: 当前种群
+            problem: 问题实例
+
+        Returns:
+            1: 检测到环境变化
+            0: 未检测到环境变化
+        """
+        self.calls += 1
+        if len(pop) == 0:
+            return 0
+        X, F = self._sentinels(pop, problem)
+        if X.shape[0] == 0:
+            return 0
+
+        mismatch, evaluated_F = self._first_mismatch(problem, X, F)
+        changed = mismatch is not None
+        self._on_result(pop, problem, changed, evaluated_F)
+        if changed:
+            self.changes += 1
+            print("环境发生变化")
+            return 1
+        return 0
+
+    def stats(self):
+        """返回检测开销统计"""
+        return {
+            "calls": self.calls,
+            "evaluate_calls": self.evaluate_calls,
+            "evaluations": self.evaluations,
+            "changes": self.changes,
+        }
+
+
+class RandomSentinelDetector(ChangeDetector):
+    """每代从当前种群中随机抽取检测个体（原 detection 的行为）"""
+
+    def _sentinels(self, pop, problem):
+        number = self._number(problem, len(pop))
+        index = np.random.choice(len(pop), number, replace=False)
+        return pop.get_decision_matrix()[index], pop.get_objective_matrix()[index]
+
+
+class FixedSentinelDetector(ChangeDetector):
+    """首次检测时选定固定哨兵并跨代复用，检测到变化后用新环境下的目标值刷新"""
+
+    def __init__(self, number_detector=None, ratio=0.1, chunk_size=None):
+        super().__init__(number_detector, ratio, chunk_size)
+        self.X = None
+        self.F = None
+
+    def _sentinels(self, pop, problem):
+        if self.X is None:
+            number = self._number(problem, len(pop))
+            index = np.random.choice(len(pop), number, replace=False)
+            self.X = np.array(pop.get_decision_matrix()[index])
+            self.F = np.array(pop.get_objective_matrix()[index])
+        return self.X, self.F
+
+    def _on_result(self, pop, problem, changed, evaluated_F):
+        if not changed:
+            return
+        # 提前退出时补齐剩余哨兵在新环境下的目标值
+        rest = self.X[len(evaluated_F):]
+        if len(rest) > 0:
+            evaluated_F = np.concatenate((evaluated_F, self._evaluate(problem, rest)), axis=0)
+        self.F = np.array(evaluated_F)
+
+
+class ArchiveDetector(ChangeDetector):
+    """维护一个历史解存档，每代按预算轮流重评估存档中的个体"""
+
+    def __init__(self, number_detector=None, ratio=0.1, chunk_size=None, capacity=None):
+        """
+        :param number_detector: 每代的重评估预算
+        :param capacity: 存档容量，None 时为预算的 5 倍
+        """
+        super().__init__(number_detector, ratio, chunk_size)
+        self.capacity = capacity
+        self.X = None
+        self.F = None
+        self.cursor = 0
+
+    def _sentinels(self, pop, problem):
+        budget = self._number(problem, len(pop))
+        if self.X is None or len(self.X) == 0:
+            # 存档为空时直接从种群中抽取
+            index = np.random.choice(len(pop), budget, replace=False)
+            return pop.get_decision_matrix()[index], pop.get_objective_matrix()[index]
+        index = (self.cursor + np.arange(min(budget, len(self.X)))) % len(self.X)
+        self.cursor = (self.cursor + len(index)) % len(self.X)
+        return self.X[index], self.F[index]
+
+    def _on_result(self, pop, problem, changed, evaluated_F):
+        if changed:
+            # 存档中的目标值已过期，清空后由响应后的种群重新填充
+            self.X = None
+            self.F = None
+            self.cursor = 0
+            return
+        budget = self._number(problem, len(pop))
+        capacity = self.capacity if self.capacity is not None else 5 * max(budget, 1)
+        index = np.random.choice(len(pop), budget, replace=False)
+        X = np.array(pop.get_decision_matrix()[index])
+        F = np.array(pop.get_objective_matrix()[index])
+        if self.X is None:
+            self.X, self.F = X, F
+        else:
+            self.X = np.concatenate((self.X, X), axis=0)[-capacity:]
+            self.F = np.concatenate((self.F, F), axis=0)[-capacity:]
+        self.cursor %= len(self.X)
+
+
+DETECTORS = {
+    'random': RandomSentinelDetector,
+    'fixed': FixedSentinelDetector,
+    'archive': ArchiveDetector,
+}
+
+
+def create_detector(policy='random', **kwargs):
+    """根据策略名创建检测器"""
+    if policy not in DETECTORS:
+        raise ValueError(f"未知的环境检测策略: {policy}")
+    return DETECTORS[policy](**kwargs)
@@ -1,52 +1,22 @@
-import random
 import numpy as np
 from typing import List
 from components.Population import Population
+from components.ArrayPopulation import ArrayPopulation
 from problems.Problem import Problem
+from utils.non_dominated_sort import non_dominated_sort
+from utils.change_detection import RandomSentinelDetector
 
 
-def fast_non_dominated_sort(objectives: np.ndarray) -> List[np.ndarray]:
+def fast_non_dominated_sort(objectives: np.ndarray, method: str = 'auto', n_stop=None) -> List[np.ndarray]:
     """
-    完全向量化的快速非支配排序（无显式循环），作为工具使用，便于之后的crowd_selection和quick_non_dominate_sort
+    快速非支配排序，作为工具使用，便于之后的crowd_selection和quick_non_dominate_sort
+    具体实现见 utils.non_dominated_sort，默认根据个体数和目标数自动选择后端
     :param objectives: 目标函数矩阵，形状 (n, m), n为个体数, m为目标数
+    :param method: 'auto'、'dense'、'blocked'、'jensen'、'ens_ss' 或 'ens_bs'
+    :param n_stop: 前沿覆盖 n_stop 个个体后即停止剥离，None 表示完整排序
     :return: 前沿列表，每个元素是前沿个体的索引数组
     """
-    n = objectives.shape[0]
-
-    # 1. 计算支配关系矩阵 (n, n)
-    # 使用广播比较所有个体对 (i,j): [n,1,m] <= [1,n,m] → [n,n,m]
-    less_or_equal = np.all(objectives[:, None] <= objectives[None, :], axis=2)
-    strictly_less = np.any(objectives[:, None] < objectives[None, :], axis=2)
-    domination = less_or_equal & strictly_less
-
-    # 排除自支配 (i,i)
-    np.fill_diagonal(domination, False)
-
-    # 2. 计算被支配次数 (axis=0: 列求和)
-    dominated_counts = np.sum(domination, axis=0)
-
-    # 3. 分配前沿 (完全向量化实现)
-    fronts = []
-    remaining_mask = np.ones(n, dtype=bool) # 未分配个体掩码
-
-    while np.any(remaining_mask):
-        # 当前前沿：remaining中未被支配的个体
-        current_front = np.where(remaining_mask & (dominated_counts == 0))[0]
-        fronts.append(current_front)
-
-        # 更新remaining_mask
-        remaining_mask[current_front] = False
-
-        # 向量化更新被支配次数：当前前沿支配的所有remaining个体计数减1
-        if np.any(remaining_mask):
-            # 获取remaining个体的索引
-            remaining_indices = np.where(remaining_mask)[0]
-
-            # 计算被当前前沿支配的remaining个体
-            dominated_by_front = np.sum(domination[current_front][:, remaining_indices], axis=0)
-            dominated_counts[remaining_indices] -= dominated_by_front
-
-    return fronts
+    return non_dominated_sort(objectives, method, n_stop)
 
 def crowding_distance(objectives: np.ndarray, front_indices: np.ndarray) -> np.ndarray:
     """
@@ -74,11 +44,39 @@ def crowding_distance(objectives: np.ndarray, front_indices: np.ndarray) -> np.n
     return dist
 
 
+def rank_crowding_selection(objectives: np.ndarray, N):
+    """
+    一次排序完成的环境选择：前沿覆盖 N 个个体后停止剥离，只对被截断的前沿计算拥挤距离
+    :param objectives: 目标函数矩阵，形状 (n, m)
+    :param N: 需要选择的个体数量
+    :return: (selected, ranks) 被选个体的索引数组及其前沿等级（从1开始）
+    """
+    fronts = fast_non_dominated_sort(objectives, n_stop=N)
+
+    selected = []
+    ranks = []
+    current_count = 0
+    for rank, front_indices in enumerate(fronts, start=1):
+        if current_count + len(front_indices) > N:
+            # 被截断的前沿按拥挤距离降序取剩余名额
+            dist = crowding_distance(objectives, front_indices)
+            front_indices = front_indices[np.argsort(-dist)][:N - current_count]
+        selected.append(front_indices)
+        ranks.append(np.full(len(front_indices), rank))
+        current_count += len(front_indices)
+        if current_count >= N:
+            break
+
+    if not selected:
+        return np.array([], dtype=int), np.array([], dtype=int)
+    return np.concatenate(selected), np.concatenate(ranks)
+
+
 def quick_non_dominate_sort(population):
     """快速非支配排序
     population: 待排序的种群
     """
-    if not population.individuals:
+    if len(population) == 0:
             return
 
     # 提取目标函数矩阵
@@ -86,6 +84,12 @@ def quick_non_dominate_sort(population):
     # 调用 fast_non_dominated_sort 获取前沿列表
     fronts_indices = fast_non_dominated_sort(objectives)
 
+    # 数组布局的种群直接写入 rank 数组
+    if isinstance(population, ArrayPopulation):
+        for rank, front_indices in enumerate(fronts_indices, start=1):
+            population.rank[front_indices] = rank
+        return
+
     # 为每个个体分配排名
     for rank, front_indices in enumerate(fronts_indices, start=1):
         for index in front_indices:
@@ -98,32 +102,21 @@ def crowd_selection(population, N):
     N: 需要选择的个体数量
     Returns:选择后的新种群
     """
-    if not population.individuals:
-        return Population(xl=population.xl, xu=population.xu)
+    if len(population) == 0:
+        return population.__class__(xl=population.xl, xu=population.xu)
 
-    # 提取目标函数矩阵
-    objectives = population.get_objective_matrix()
-    # 执行快速非支配排序
-    fronts = fast_non_dominated_sort(objectives)
-
-    target_pop = []
-    current_count = 0
+    # 一次排序得到被选个体的索引及其等级
+    selected, ranks = rank_crowding_selection(population.get_objective_matrix(), N)
 
-    for front_indices in fronts:
-        front = [population.individuals[i] for i in front_indices]
-
-        if current_count + len(front) <= N:
-            # 如果当前前沿的个体数量小于等于需要的数量，全部选择
-            target_pop.extend(front)
-            current_count += len(front)
-        else:
-            # 如果当前前沿的个体数量大于需要的数量，使用拥挤度选择
-            objectives = population.get_objective_matrix()
-            dist = crowding_distance(objectives, front_indices)
-            sorted_indices = front_indices[np.argsort(-dist)]
-            target_pop.extend([population.individuals[i] for i in sorted_indices[:N - current_count]])
-            break
+    # 数组布局的种群直接按索引取出子种群
+    if isinstance(population, ArrayPopulation):
+        target = population.take(selected)
+        target.rank = ranks
+        return target
 
+    target_pop = [population.individuals[i] for i in selected]
+    for ind, rank in zip(target_pop, ranks):
+        ind.rank = int(rank)
     return Population(individuals=target_pop, xl=population.xl, xu=population.xu)
 
 
@@ -185,31 +178,31 @@ def getNonDominate(population: Population, type = 'population'):
         return None
 
 
-def detection(pop: Population, problem: Problem, number_detector):
-    """检测环境变化
+# detection() 默认使用的检测器，按检测个体数共用，检测次数等统计在多次调用间累积
+_detectors = {}
+
+
+def detection(pop: Population, problem: Problem, number_detector, detector=None):
+    """检测环境变化（随机抽取检测个体，一次批量重评估）
     
     Args:
         pop: 当前种群
         problem: 问题实例
         number_detector: 检测个体数量
+        detector: 调用方持有的检测器（见 utils.change_detection），为 None 时使用按
+            number_detector 共用的 RandomSentinelDetector，可通过 get_detector 读取其统计
         
     Returns:
         1: 检测到环境变化
         0: 未检测到环境变化
     """
-    if not pop.individuals:
-        return 0
-        
-    seq = range(pop.n)
-    detector = random.sample(seq, min(number_detector, pop.n))
-    
-    for i in detector:
-        temp = pop.individuals[i]
-        f, _ = problem.evaluate(temp.X.reshape(1, -1), False)
-        
-        # 检查目标值是否发生变化
-        if not np.allclose(f[0], temp.F):
-            print("环境发生变化")
-            return 1
-            
-    return 0
+    if detector is None:
+        detector = get_detector(number_detector)
+    return detector.detect(pop, problem)
+
+
+def get_detector(number_detector):
+    """detection() 默认使用的检测器，例如 get_detector(5).stats()"""
+    if number_detector not in _detectors:
+        _detectors[number_detector] = RandomSentinelDetector(number_detector)
+    return _detectors[number_detector]
@@ -0,0 +1,205 @@
+import itertools
+import json
+import os
+import time
+import traceback
+
+from utils.information_parser import convert_config_to_numeric, find_match_problem, find_match_response_strategy, \
+    find_match_search_algorithm, get_dynamic_response_config, get_problem_config, get_search_algorithm_config, \
+    load_plugin_class
+from utils.result_io import save_experiment_module_information_results
+
+# 不依赖 tkinter / matplotlib 的实验执行逻辑，GUI 的实验模块和命令行入口共用
+
+
+def run_experiment(save_path, problem, dynamic, search, tau, n, problem_config, dynamic_config, search_config,
+                   state=None, child_conn=None, result_format='json'):
+    """运行一次实验并保存结果
+
+    Args:
+        save_path: 结果保存路径
+        problem: 问题名称
+        dynamic: 动态策略
+        search: 搜索算法
+        tau: tau值
+        n: n值
+        problem_config: 问题配置
+        dynamic_config: 动态策略配置
+        search_config: 搜索算法配置
+        state: 进程状态，None 表示不受外部控制
+        child_conn: 子进程管道，None 表示不发送进度
+        result_format: 结果文件格式，'json' 或 'npz'
+
+    Returns:
+        dict: 算法运行历史
+    """
+    # 获取正确的文件夹名
+    dynamic_folder = find_match_response_strategy(dynamic)
+    search_folder = find_match_search_algorithm(search)
+    problem_folder = find_match_problem(problem)
+    for kind, name, folder in (("动态策略", dynamic, dynamic_folder), ("搜索算法", search, search_folder),
+                               ("问题", problem, problem_folder)):
+        if folder is None:
+            raise ValueError(f"未找到{kind}: {name}")
+
+    # 覆盖问题配置中的tau和n值
+    problem_config = dict(problem_config)
+    problem_config['tau'] = tau
+    problem_config['n'] = n
+
+    # 加载类
+    ResponseClass = load_plugin_class(dynamic_folder)
+    SearchClass = load_plugin_class(search_folder)
+    ProblemClass = load_plugin_class(problem_folder)
+
+    # 实例化对象
+    response_instance = ResponseClass(**convert_config_to_numeric(dynamic_config))
+    search_instance = SearchClass(**convert_config_to_numeric(search_config), state=state, pip=child_conn,
+                                  mode='experiment')
+    problem_instance = ProblemClass(**convert_config_to_numeric(problem_config))
+
+    # 运行优化
+    search_instance.optimize(problem_instance, response_instance)
+    search_instance.finish(problem_instance)
+
+    # 被终止的任务只有部分环境，不保存结果
+    if state is None or state.value != 'stop':
+        save_experiment_module_information_results(search_instance.history, save_path, result_format)
+    return search_instance.history
+
+
+def _as_list(value):
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    if isinstance(value, str):
+        return [x.strip() for x in value.split(',') if x.strip()]
+    return [value]
+
+
+def load_grid(path):
+    """读取实验网格文件，支持 JSON 和 YAML（需要安装 PyYAML）"""
+    with open(path, 'r', encoding='utf-8') as f:
+        if os.path.splitext(path)[1].lower() in ('.yaml', '.yml'):
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError("读取 YAML 网格需要安装 PyYAML，或改用 JSON 格式")
+            return yaml.safe_load(f)
+        return json.load(f)
+
+
+def expand_grid(grid):
+    """将实验网格展开为任务列表
+
+    网格格式（JSON/YAML）：
+        save_path: 结果保存路径，默认 results/experiment_module
+        problems / strategies / algorithms: 名称列表（与 info.json 中的 name 一致）
+        tau / n: 整数或整数列表
+        runs: 每个组合的独立运行次数
+        result_format: 结果文件格式，'json'（默认）或 'npz'
+        problem_config / strategy_config / algorithm_config: {名称: {参数: 值}}，覆盖 config.json 的默认值
+
+    Returns:
+        list: 任务字典列表，字段与实验模块的 TaskProgress 信息一致
+    """
+    problems = _as_list(grid.get('problems'))
+    strategies = _as_list(grid.get('strategies'))
+    algorithms = _as_list(grid.get('algorithms'))
+    tau_values = [int(x) for x in _as_list(grid.get('tau', 10))]
+    n_values = [int(x) for x in _as_list(grid.get('n', 10))]
+    runs = int(grid.get('runs', 1))
+    result_format = grid.get('result_format', 'json')
+
+    missing = [key for key, value in (('problems', problems), ('strategies', strategies),
+                                      ('algorithms', algorithms)) if not value]
+    if missing:
+        raise ValueError(f"实验网格缺少配置: {', '.join(missing)}")
+
+    # 每个名称的配置只读取一次
+    problem_configs = {name: {**get_problem_config(name), **grid.get('problem_config', {}).get(name, {})}
+                       for name in problems}
+    dynamic_configs = {name: {**get_dynamic_response_config(name), **grid.get('strategy_config', {}).get(name, {})}
+                       for name in strategies}
+    search_configs = {name: {**get_search_algorithm_config(name), **grid.get('algorithm_config', {}).get(name, {})}
+                      for name in algorithms}
+
+    tasks = []
+    for problem, dynamic, search, tau, n in itertools.product(problems, strategies, algorithms, tau_values, n_values):
+        for run in range(runs):
+            tasks.append({
+                'problem': problem,
+                'dynamic': dynamic,
+                'search': search,
+                'tau': tau,
+                'n': n,
+                'run': run + 1,
+                'runs': runs,
+                'problem_config': problem_configs[problem],
+                'dynamic_config': dynamic_configs[dynamic],
+                'search_config': search_configs[search],
+                'result_format': result_format,
+            })
+    return tasks
+
+
+def task_name(task):
+    return f"{task['problem']}_{task['dynamic']}_{task['search']}_tau{task['tau']}_n{task['n']}_run{task['run']}"
+
+
+def run_grid(grid, save_path=None, workers=1):
+    """运行整个实验网格
+
+    Args:
+        grid: 实验网格字典
+        save_path: 结果保存路径，None 时使用网格中的 save_path
+        workers: 并行进程数，1 表示在当前进程中顺序运行
+
+    Returns:
+        list: 失败任务的 (任务名, 错误信息) 列表
+    """
+    save_path = save_path or grid.get('save_path', os.path.join("results", "experiment_module"))
+    tasks = expand_grid(grid)
+    print(f"共 {len(tasks)} 个任务，结果保存到 {save_path}")
+
+    failures = []
+    finished = [0]
+    begin = {}
+
+    def on_status(name, status, error=None):
+        if status == 'running':
+            begin[name] = time.time()
+            return
+        finished[0] += 1
+        elapsed = time.time() - begin.get(name, time.time())
+        if status == 'completed':
+            print(f"[{finished[0]}/{len(tasks)}] {name} 完成，用时 {elapsed:.1f}s")
+        else:
+            print(f"[{finished[0]}/{len(tasks)}] {name} 失败\n{error}")
+            failures.append((name, error))
+
+    if workers <= 1:
+        for task in tasks:
+            name = task_name(task)
+            on_status(name, 'running')
+            try:
+                run_experiment(save_path, task['problem'], task['dynamic'], task['search'], task['tau'], task['n'],
+                               task['problem_config'], task['dynamic_config'], task['search_config'],
+                               result_format=task['result_format'])
+                on_status(name, 'completed')
+            except Exception:
+                on_status(name, 'error', traceback.format_exc())
+        return failures
+
+    # 并行时使用常驻工作进程池，按估计耗时最长优先调度
+    from utils.experiment_scheduler import ExperimentScheduler
+    scheduler = ExperimentScheduler(workers)
+    try:
+        for task in tasks:
+            scheduler.submit(task, save_path, key=task_name(task), on_status=on_status, dispatch=False)
+        scheduler.dispatch()
+        scheduler.join()
+    finally:
+        scheduler.shutdown()
+    return failures
@@ -0,0 +1,345 @@
+import heapq
+import importlib
+import itertools
+import threading
+import traceback
+from multiprocessing import Pipe, Process, Value
+
+from utils.experiment_runner import run_experiment
+from utils.information_parser import convert_config_to_numeric
+from utils.pipe_listener import get_pipe_listener
+
+# 工作进程启动时预先导入的模块。torch、scipy 等重量级模块由用到它们的算法在第一次使用时导入，
+# 导入后在常驻工作进程中保留，后续任务不会重复导入
+WARM_MODULES = ('numpy',)
+# 同一任务两次进度回调的默认最小间隔（秒）
+PROGRESS_INTERVAL = 0.5
+# 响应策略每次环境变化的额外耗时，折合为搜索代数（DF1、默认配置下实测的粗略值）。
+# RNN/DIP 每次环境变化都要训练网络，耗时远超普通的响应策略
+RESPONSE_COST = {'RNN': 200, 'DIP': 80}
+
+
+class SharedState:
+    """
+    基于 multiprocessing.Value 的进程状态，接口与 Manager().Value('c', ...) 相同（读写 .value 字符串），
+    Algorithm.control_process 可直接使用，但不需要额外的 Manager 服务进程。
+    """
+    STATES = ('running', 'pause', 'stop')
+
+    def __init__(self, value='running'):
+        self._code = Value('b', self.STATES.index(value))
+
+    @property
+    def value(self):
+        return self.STATES[self._code.value]
+
+    @value.setter
+    def value(self, value):
+        self._code.value = self.STATES.index(value)
+
+
+class _TaskConnection:
+    """给算法发送的消息附加任务编号，算法只会调用 send"""
+
+    def __init__(self, conn, task_id):
+        self.conn = conn
+        self.task_id = task_id
+
+    def send(self, data):
+        if isinstance(data, dict):
+            data = dict(data, task=self.task_id)
+        self.conn.send(data)
+
+
+def _worker_main(conn, state, warm_modules):
+    """常驻工作进程：预热导入后循环接收任务，直到收到 None 或管道关闭"""
+    for name in warm_modules:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            pass
+
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            break
+        if message is None:
+            break
+        # 状态由调度器在分配任务前重置，这里不再覆盖，避免丢掉分配后立即发出的暂停
+        task_id, save_path, task = message
+        conn.send({'task': task_id, 'status': 'running'})
+        error = None
+        try:
+            run_experiment(save_path, task['problem'], task['dynamic'], task['search'], task['tau'], task['n'],
+                           task['problem_config'], task['dynamic_config'], task['search_config'],
+                           state=state, child_conn=_TaskConnection(conn, task_id),
+                           result_format=task.get('result_format', 'json'))
+            status = 'stopped' if state.value == 'stop' else 'completed'
+        except Exception:
+            status = 'error'
+            error = traceback.format_exc()
+            print(f"[Error in experiment process]: {error}")
+        conn.send({'task': task_id, 'status': status, 'error': error})
+
+
+def estimate_task_cost(task):
+    """
+    粗略估计任务耗时（评估次数 × 决策变量维度），用于最长任务优先调度
+    评估次数 = (初始收敛 50 代 + 环境数 × (tau 代 + 响应策略折合的代数)) × solution_num，
+    响应策略折合的代数见 RESPONSE_COST
+    """
+    config = convert_config_to_numeric(task.get('problem_config', {}))
+    solution_num = config.get('solution_num', 100)
+    decision_num = config.get('decision_num', 10)
+    total = config.get('total_evaluate_time', 1)
+    tau = task.get('tau', config.get('tau', 1))
+    response = RESPONSE_COST.get(task.get('dynamic'), 0)
+    try:
+        return float((50 + total * (int(tau) + response)) * solution_num * decision_num)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class ExperimentScheduler:
+    def __init__(self, workers=1, warm_modules=WARM_MODULES, progress_interval=PROGRESS_INTERVAL):
+        """
+        基于常驻工作进程池的实验调度器，替代每个任务单独创建 Process + Manager + 监听线程的方式。
+        - 工作进程常驻，任务之间不重启，已导入的模块（例如 torch）在后续任务中直接复用
+        - 每个工作进程一个 SharedState 控制暂停/停止
+        - 等待队列按估计耗时最长优先出队，同一时刻每个工作进程只分配一个任务（在途任务数不超过 workers）
+        - 所有工作进程的管道由进程内共用的 PipeListener 监听，进度消息按 progress_interval 节流
+        :param workers: 工作进程数
+        :param warm_modules: 工作进程启动时预先导入的模块
+        :param progress_interval: 同一任务两次进度回调的最小间隔（秒）
+        """
+        self.workers = max(1, int(workers))
+        self.warm_modules = warm_modules
+        self.progress_interval = progress_interval
+        self._lock = threading.RLock()
+        self._idle_event = threading.Condition(self._lock)
+        self._pending = []  # 堆：(-估计耗时, 任务编号)，编号按提交顺序递增
+        self._tasks = {}  # 任务编号 -> {key, task, save_path, on_progress, on_status, worker}
+        self._keys = {}  # 外部 key -> 任务编号
+        self._counter = itertools.count()
+        self._slots = []  # 每个工作进程：{process, conn, state, task}
+        self._paused = set()  # 等待中被暂停的任务编号
+        self._closed = False
+
+    # ---------------- 工作进程管理 ----------------
+    def start(self):
+        with self._lock:
+            if self._slots:
+                return
+            for i in range(self.workers):
+                self._slots.append(self._spawn_worker(i))
+
+    def _spawn_worker(self, index):
+        parent_conn, child_conn = Pipe()
+        state = SharedState()
+        process = Process(target=_worker_main, args=(child_conn, state, self.warm_modules),
+                          name=f"ExperimentWorker_{index}", daemon=True)
+        process.start()
+        child_conn.close()
+        slot = {'process': process, 'conn': parent_conn, 'state': state, 'task': None}
+        # 状态消息逐条处理，进度消息按任务节流合并；进程意外结束时回调 _on_worker_lost
+        get_pipe_listener().register(
+            parent_conn,
+            on_message=lambda message: self._handle(slot, message),
+            on_latest=self._handle_progress,
+            key=self._progress_key,
+            interval=self.progress_interval,
+            process=process,
+            on_close=lambda: self._on_worker_lost(slot)
+        )
+        return slot
+
+    def shutdown(self, wait_tasks=False):
+        """关闭调度器：wait_tasks 为 True 时先等所有任务结束，否则停止正在运行的任务"""
+        if wait_tasks:
+            self.join()
+        else:
+            self.cancel_all()
+        with self._lock:
+            self._closed = True
+            slots, self._slots = self._slots, []
+        for slot in slots:
+            get_pipe_listener().unregister(slot['conn'])
+            try:
+                slot['conn'].send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        for slot in slots:
+            slot['process'].join(timeout=5)
+            if slot['process'].is_alive():
+                slot['process'].terminate()
+            slot['conn'].close()
+
+    # ---------------- 任务提交与控制 ----------------
+    def submit(self, task, save_path, key=None, on_progress=None, on_status=None, dispatch=True):
+        """
+        提交一个任务，重复提交同一个 key 会被忽略
+        :param task: 任务信息，字段与 TaskProgress.get_info() 一致
+        :param save_path: 结果保存路径
+        :param key: 外部标识（例如任务卡片），用于暂停/停止
+        :param on_progress: 进度回调 on_progress(key, progress)
+        :param on_status: 状态回调 on_status(key, status, error)
+        :param dispatch: 是否立即分配；批量提交时传 False，全部提交后再调用 dispatch()，使最长任务优先生效
+        """
+        self.start()
+        with self._lock:
+            key = key if key is not None else object()
+            if key in self._keys:
+                return
+            task_id = next(self._counter)
+            self._keys[key] = task_id
+            self._tasks[task_id] = {'key': key, 'task': task, 'save_path': save_path,
+                                    'on_progress': on_progress, 'on_status': on_status, 'worker': None}
+            heapq.heappush(self._pending, (-estimate_task_cost(task), task_id))
+        if dispatch:
+            self.dispatch()
+
+    def dispatch(self):
+        """把等待队列中估计耗时最长的任务分配给空闲的工作进程"""
+        started = []
+        with self._lock:
+            for slot in self._slots:
+                if slot['task'] is not None:
+                    continue
+                task_id = self._pop_pending()
+                if task_id is None:
+                    break
+                info = self._tasks[task_id]
+                slot['state'].value = 'running'
+                slot['task'] = task_id
+                info['worker'] = slot
+                slot['conn'].send((task_id, info['save_path'], info['task']))
+                started.append(task_id)
+        return started
+
+    def _pop_pending(self):
+        skipped = []
+        task_id = None
+        while self._pending:
+            item = heapq.heappop(self._pending)
+            if item[1] in self._paused:
+                skipped.append(item)
+                continue
+            task_id = item[1]
+            break
+        for item in skipped:
+            heapq.heappush(self._pending, item)
+        return task_id
+
+    def pause(self, key):
+        self._control(key, 'pause')
+
+    def resume(self, key):
+        self._control(key, 'running')
+        self.dispatch()
+
+    def stop(self, key):
+        self._control(key, 'stop')
+
+    def _control(self, key, value):
+        with self._lock:
+            task_id = self._keys.get(key)
+            if task_id is None:
+                return
+            info = self._tasks[task_id]
+            if info['worker'] is not None:
+                info['worker']['state'].value = value
+                return
+            # 尚未开始的任务
+            if value == 'pause':
+                self._paused.add(task_id)
+            elif value == 'running':
+                self._paused.discard(task_id)
+            elif value == 'stop':
+                self._pending = [item for item in self._pending if item[1] != task_id]
+                heapq.heapify(self._pending)
+                self._finish(task_id)
+
+    def state_of(self, key):
+        """返回正在运行该任务的工作进程状态对象，任务未开始时返回 None"""
+        with self._lock:
+            task_id = self._keys.get(key)
+            if task_id is None or self._tasks[task_id]['worker'] is None:
+                return None
+            return self._tasks[task_id]['worker']['state']
+
+    def cancel_all(self):
+        """清空等待队列并停止所有正在运行的任务"""
+        with self._lock:
+            for item in self._pending:
+                self._finish(item[1])
+            self._pending = []
+            for slot in self._slots:
+                if slot['task'] is not None:
+                    slot['state'].value = 'stop'
+
+    def _finish(self, task_id):
+        info = self._tasks.pop(task_id, None)
+        if info is not None:
+            self._keys.pop(info['key'], None)
+            self._paused.discard(task_id)
+        self._idle_event.notify_all()
+        return info
+
+    def join(self, timeout=None):
+        """阻塞直到所有已提交的任务结束"""
+        with self._lock:
+            return self._idle_event.wait_for(lambda: not self._tasks, timeout)
+
+    # ---------------- 消息监听 ----------------
+    @staticmethod
+    def _progress_key(message):
+        """纯进度消息按任务合并节流，状态消息不参与合并"""
+        if isinstance(message, dict) and 'progress' in message and 'status' not in message:
+            return message.get('task')
+        return None
+
+    def _handle_progress(self, message):
+        with self._lock:
+            info = self._tasks.get(message['task'])
+        if info is not None and info['on_progress']:
+            info['on_progress'](info['key'], message['progress'])
+
+    def _handle(self, slot, message):
+        if not isinstance(message, dict) or 'task' not in message:
+            return
+        with self._lock:
+            info = self._tasks.get(message['task'])
+        if info is None:
+            return
+        status = message.get('status')
+        if status is None:
+            return
+        # 先回调再结束任务：join() 在 _finish 通知后返回，此时最后一个任务的回调必须已经执行完
+        if info['on_status']:
+            info['on_status'](info['key'], status, message.get('error'))
+        if status in ('completed', 'stopped', 'error'):
+            with self._lock:
+                slot['task'] = None
+                self._finish(message['task'])
+            self.dispatch()
+
+    def _on_worker_lost(self, slot):
+        """工作进程意外退出：当前任务记为失败，并在原位置重启一个工作进程"""
+        with self._lock:
+            if self._closed or slot not in self._slots:
+                return
+            task_id = slot['task']
+            info = self._tasks.get(task_id) if task_id is not None else None
+        # 与 _handle 相同，先回调再结束任务，避免 join() 提前返回
+        if info is not None and info['on_status']:
+            info['on_status'](info['key'], 'error', "工作进程意外退出")
+        with self._lock:
+            if self._closed or slot not in self._slots:
+                return
+            index = self._slots.index(slot)
+            if task_id is not None:
+                self._finish(task_id)
+            slot['conn'].close()
+            self._slots[index] = self._spawn_worker(index)
+        self.dispatch()
@@ -0,0 +1,157 @@
+import numpy as np
+
+from utils.non_dominated_sort import non_dominated_sort
+
+# 自动选择时使用精确 WFG 算法的最大目标数，超过后改用蒙特卡洛估计
+EXACT_MAX_OBJECTIVES = 5
+# 蒙特卡洛估计的默认采样数
+MC_SAMPLES = 100000
+# 蒙特卡洛估计单块采样数，限制 (块大小, n, m) 比较张量的内存
+MC_CHUNK = 10000
+
+
+def _nondominated(points: np.ndarray) -> np.ndarray:
+    """去重后返回第一非支配层的点"""
+    if len(points) <= 1:
+        return points
+    points = np.unique(points, axis=0)
+    return points[non_dominated_sort(points, n_stop=1)[0]]
+
+
+def hv_2d(points: np.ndarray, ref_point: np.ndarray) -> float:
+    """
+    二维超体积，排序后一次向量化扫描，O(n log n)
+    :param points: 已被参考点支配的点，形状 (n, 2)
+    :param ref_point: 参考点，形状 (2,)
+    """
+    if len(points) == 0:
+        return 0.0
+    # 按 f1 升序（相同时按 f2 升序），只保留 f2 严格下降的点即为非支配点
+    points = points[np.lexsort((points[:, 1], points[:, 0]))]
+    best = np.minimum.accumulate(points[:, 1])
+    keep = np.ones(len(points), dtype=bool)
+    keep[1:] = points[1:, 1] < best[:-1]
+    points = points[keep]
+    widths = np.diff(np.append(points[:, 0], ref_point[0]))
+    return float(np.sum(widths * (ref_point[1] - points[:, 1])))
+
+
+def hv_3d(points: np.ndarray, ref_point: np.ndarray) -> float:
+    """
+    三维超体积，沿第三个目标切片，每片为二维超体积，O(n^2 log n)
+    :param points: 已被参考点支配的点，形状 (n, 3)
+    :param ref_point: 参考点，形状 (3,)
+    """
+    if len(points) == 0:
+        return 0.0
+    points = points[np.argsort(points[:, 2], kind='stable')]
+    depths = np.diff(np.append(points[:, 2], ref_point[2]))
+    volume = 0.0
+    for i in np.flatnonzero(depths > 0):
+        volume += hv_2d(points[:i + 1, :2], ref_point[:2]) * depths[i]
+    return float(volume)
+
+
+def hv_wfg(points: np.ndarray, ref_point: np.ndarray) -> float:
+    """
+    WFG 精确超体积算法（While, Bradstreet & Barone, 2012），
+    逐点累加其相对后续点的独占超体积，三维及以下直接调用扫描实现
+    :param points: 已被参考点支配的点，形状 (n, m)
+    :param ref_point: 参考点，形状 (m,)
+    """
+    m = points.shape[1]
+    if len(points) == 0:
+        return 0.0
+    if m == 2:
+        return hv_2d(points, ref_point)
+    if m == 3:
+        return hv_3d(points, ref_point)
+    if len(points) == 1:
+        return float(np.prod(ref_point - points[0]))
+
+    # 按最后一个目标降序排列，使限制集（limit set）尽量小
+    points = _nondominated(points)
+    points = points[np.argsort(-points[:, -1], kind='stable')]
+    volume = 0.0
+    for i, p in enumerate(points):
+        limit = _nondominated(np.maximum(points[i + 1:], p))
+        volume += np.prod(ref_point - p) - hv_wfg(limit, ref_point)
+    return float(volume)
+
+
+def hv_monte_carlo(points: np.ndarray, ref_point: np.ndarray, samples: int = MC_SAMPLES, seed=0) -> float:
+    """
+    蒙特卡洛超体积估计，在 [理想点, 参考点] 盒内均匀采样，统计被支配样本的比例
+    :param points: 已被参考点支配的点，形状 (n, m)
+    :param ref_point: 参考点，形状 (m,)
+    :param samples: 采样数，误差约为 O(1/sqrt(samples))
+    :param seed: 随机种子，使用独立的随机数生成器，不影响全局随机状态
+    """
+    if len(points) == 0:
+        return 0.0
+    points = _nondominated(points)
+    lower = points.min(axis=0)
+    box = float(np.prod(ref_point - lower))
+    if box == 0:
+        return 0.0
+
+    rng = np.random.default_rng(seed)
+    dominated = 0
+    for start in range(0, samples, MC_CHUNK):
+        size = min(MC_CHUNK, samples - start)
+        sample = rng.uniform(lower, ref_point, size=(size, len(ref_point)))
+        dominated += int(np.sum(np.any(np.all(points[None, :, :] <= sample[:, None, :], axis=2), axis=1)))
+    return box * dominated / samples
+
+
+HV_BACKENDS = {
+    '2d': hv_2d,
+    '3d': hv_3d,
+    'wfg': hv_wfg,
+    'monte_carlo': hv_monte_carlo,
+}
+
+
+def select_hv_backend(m):
+    """根据目标数自动选择超体积算法"""
+    if m == 2:
+        return '2d'
+    if m == 3:
+        return '3d'
+    if m <= EXACT_MAX_OBJECTIVES:
+        return 'wfg'
+    return 'monte_carlo'
+
+
+def hypervolume(points: np.ndarray, ref_point: np.ndarray, method: str = 'auto', samples: int = MC_SAMPLES,
+                seed=0) -> float:
+    """
+    计算点集相对参考点的超体积（最小化问题）
+    :param points: 目标值矩阵，形状 (n, m)
+    :param ref_point: 参考点，形状 (m,)
+    :param method: 'auto'、'2d'、'3d'、'wfg' 或 'monte_carlo'
+    :param samples: 蒙特卡洛估计的采样数
+    :param seed: 蒙特卡洛估计的随机种子，相同输入和种子得到相同的估计值
+    """
+    points = np.asarray(points, dtype=float)
+    ref_point = np.asarray(ref_point, dtype=float)
+    if points.size == 0:
+        return 0.0
+    points = np.atleast_2d(points)
+    # 只有被参考点支配的点才有贡献
+    points = points[np.all(points < ref_point, axis=1)]
+    if len(points) == 0:
+        return 0.0
+    m = points.shape[1]
+    if m == 1:
+        return float(ref_point[0] - points[:, 0].min())
+
+    if method == 'auto':
+        method = select_hv_backend(m)
+    if method not in HV_BACKENDS:
+        raise ValueError(f"未知的超体积计算方法: {method}")
+    if method == '2d' and m != 2 or method == '3d' and m != 3:
+        raise ValueError(f"{method} 方法不适用于 {m} 个目标")
+    if method == 'monte_carlo':
+        return hv_monte_carlo(points, ref_point, samples, seed)
+    return HV_BACKENDS[method](points, ref_point)
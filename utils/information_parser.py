@@ -1,199 +1,85 @@
-import random
 import os
-import json
 import sys
 
-def get_all_dynamic_strategy():
-    # 获取当前脚本所在目录路径，也就是main.py所在的目录
-    root_dir = os.path.dirname(os.path.abspath(sys.argv[0]))
-
-    # 构建目标目录路径
-    target_dir = os.path.join(root_dir, "algorithms", "response_strategy")
-
-    # 存储所有策略信息的列表
-    strategies = []
+from utils.plugin_registry import PluginRegistry
 
-    # 遍历该目录下的所有文件夹
-    for folder_name in os.listdir(target_dir):
-        folder_path = os.path.join(target_dir, folder_name)
+# 插件（算法、问题）所在的根目录，None 时为启动脚本 main.py 所在目录；命令行入口会显式设置
+ROOT_DIR = None
 
-        # 确保这是一个文件夹
-        if os.path.isdir(folder_path):
-            config_path = os.path.join(folder_path, "info.json")
 
-            # 确保config文件存在并且是文件
-            if os.path.isfile(config_path):
-                try:
-                    # 假设config文件是JSON格式，读取文件内容
-                    with open(config_path, 'r') as config_file:
-                        config_data = json.load(config_file)
+def get_root_dir():
+    if ROOT_DIR is not None:
+        return ROOT_DIR
+    return os.path.dirname(os.path.abspath(sys.argv[0]))
 
-                        # 获取name和year信息
-                        name = config_data.get("name")
-                        year = config_data.get("year")
 
-                        # 将信息添加到列表
-                        strategies.append({
-                            "folder_name": folder_path,
-                            "name": name,
-                            "year": year
-                        })
-                except Exception as e:
-                    print(f"Error reading config for {folder_name}: {e}")
+# 插件注册表：info.json/config.json 和加载出的类按 mtime 缓存，避免每次调用都重新扫描目录、重新执行 main.py
+_registry = PluginRegistry()
 
-    return strategies
 
-def get_all_search_algorithm():
-    # 获取当前脚本所在目录路径，也就是main.py所在的目录
-    root_dir = os.path.dirname(os.path.abspath(sys.argv[0]))
-
-    # 构建目标目录路径
-    target_dir = os.path.join(root_dir, "algorithms", "search_algorithm")
+def load_main_class_from_folder(folder_path):
+    """
+    给定一个文件夹路径，加载其中的 main.py 并返回其中定义的类（与文件夹同名）
+    main.py 未修改时返回已加载的类，不会重新执行模块
+    """
+    return _registry.load_class(folder_path)
 
-    # 存储所有搜索算法信息的列表
-    search_algorithms = []
 
-    # 遍历该目录下的所有文件夹
-    for folder_name in os.listdir(target_dir):
-        folder_path = os.path.join(target_dir, folder_name)
+def load_plugin_class(plugin):
+    """
+    返回 find_match_* 得到的插件对应的类，目录插件从 main.py 加载，外部插件直接返回注册的类
+    """
+    return _registry.load_plugin_class(plugin)
 
-        # 确保这是一个文件夹
-        if os.path.isdir(folder_path):
-            config_path = os.path.join(folder_path, "info.json")
 
-            # 确保config文件存在并且是文件
-            if os.path.isfile(config_path):
-                try:
-                    # 假设config文件是JSON格式，读取文件内容
-                    with open(config_path, 'r') as config_file:
-                        config_data = json.load(config_file)
+def register_plugin(kind, name, cls, config=None, year=None):
+    """
+    注册一个不在插件目录中的插件（也可以在安装包中声明 entry point，分组为 flexdmo.<类型>）
+    :param kind: 'response_strategy'、'search_algorithm' 或 'problem'
+    :param name: 插件名
+    :param cls: 插件类
+    :param config: 默认配置，默认使用类属性 default_config
+    :param year: 年份
+    """
+    _registry.register(kind, name, cls, config, year)
 
-                        # 获取name和year信息
-                        name = config_data.get("name")
-                        year = config_data.get("year")
 
-                        # 将信息添加到列表
-                        search_algorithms.append({
-                            "folder_name": folder_path,
-                            "name": name,
-                            "year": year
-                        })
-                except Exception as e:
-                    print(f"Error reading config for {folder_name}: {e}")
+def get_all_dynamic_strategy():
+    # 插件根目录下 algorithms/response_strategy 中的所有策略，加上外部注册的策略
+    return _registry.plugins('response_strategy', get_root_dir())
 
-    return search_algorithms
+def get_all_search_algorithm():
+    # 插件根目录下 algorithms/search_algorithm 中的所有搜索算法，加上外部注册的搜索算法
+    return _registry.plugins('search_algorithm', get_root_dir())
 
 def get_all_problem():
-    # 获取当前脚本所在目录路径，也就是main.py所在的目录
-    root_dir = os.path.dirname(os.path.abspath(sys.argv[0]))
-
-    # 构建目标目录路径
-    target_dir = os.path.join(root_dir, "problems", "benchmark")
-
-    # 存储所有问题信息的列表
-    problems = []
-
-    # 遍历该目录下的所有文件夹
-    for folder_name in os.listdir(target_dir):
-        folder_path = os.path.join(target_dir, folder_name)
-
-        # 确保这是一个文件夹
-        if os.path.isdir(folder_path):
-            config_path = os.path.join(folder_path, "info.json")
-
-            # 确保config文件存在并且是文件
-            if os.path.isfile(config_path):
-                try:
-                    # 假设config文件是JSON格式，读取文件内容
-                    with open(config_path, 'r') as config_file:
-                        config_data = json.load(config_file)
-
-                        # 获取name和year信息
-                        name = config_data.get("name")
-
-                        # 将信息添加到列表
-                        problems.append({
-                            "folder_name": folder_path,
-                            "name": name,
-                        })
-                except Exception as e:
-                    print(f"Error reading config for {folder_name}: {e}")
-
-    return problems
+    # 插件根目录下 problems/benchmark 中的所有问题，加上外部注册的问题
+    return _registry.plugins('problem', get_root_dir())
 
 def find_match_response_strategy(dynamic_response_name):
-    # 获取所有动态响应策略
-    strategies = get_all_dynamic_strategy()
     # 查找与 dynamic_response_name 匹配的策略
-    return next((strategy for strategy in strategies if strategy["name"] == dynamic_response_name), None)
+    return _registry.find('response_strategy', dynamic_response_name, get_root_dir())
 
 def find_match_search_algorithm(search_algorithm_name):
-    # 获取所有搜索算法
-    search_algorithms = get_all_search_algorithm()
     # 查找与 search_algorithm_name 匹配的搜索算法
-    return next(
-        (algorithm for algorithm in search_algorithms if algorithm["name"] == search_algorithm_name), None)
+    return _registry.find('search_algorithm', search_algorithm_name, get_root_dir())
 
 def find_match_problem(problem_name):
-    # 获取所有问题
-    problems = get_all_problem()
     # 查找与 problem_name 匹配的问题
-    return next(
-        (problem for problem in problems if problem["name"] == problem_name), None)
+    return _registry.find('problem', problem_name, get_root_dir())
 
 
 def get_dynamic_response_config(dynamic_response_name):
-    config_data = {}
-    matching_strategy = find_match_response_strategy(dynamic_response_name)
-    config_path = os.path.join(matching_strategy['folder_name'], "config.json")
-    # 确保config文件存在并且是文件
-    if os.path.isfile(config_path):
-        try:
-            # 假设config文件是JSON格式，读取文件内容
-            with open(config_path, 'r') as config_file:
-                config_data = json.load(config_file)
-        except Exception as e:
-            print(f"Error reading config for {config_path}: {e}")
-    return config_data
+    return _registry.config(find_match_response_strategy(dynamic_response_name))
 
 
 # 获取搜索算法配置
 def get_search_algorithm_config(search_algorithm_name):
-    config_data = {}
-
-    matching_algorithm = find_match_search_algorithm(search_algorithm_name)
-
-    if matching_algorithm:
-        config_path = os.path.join(matching_algorithm['folder_name'], "config.json")
-        # 确保config文件存在并且是文件
-        if os.path.isfile(config_path):
-            try:
-                # 假设config文件是JSON格式，读取文件内容
-                with open(config_path, 'r') as config_file:
-                    config_data = json.load(config_file)
-            except Exception as e:
-                print(f"Error reading config for {config_path}: {e}")
-
-    return config_data
+    return _registry.config(find_match_search_algorithm(search_algorithm_name))
 
 # 获取问题配置
 def get_problem_config(problem_name):
-    config_data = {}
-    # 获取所有问题
-    matching_problem = find_match_problem(problem_name)
-
-    if matching_problem:
-        config_path = os.path.join(matching_problem['folder_name'], "config.json")
-        # 确保config文件存在并且是文件
-        if os.path.isfile(config_path):
-            try:
-                # 假设config文件是JSON格式，读取文件内容
-                with open(config_path, 'r') as config_file:
-                    config_data = json.load(config_file)
-            except Exception as e:
-                print(f"Error reading config for {config_path}: {e}")
-
-    return config_data
+    return _registry.config(find_match_problem(problem_name))
 
 def convert_config_to_numeric(config_dict):
     converted = {}
@@ -0,0 +1,144 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+
+from utils.information_parser import get_root_dir
+
+# 缓存文件放在被扫描的结果根目录下
+METRIC_CACHE_NAME = ".metric_cache.sqlite"
+# 指标实现变化导致旧缓存失效时递增
+METRIC_CACHE_VERSION = 1
+_HASH_BLOCK = 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, hash TEXT
+);
+CREATE TABLE IF NOT EXISTS settings (
+    hash TEXT PRIMARY KEY, settings TEXT
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    hash TEXT, metric TEXT, params TEXT, value REAL,
+    PRIMARY KEY (hash, metric, params)
+);
+"""
+
+
+def file_hash(path):
+    """结果文件内容的 sha1"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class MetricCache:
+    def __init__(self, db_path):
+        """
+        结果文件指标的持久化缓存（SQLite）。
+        - files 表记录 路径 -> (mtime, size, 内容哈希)，mtime 和 size 未变时不重新计算哈希
+        - metrics/settings 表按内容哈希保存指标值和 settings，文件被复制或移动后仍然命中
+        多个进程（例如并行计算指标的进程池）可以同时读写同一个缓存文件。
+        :param db_path: SQLite 文件路径
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self):
+        if not self._initialized:
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        if not self._initialized:
+            with self._lock:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(_SCHEMA)
+                self._initialized = True
+        return conn
+
+    @staticmethod
+    def _params_key(params):
+        return json.dumps(dict(params or {}, version=METRIC_CACHE_VERSION), sort_keys=True)
+
+    def _hash_of(self, conn, file_path):
+        """返回文件内容哈希，文件的 mtime/size 变化时重新计算"""
+        path = os.path.abspath(file_path)
+        stat = os.stat(path)
+        row = conn.execute("SELECT mtime_ns, size, hash FROM files WHERE path = ?", (path,)).fetchone()
+        if row is not None and row[0] == stat.st_mtime_ns and row[1] == stat.st_size:
+            return row[2]
+        digest = file_hash(path)
+        conn.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)", (path, stat.st_mtime_ns, stat.st_size, digest))
+        return digest
+
+    def get(self, file_path, metric, params=None):
+        """
+        读取缓存的指标，缓存不可用（例如目录只读）时视为未命中
+        :return: (值, settings)，未命中时值为 None；settings 未缓存时为 None
+        """
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    digest = self._hash_of(conn, file_path)
+                    row = conn.execute("SELECT value FROM metrics WHERE hash = ? AND metric = ? AND params = ?",
+                                       (digest, metric, self._params_key(params))).fetchone()
+                    settings = conn.execute("SELECT settings FROM settings WHERE hash = ?", (digest,)).fetchone()
+            finally:
+                conn.close()
+        except (sqlite3.Error, OSError) as e:
+            print(f"[指标缓存] 读取失败: {e}")
+            return None, None
+        return (row[0] if row else None), (json.loads(settings[0]) if settings else None)
+
+    def put(self, file_path, metric, value, params=None, settings=None):
+        """写入指标（以及建表需要的 settings），写入失败只打印提示"""
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    digest = self._hash_of(conn, file_path)
+                    conn.execute("INSERT OR REPLACE INTO metrics VALUES (?, ?, ?, ?)",
+                                 (digest, metric, self._params_key(params), float(value)))
+                    if settings is not None:
+                        conn.execute("INSERT OR REPLACE INTO settings VALUES (?, ?)",
+                                     (digest, json.dumps(settings, default=str)))
+            finally:
+                conn.close()
+        except (sqlite3.Error, OSError) as e:
+            print(f"[指标缓存] 写入失败: {e}")
+
+    def get_or_compute(self, file_path, metric, compute, params=None, settings=None):
+        """命中缓存时直接返回，否则调用 compute() 计算并写入缓存（连同 settings）"""
+        value, _ = self.get(file_path, metric, params)
+        if value is None:
+            value = compute()
+            self.put(file_path, metric, value, params, settings)
+        return value
+
+    def clear(self):
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM files")
+                conn.execute("DELETE FROM settings")
+                conn.execute("DELETE FROM metrics")
+        finally:
+            conn.close()
+
+
+_caches = {}
+
+
+def get_metric_cache(root=None):
+    """
+    按结果根目录共用的指标缓存，位于 <root>/.metric_cache.sqlite
+    :param root: 被扫描的结果根目录，默认 <项目根目录>/results
+    """
+    db_path = os.path.abspath(os.path.join(root or os.path.join(get_root_dir(), 'results'), METRIC_CACHE_NAME))
+    if db_path not in _caches:
+        _caches[db_path] = MetricCache(db_path)
+    return _caches[db_path]
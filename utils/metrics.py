@@ -1,136 +1,241 @@
+import importlib.util
+from collections import OrderedDict
+
 import numpy as np
 
+from utils.hypervolume import hypervolume, MC_SAMPLES
+
+# scipy.spatial 导入需要数百毫秒，第一次构建 KD 树时才导入
+_HAS_SCIPY = importlib.util.find_spec('scipy') is not None
+
+# 分块计算最近距离时单块距离矩阵的内存预算（字节）
+CHUNK_MEMORY = 32 * 1024 * 1024
+# 参考前沿索引缓存的最大条目数
+REFERENCE_CACHE_SIZE = 256
+
+_reference_cache = OrderedDict()
+
+
+class ReferenceFront:
+    """参考前沿（真实 POF）及其最近邻索引，KD 树在第一次使用时构建"""
+
+    def __init__(self, points):
+        self.points = np.asarray(points, dtype=float)
+        self._tree = None
+
+    @property
+    def tree(self):
+        if self._tree is None and _HAS_SCIPY:
+            from scipy.spatial import cKDTree
+            self._tree = cKDTree(self.points)
+        return self._tree
+
+    def nearest_distances(self, query, method='auto'):
+        """query 中每个点到参考前沿的最近距离"""
+        query = np.asarray(query, dtype=float)
+        if _resolve_method(method) == 'kdtree':
+            return self.tree.query(query, k=1)[0]
+        return _chunked_nearest_distances(query, self.points)
+
+
+def _resolve_method(method):
+    if method == 'auto':
+        return 'kdtree' if _HAS_SCIPY else 'chunked'
+    if method == 'kdtree' and not _HAS_SCIPY:
+        raise ImportError("kdtree 方法需要安装 scipy")
+    if method not in ('kdtree', 'chunked'):
+        raise ValueError(f"未知的最近距离计算方法: {method}")
+    return method
+
+
+def _chunked_nearest_distances(query, reference, memory=CHUNK_MEMORY):
+    """
+    分块计算 query 中每个点到 reference 的最近欧氏距离，
+    使用 |q|^2 + |r|^2 - 2 q·r 展开，峰值内存约为 memory 字节
+    """
+    chunk = max(1, int(memory // (8 * max(len(reference), 1))))
+    reference_sq = np.sum(reference ** 2, axis=1)
+    distances = np.empty(len(query))
+    for start in range(0, len(query), chunk):
+        part = query[start:start + chunk]
+        squared = np.sum(part ** 2, axis=1)[:, None] + reference_sq[None, :] - 2 * part @ reference.T
+        distances[start:start + chunk] = np.sqrt(np.maximum(np.min(squared, axis=1), 0))
+    return distances
+
+
+def nearest_distances(query, reference, method='auto'):
+    """query 中每个点到 reference 点集的最近距离（不缓存 reference 的索引）"""
+    query = np.asarray(query, dtype=float)
+    reference = np.asarray(reference, dtype=float)
+    if _resolve_method(method) == 'kdtree':
+        from scipy.spatial import cKDTree
+        return cKDTree(reference).query(query, k=1)[0]
+    return _chunked_nearest_distances(query, reference)
+
+
+def problem_key(settings):
+    """
+    参考前沿缓存键中的问题部分：结果 settings 中的问题校验和，没有时按问题类名和参数计算
+    :param settings: 结果文件或运行时的 settings，为空时返回 None（不缓存）
+    """
+    if not settings:
+        return None
+    checksum = settings.get('problem_checksum')
+    if checksum is None:
+        from utils.result_io import problem_checksum  # result_io 导入了本模块，用到时再导入
+        checksum = problem_checksum(settings.get('problem_class', ''), settings.get('problem_params', {}))
+    return checksum
+
+
+def get_reference_front(pf, key=None):
+    """
+    获取参考前沿及其索引，同一 (问题, t) 的前沿在 MIGD/MGD/IGD 曲线之间共用
+    :param pf: 真实 Pareto 前沿，形状 (k, m)
+    :param key: 缓存键 (problem_key(settings), t)；为 None 时不缓存，只包装本次调用使用
+    """
+    if isinstance(pf, ReferenceFront):
+        return pf
+    if key is None:
+        return ReferenceFront(pf)
+    reference = _reference_cache.get(key)
+    if reference is None:
+        reference = ReferenceFront(np.ascontiguousarray(pf, dtype=float))
+        _reference_cache[key] = reference
+        if len(_reference_cache) > REFERENCE_CACHE_SIZE:
+            _reference_cache.popitem(last=False)
+    else:
+        _reference_cache.move_to_end(key)
+    return reference
+
 
-def calculate_IGD(pop_y, pf):
+def calculate_IGD(pop_y, pf, method='auto', key=None):
     """计算反向世代距离(IGD)
+
+    IGD 需要每个 PF 点到最近种群点的距离，最近邻索引只能建在种群上；
+    种群每一代都不同，这个索引无法缓存，因此每次调用都在种群上重新建树（种群通常比前沿小，建树很快）。
+    缓存的参考前沿在这里只省去前沿的转换，缓存的前沿 KD 树由 calculate_GD 使用。
     
     Args:
         pop_y: 种群的目标值
-        pf: 真实Pareto前沿
+        pf: 真实Pareto前沿（数组或 ReferenceFront）
+        method: 'auto'、'kdtree' 或 'chunked'
+        key: 参考前沿缓存键 (问题, t)，见 get_reference_front
         
     Returns:
         float: IGD值
     """
-    # 计算每个PF点到最近种群点的距离
-    distances = np.min(np.sqrt(np.sum((pf[:, np.newaxis] - pop_y)**2, axis=2)), axis=1)
+    reference = get_reference_front(pf, key)
+    # 计算每个PF点到最近种群点的距离（索引建在种群上）
+    distances = nearest_distances(reference.points, pop_y, method)
     return np.mean(distances)
 
-def calculate_HV(pop_y, ref_point):
+def calculate_GD(pop_y, pf, method='auto', key=None):
+    """计算世代距离(GD)
+    
+    Args:
+        pop_y: 种群的目标值
+        pf: 真实Pareto前沿（数组或 ReferenceFront）
+        method: 'auto'、'kdtree' 或 'chunked'
+        key: 参考前沿缓存键 (问题, t)，给出时同一环境的前沿 KD 树只构建一次
+        
+    Returns:
+        float: GD值
+    """
+    # 计算每个种群点到最近PF点的距离，复用前沿索引
+    distances = get_reference_front(pf, key).nearest_distances(pop_y, method)
+    return np.mean(distances)
+
+def calculate_HV(pop_y, ref_point, method='auto', samples=MC_SAMPLES, seed=0):
     """计算超体积(HV)
     
     Args:
         pop_y: 种群的目标值，形状为(n, m)，其中m为目标数
         ref_point: 参考点，形状为(m,)
+        method: 'auto' 时按目标数选择：2维扫描、3维切片、4~5维 WFG、更高维蒙特卡洛
+        samples: 蒙特卡洛估计的采样数
+        seed: 蒙特卡洛估计的随机种子
         
     Returns:
         float: HV值
     """
-    # 确保所有点都被参考点支配
-    if pop_y.size == 0:
-        return 0.0
-    mask = np.all(pop_y <= ref_point, axis=1)
-    points = pop_y[mask]
-    if len(points) == 0:
-        return 0.0
-    
-    # 按第一个目标降序排序
-    points = points[points[:, 0].argsort()[::-1]]
-    
-    # 筛选出在第二个目标上严格递增的点（二维情况）
-    filtered = []
-    max_y = -np.inf
-    for p in points:
-        if p[1] > max_y:  # 只保留严格递增的点
-            filtered.append(p)
-            max_y = p[1]
-    points = np.array(filtered)
-    
-    # 计算超体积
-    hv = 0.0
-    prev_x = ref_point[0]
-    for p in points:
-        current_x = p[0]
-        current_y = p[1]
-        hv += (prev_x - current_x) * (ref_point[1] - current_y)
-        prev_x = current_x
-    
-    return hv
+    return hypervolume(pop_y, ref_point, method, samples, seed)
 
-def calculate_MIGD(runtime_populations):
-    """计算平均反向世代距离(MIGD)
+def _mean_over_environments(runtime_populations, metrics, name, compute, problem=None):
+    """对每个环境最后一代的指标取平均，运行时已累积的值（metrics）直接使用，其余环境现算
     
     Args:
         runtime_populations: 运行时种群数据
-        
-    Returns:
-        float: MIGD值
+        metrics: 运行时累积的指标 {t: {指标名: 值}}，可为 None
+        name: 指标名
+        compute: 现算函数，参数为 (pop_y, pof, key)
+        problem: problem_key 的返回值，给出时参考前沿按 (问题, t) 缓存
     """
-    time_points = sorted(map(int, runtime_populations.keys()))
+    metrics = {int(t): values for t, values in (metrics or {}).items()}
+    time_points = sorted(set(map(int, runtime_populations.keys())) | set(metrics.keys()))
     time_metric_values = []
     
     for time in time_points:
-        populations = runtime_populations[time]
+        if name in metrics.get(time, {}):
+            time_metric_values.append(metrics[time][name])
+            continue
+        populations = runtime_populations.get(time, runtime_populations.get(str(time)))
+        if not populations:
+            continue
         last_env = list(populations.values())[-1]
         
         if 'POF' not in last_env or 'population' not in last_env:
             continue
             
         pof = np.array(last_env['POF'])
-        pop_y = np.array([ind.F for ind in last_env['population']])
-        value = calculate_IGD(pop_y, pof)
-        time_metric_values.append(value)
+        pop_y = last_env['population'].get_objective_matrix()
+        key = (problem, time) if problem is not None else None
+        time_metric_values.append(compute(pop_y, pof, key))
     
     return np.mean(time_metric_values) if time_metric_values else 0.0
 
-def calculate_MGD(runtime_populations):
-    """计算平均世代距离(MGD)
+def calculate_MIGD(runtime_populations, metrics=None, problem=None):
+    """计算平均反向世代距离(MIGD)
     
     Args:
         runtime_populations: 运行时种群数据
+        metrics: 运行时累积的各环境指标，有则直接使用
+        problem: problem_key(settings)，给出时各环境的参考前沿按 (问题, t) 缓存
         
     Returns:
-        float: MGD值
+        float: MIGD值
     """
-    time_points = sorted(map(int, runtime_populations.keys()))
-    time_metric_values = []
+    return _mean_over_environments(runtime_populations, metrics, 'IGD',
+                                   lambda pop_y, pof, key: calculate_IGD(pop_y, pof, key=key), problem)
+
+def calculate_MGD(runtime_populations, metrics=None, problem=None):
+    """计算平均世代距离(MGD)
     
-    for time in time_points:
-        populations = runtime_populations[time]
-        last_env = list(populations.values())[-1]
+    Args:
+        runtime_populations: 运行时种群数据
+        metrics: 运行时累积的各环境指标，有则直接使用
+        problem: problem_key(settings)，给出时各环境的参考前沿按 (问题, t) 缓存
         
-        if 'POF' not in last_env or 'population' not in last_env:
-            continue
-            
-        pof = np.array(last_env['POF'])
-        pop_y = np.array([ind.F for ind in last_env['population']])
-        value = calculate_IGD(pof, pop_y)
-        time_metric_values.append(value)
-    
-    return np.mean(time_metric_values) if time_metric_values else 0.0
+    Returns:
+        float: MGD值
+    """
+    return _mean_over_environments(runtime_populations, metrics, 'GD',
+                                   lambda pop_y, pof, key: calculate_GD(pop_y, pof, key=key), problem)
 
-def calculate_MHV(runtime_populations):
+def calculate_MHV(runtime_populations, method='auto', samples=MC_SAMPLES, metrics=None, problem=None, seed=0):
     """计算平均超体积(MHV)
     
     Args:
         runtime_populations: 运行时种群数据
+        method: 超体积算法，'auto' 时按目标数自动选择
+        samples: 蒙特卡洛估计的采样数
+        metrics: 运行时累积的各环境指标，有则直接使用
+        problem: 与 calculate_MIGD 接口一致，超体积不使用参考前沿索引
+        seed: 蒙特卡洛估计的随机种子，固定后结果可复现，也可以按 (method, samples, seed) 缓存
         
     Returns:
         float: MHV值
     """
-    time_points = sorted(map(int, runtime_populations.keys()))
-    time_metric_values = []
-    
-    for time in time_points:
-        populations = runtime_populations[time]
-        last_env = list(populations.values())[-1]
-        
-        if 'POF' not in last_env or 'population' not in last_env:
-            continue
-            
-        pof = np.array(last_env['POF'])
-        pop_y = np.array([ind.F for ind in last_env['population']])
-        ref_point = pof.max(axis=0) + 0.5
-        value = calculate_HV(pop_y, ref_point)
-        time_metric_values.append(value)
-    
-    return np.mean(time_metric_values) if time_metric_values else 0.0
\ No newline at end of file
+    def compute(pop_y, pof, key):
+        return calculate_HV(pop_y, pof.max(axis=0) + 0.5, method, samples, seed)
+
+    return _mean_over_environments(runtime_populations, metrics, 'HV', compute, problem)
@@ -0,0 +1,348 @@
+import bisect
+import inspect
+import numpy as np
+from typing import List
+
+# 自动选择时使用稠密实现的最大个体数（m>=3），超过后改用次二次的算法
+DENSE_LIMIT = 500
+# 分块支配计算单块的内存预算（字节）
+BLOCK_MEMORY = 64 * 1024 * 1024
+
+
+def _fronts_from_ranks(ranks: np.ndarray) -> List[np.ndarray]:
+    """将每个个体的前沿序号（从0开始）转为前沿索引列表"""
+    if len(ranks) == 0:
+        return []
+    order = np.argsort(ranks, kind='stable')
+    bounds = np.flatnonzero(np.diff(ranks[order])) + 1
+    return [np.sort(front) for front in np.split(order, bounds)]
+
+
+def _truncate_fronts(fronts: List[np.ndarray], n_stop=None) -> List[np.ndarray]:
+    """只保留覆盖前 n_stop 个个体所需的前沿"""
+    if n_stop is None:
+        return fronts
+    count = 0
+    for i, front in enumerate(fronts):
+        count += len(front)
+        if count >= n_stop:
+            return fronts[:i + 1]
+    return fronts
+
+
+def dense_sort(objectives: np.ndarray, n_stop=None) -> List[np.ndarray]:
+    """
+    完全向量化的快速非支配排序，一次性构造 (n, n) 支配矩阵，适合小种群
+    :param objectives: 目标函数矩阵，形状 (n, m), n为个体数, m为目标数
+    :param n_stop: 已分配个体数达到 n_stop 后停止剥离前沿，None 表示完整排序
+    :return: 前沿列表，每个元素是前沿个体的索引数组
+    """
+    n = objectives.shape[0]
+
+    # 1. 计算支配关系矩阵 (n, n)
+    # 使用广播比较所有个体对 (i,j): [n,1,m] <= [1,n,m] → [n,n,m]
+    less_or_equal = np.all(objectives[:, None] <= objectives[None, :], axis=2)
+    strictly_less = np.any(objectives[:, None] < objectives[None, :], axis=2)
+    domination = less_or_equal & strictly_less
+
+    # 排除自支配 (i,i)
+    np.fill_diagonal(domination, False)
+
+    # 2. 计算被支配次数 (axis=0: 列求和)
+    dominated_counts = np.sum(domination, axis=0)
+
+    # 3. 分配前沿 (完全向量化实现)
+    fronts = []
+    remaining_mask = np.ones(n, dtype=bool) # 未分配个体掩码
+    assigned = 0
+
+    while np.any(remaining_mask):
+        # 当前前沿：remaining中未被支配的个体
+        current_front = np.where(remaining_mask & (dominated_counts == 0))[0]
+        fronts.append(current_front)
+        assigned += len(current_front)
+        if n_stop is not None and assigned >= n_stop:
+            break
+
+        # 更新remaining_mask
+        remaining_mask[current_front] = False
+
+        # 向量化更新被支配次数：当前前沿支配的所有remaining个体计数减1
+        if np.any(remaining_mask):
+            # 获取remaining个体的索引
+            remaining_indices = np.where(remaining_mask)[0]
+
+            # 计算被当前前沿支配的remaining个体
+            dominated_by_front = np.sum(domination[current_front][:, remaining_indices], axis=0)
+            dominated_counts[remaining_indices] -= dominated_by_front
+
+    return fronts
+
+
+def _count_dominated(rows: np.ndarray, cols: np.ndarray, block: int) -> np.ndarray:
+    """分块统计 cols 中每个个体被 rows 中多少个体支配，峰值内存为 block * len(cols) * m"""
+    counts = np.zeros(len(cols), dtype=np.int64)
+    for start in range(0, len(rows), block):
+        part = rows[start:start + block]
+        less_or_equal = np.all(part[:, None] <= cols[None, :], axis=2)
+        strictly_less = np.any(part[:, None] < cols[None, :], axis=2)
+        counts += np.sum(less_or_equal & strictly_less, axis=0)
+    return counts
+
+
+def blocked_sort(objectives: np.ndarray, n_stop=None, memory: int = BLOCK_MEMORY) -> List[np.ndarray]:
+    """
+    分块支配计算的非支配排序，不保存 (n, n) 支配矩阵，峰值内存受 memory 限制
+    :param objectives: 目标函数矩阵，形状 (n, m)
+    :param n_stop: 已分配个体数达到 n_stop 后停止剥离前沿
+    :param memory: 单块比较允许使用的字节数
+    :return: 前沿列表
+    """
+    n, m = objectives.shape
+    if n == 0:
+        return []
+    # 每块比较产生两个 (block, n, m) 的布尔数组
+    block = max(1, int(memory // (2 * n * max(m, 1))))
+
+    dominated_counts = _count_dominated(objectives, objectives, block)
+
+    fronts = []
+    remaining = np.arange(n)
+    while len(remaining) > 0:
+        is_front = dominated_counts[remaining] == 0
+        current_front = remaining[is_front]
+        fronts.append(current_front)
+        remaining = remaining[~is_front]
+        if n_stop is not None and n - len(remaining) >= n_stop:
+            break
+        if len(remaining) > 0:
+            # 只需用当前前沿与剩余个体重新比较一次
+            dominated_counts[remaining] -= _count_dominated(objectives[current_front], objectives[remaining], block)
+    return fronts
+
+
+def _sweep_a(obj, ranks, S):
+    """二维情形：按字典序扫描 S，用阶梯结构更新 S 内部的前沿序号"""
+    values = []  # 第二个目标的值，递增
+    levels = []  # 对应的前沿序号，递增
+    for s in S:
+        v = obj[s, 1]
+        pos = bisect.bisect_right(values, v)
+        if pos > 0:
+            ranks[s] = max(ranks[s], levels[pos - 1] + 1)
+        r = ranks[s]
+        # 删除被新点覆盖的阶梯项（值不小于 v 且序号不大于 r）
+        end = pos
+        while end < len(values) and levels[end] <= r:
+            end += 1
+        if pos > 0 and values[pos - 1] == v:
+            pos -= 1
+        values[pos:end] = [v]
+        levels[pos:end] = [r]
+
+
+def _sweep_b(obj, ranks, L, H):
+    """二维情形：用 L（序号已确定）更新 H 的前沿序号"""
+    values = []
+    levels = []
+    li = 0
+    for h in H:
+        # 将字典序位于 h 之前的 L 中个体加入阶梯
+        while li < len(L) and L[li] < h:
+            l = L[li]
+            v, r = obj[l, 1], ranks[l]
+            pos = bisect.bisect_right(values, v)
+            if pos == 0 or levels[pos - 1] < r:
+                end = pos
+                while end < len(values) and levels[end] <= r:
+                    end += 1
+                if pos > 0 and values[pos - 1] == v:
+                    pos -= 1
+                values[pos:end] = [v]
+                levels[pos:end] = [r]
+            li += 1
+        pos = bisect.bisect_right(values, obj[h, 1])
+        if pos > 0:
+            ranks[h] = max(ranks[h], levels[pos - 1] + 1)
+
+
+def _dominates_prefix(obj, l, h, k):
+    """在字典序 l < h 的前提下，判断 l 在目标 1..k 上是否不差于 h"""
+    return np.all(obj[l, 1:k + 1] <= obj[h, 1:k + 1])
+
+
+def _helper_b(obj, ranks, L, H, k):
+    if len(L) == 0 or len(H) == 0:
+        return
+    if len(L) == 1 or len(H) == 1:
+        for h in H:
+            for l in L:
+                if l < h and ranks[l] >= ranks[h] and _dominates_prefix(obj, l, h, k):
+                    ranks[h] = ranks[l] + 1
+        return
+    if k == 1:
+        _sweep_b(obj, ranks, L, H)
+        return
+    lk, hk = obj[L, k], obj[H, k]
+    if lk.max() <= hk.min():
+        _helper_b(obj, ranks, L, H, k - 1)
+        return
+    if lk.min() > hk.max():
+        return
+    median = np.median(np.concatenate((lk, hk)))
+    L_low, L_mid, L_high = L[lk < median], L[lk == median], L[lk > median]
+    H_low, H_mid, H_high = H[hk < median], H[hk == median], H[hk > median]
+    _helper_b(obj, ranks, L_low, H_low, k)
+    _helper_b(obj, ranks, np.union1d(L_low, L_mid), np.union1d(H_mid, H_high), k - 1)
+    _helper_b(obj, ranks, L_high, H_high, k)
+
+
+def _helper_a(obj, ranks, S, k):
+    if len(S) < 2:
+        return
+    if len(S) == 2:
+        l, h = S
+        if _dominates_prefix(obj, l, h, k):
+            ranks[h] = max(ranks[h], ranks[l] + 1)
+        return
+    if k == 1:
+        _sweep_a(obj, ranks, S)
+        return
+    sk = obj[S, k]
+    if sk.min() == sk.max():
+        _helper_a(obj, ranks, S, k - 1)
+        return
+    median = np.median(sk)
+    if not np.any(sk == median):
+        # 偶数个元素时中位数可能不在集合中，取不小于它的最小值保证划分严格缩小
+        median = sk[sk > median].min()
+    S_low, S_mid, S_high = S[sk < median], S[sk == median], S[sk > median]
+    _helper_a(obj, ranks, S_low, k)
+    _helper_b(obj, ranks, S_low, S_mid, k - 1)
+    _helper_a(obj, ranks, S_mid, k - 1)
+    _helper_b(obj, ranks, np.union1d(S_low, S_mid), S_high, k - 1)
+    _helper_a(obj, ranks, S_high, k)
+
+
+def jensen_sort(objectives: np.ndarray, n_stop=None) -> List[np.ndarray]:
+    """
+    Jensen/Fortin 分治非支配排序，复杂度 O(n log^{m-1} n)，在 m=2/3 时明显快于两两比较
+    :param objectives: 目标函数矩阵，形状 (n, m)
+    :param n_stop: 只返回覆盖前 n_stop 个个体的前沿（分治本身一次性算出全部序号）
+    :return: 前沿列表
+    """
+    n, m = objectives.shape
+    if n == 0:
+        return []
+    # 字典序排序并合并重复点，重复点属于同一前沿
+    unique, inverse = np.unique(objectives, axis=0, return_inverse=True)
+    inverse = np.ravel(inverse)
+    ranks = np.zeros(len(unique), dtype=np.int64)
+    if m == 1:
+        ranks = np.arange(len(unique))
+    else:
+        _helper_a(unique, ranks, np.arange(len(unique)), m - 1)
+    return _truncate_fronts(_fronts_from_ranks(ranks[inverse]), n_stop)
+
+
+def ens_sort(objectives: np.ndarray, n_stop=None, search: str = 'binary') -> List[np.ndarray]:
+    """
+    高效非支配排序 ENS，按字典序依次把个体放入第一个不支配它的前沿
+    :param objectives: 目标函数矩阵，形状 (n, m)
+    :param n_stop: 只返回覆盖前 n_stop 个个体的前沿
+    :param search: 'sequential'（ENS-SS）或 'binary'（ENS-BS）
+    :return: 前沿列表
+    """
+    n = objectives.shape[0]
+    if n == 0:
+        return []
+    unique, inverse = np.unique(objectives, axis=0, return_inverse=True)
+    inverse = np.ravel(inverse)
+    fronts = []  # 每个前沿中的个体（unique 中的行号）
+
+    def dominated_by(front, p):
+        # 字典序靠前且各目标不差于 p 的点必然支配 p（重复点已合并）
+        return np.any(np.all(unique[front] <= unique[p], axis=1))
+
+    ranks = np.empty(len(unique), dtype=np.int64)
+    for p in range(len(unique)):
+        if search == 'sequential':
+            k = 0
+            while k < len(fronts) and dominated_by(fronts[k], p):
+                k += 1
+        elif search == 'binary':
+            low, high = 0, len(fronts)
+            while low < high:
+                mid = (low + high) // 2
+                if dominated_by(fronts[mid], p):
+                    low = mid + 1
+                else:
+                    high = mid
+            k = low
+        else:
+            raise ValueError(f"未知的ENS搜索方式: {search}")
+        if k == len(fronts):
+            fronts.append([])
+        fronts[k].append(p)
+        ranks[p] = k
+    return _truncate_fronts(_fronts_from_ranks(ranks[inverse]), n_stop)
+
+
+SORT_BACKENDS = {
+    'dense': dense_sort,
+    'blocked': blocked_sort,
+    'jensen': jensen_sort,
+    'ens_ss': lambda objectives, n_stop=None: ens_sort(objectives, n_stop, search='sequential'),
+    'ens_bs': lambda objectives, n_stop=None: ens_sort(objectives, n_stop, search='binary'),
+}
+
+
+def _accepts_n_stop(func):
+    try:
+        parameters = inspect.signature(func).parameters.values()
+    except (TypeError, ValueError):
+        return True
+    return any(p.name == 'n_stop' or p.kind in (p.VAR_POSITIONAL, p.VAR_KEYWORD) for p in parameters)
+
+
+def register_sort_backend(name, func):
+    """
+    注册自定义排序后端，func(objectives, n_stop=None) 接收 (n, m) 目标矩阵并返回前沿索引列表。
+    只接收 objectives 的旧后端 func(objectives) 也可以注册，完整排序后再按 n_stop 截断
+    """
+    if not _accepts_n_stop(func):
+        legacy = func
+
+        def func(objectives, n_stop=None):
+            return _truncate_fronts(legacy(objectives), n_stop)
+    SORT_BACKENDS[name] = func
+
+
+def select_sort_backend(n, m):
+    """根据个体数 n 和目标数 m 选择排序后端"""
+    if m <= 2:
+        return 'jensen'
+    if n <= DENSE_LIMIT:
+        # 稠密实现的 (n, n, m) 比较张量超过内存预算时（目标数很多）改用分块实现
+        return 'dense' if 2 * n * n * m <= BLOCK_MEMORY else 'blocked'
+    if m == 3:
+        return 'jensen'
+    return 'ens_bs'
+
+
+def non_dominated_sort(objectives: np.ndarray, method: str = 'auto', n_stop=None) -> List[np.ndarray]:
+    """
+    非支配排序入口
+    :param objectives: 目标函数矩阵，形状 (n, m)
+    :param method: 'auto' 或 SORT_BACKENDS 中的后端名
+    :param n_stop: 前沿覆盖的个体数达到 n_stop 即可停止，None 表示完整排序
+    :return: 前沿列表，每个元素是前沿个体的索引数组
+    """
+    objectives = np.asarray(objectives)
+    if objectives.ndim != 2:
+        objectives = objectives.reshape(len(objectives), -1)
+    if method == 'auto':
+        method = select_sort_backend(*objectives.shape)
+    if method not in SORT_BACKENDS:
+        raise ValueError(f"未知的非支配排序后端: {method}")
+    return SORT_BACKENDS[method](objectives, n_stop)
@@ -0,0 +1,161 @@
+import threading
+import time
+import traceback
+from multiprocessing import Pipe
+from multiprocessing.connection import wait
+
+# on_latest 回调的默认最小间隔（秒）
+DEFAULT_INTERVAL = 0.1
+
+
+class PipeListener:
+    def __init__(self):
+        """
+        事件驱动的多路管道监听器：一个线程通过 multiprocessing.connection.wait 阻塞等待所有已注册的管道
+        和子进程哨兵，没有消息时不占用 CPU（替代每个管道一个 while True + poll() 的忙等线程）。
+        每个管道可以注册两类回调：
+        - on_message：每条消息都立即回调（例如保存数据、处理状态）
+        - on_latest：按 key 合并消息，同一 key 在 interval 秒内只回调一次最新的一条（例如刷新图表、进度条），
+          管道关闭前会把尚未回调的最新消息补发
+        """
+        self._lock = threading.Lock()
+        self._entries = {}  # conn -> 注册信息
+        self._wake_reader, self._wake_writer = Pipe(duplex=False)
+        self._wake_lock = threading.Lock()
+        self._thread = None
+
+    def register(self, conn, on_message=None, on_latest=None, key=None, interval=DEFAULT_INTERVAL,
+                 process=None, on_close=None):
+        """
+        注册一个管道
+        :param conn: 管道的父进程端
+        :param on_message: 每条消息的回调 on_message(message)
+        :param on_latest: 合并后的回调 on_latest(message)
+        :param key: 合并键函数 key(message)，返回 None 表示该消息不参与 on_latest；默认整个管道一个键
+        :param interval: 同一 key 两次 on_latest 的最小间隔（秒）
+        :param process: 对应的子进程，进程结束时读完剩余消息后关闭该管道
+        :param on_close: 管道关闭（EOF 或进程结束）后的回调 on_close()
+        """
+        entry = {
+            'on_message': on_message,
+            'on_latest': on_latest,
+            'key': key or (lambda message: 0),
+            'interval': interval,
+            'sentinel': process.sentinel if process is not None else None,
+            'on_close': on_close,
+            'pending': {},  # key -> 尚未回调的最新消息
+            'last': {},  # key -> 上次回调时间
+        }
+        with self._lock:
+            self._entries[conn] = entry
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="PipeListener", daemon=True)
+                self._thread.start()
+        self._wake()
+
+    def unregister(self, conn):
+        """取消注册（不触发 on_close）"""
+        with self._lock:
+            self._entries.pop(conn, None)
+        self._wake()
+
+    def _wake(self):
+        with self._wake_lock:
+            self._wake_writer.send(None)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                entries = dict(self._entries)
+            waitables = [self._wake_reader]
+            sentinels = {}
+            for conn, entry in entries.items():
+                waitables.append(conn)
+                if entry['sentinel'] is not None:
+                    sentinels[entry['sentinel']] = conn
+                    waitables.append(entry['sentinel'])
+
+            ready = wait(waitables, self._next_timeout(entries))
+            for item in ready:
+                if item is self._wake_reader:
+                    while self._wake_reader.poll():
+                        self._wake_reader.recv()
+                elif item in entries:
+                    self._receive(item, entries[item])
+                elif item in sentinels:
+                    # 子进程已结束：读完管道中剩余的消息后关闭
+                    conn = sentinels[item]
+                    entry = entries[conn]
+                    while self._receive(conn, entry) and conn.poll():
+                        pass
+                    self._close(conn, entry)
+            self._flush_due(entries)
+
+    def _next_timeout(self, entries):
+        """距离最近一条待补发消息的时间，没有待补发消息时无限等待"""
+        deadlines = [entry['last'].get(key, 0) + entry['interval']
+                     for entry in entries.values() for key in entry['pending']]
+        if not deadlines:
+            return None
+        return max(0.0, min(deadlines) - time.monotonic())
+
+    def _receive(self, conn, entry):
+        """读取一条消息，管道已关闭时关闭该注册并返回 False"""
+        try:
+            if conn.closed or not conn.poll():
+                return False
+            message = conn.recv()
+        except (EOFError, OSError):
+            self._close(conn, entry)
+            return False
+        self._call(entry['on_message'], message)
+        if entry['on_latest'] is not None:
+            key = entry['key'](message)
+            if key is not None:
+                entry['pending'][key] = message
+                self._flush(entry, key, time.monotonic())
+        return True
+
+    def _flush(self, entry, key, now, force=False):
+        if force or now - entry['last'].get(key, 0) >= entry['interval']:
+            entry['last'][key] = now
+            self._call(entry['on_latest'], entry['pending'].pop(key))
+
+    def _flush_due(self, entries):
+        now = time.monotonic()
+        for entry in entries.values():
+            for key in list(entry['pending']):
+                self._flush(entry, key, now)
+
+    def _close(self, conn, entry):
+        with self._lock:
+            if self._entries.get(conn) is not entry:
+                return
+            del self._entries[conn]
+        now = time.monotonic()
+        for key in list(entry['pending']):
+            self._flush(entry, key, now, force=True)
+        if entry['on_close'] is not None:
+            self._call(entry['on_close'])
+
+    @staticmethod
+    def _call(callback, *args):
+        if callback is None:
+            return
+        try:
+            callback(*args)
+        except Exception:
+            print(f"[管道监听] 回调出错: {traceback.format_exc()}")
+
+
+_listener = None
+_listener_lock = threading.Lock()
+
+
+def get_pipe_listener():
+    """进程内共用的监听器（测试模块和实验调度器共用一个监听线程）"""
+    global _listener
+    with _listener_lock:
+        if _listener is None:
+            _listener = PipeListener()
+        return _listener
@@ -0,0 +1,208 @@
+import copy
+import importlib.util
+import json
+import os
+import threading
+
+# 插件类型 -> 插件根目录下的相对路径
+PLUGIN_DIRS = {
+    'response_strategy': ('algorithms', 'response_strategy'),
+    'search_algorithm': ('algorithms', 'search_algorithm'),
+    'problem': ('problems', 'benchmark'),
+}
+# 外部插件的 entry point 分组，例如 flexdmo.problem，entry point 名即插件名
+ENTRY_POINT_PREFIX = 'flexdmo.'
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _read_json(path):
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+class PluginRegistry:
+    def __init__(self):
+        """
+        插件（响应策略、搜索算法、问题）注册表：
+        - 插件目录的扫描结果按目录 mtime 缓存，增删插件文件夹后自动重新扫描
+        - info.json / config.json 读取一次后按文件 mtime 缓存，文件修改后自动重新读取
+        - main.py 加载出的类按 mtime 缓存，同一进程中不会重复执行模块（例如重复导入 torch）
+        - 除了插件目录，还可以通过 register 或 entry point（分组 flexdmo.<类型>）注册外部插件
+        """
+        self._lock = threading.RLock()
+        self._scans = {}  # 插件目录 -> (mtime, [(info.json 路径, 插件文件夹)])
+        self._infos = {}  # info.json 路径 -> (mtime, 插件信息)
+        self._configs = {}  # config.json 路径 -> (mtime, 配置)
+        self._classes = {}  # main.py 路径 -> (mtime, 类)
+        self._registered = {kind: {} for kind in PLUGIN_DIRS}  # 类型 -> {插件名: 插件信息}
+        self._entry_points_loaded = False
+
+    # ---------------- 插件列表 ----------------
+    def plugins(self, kind, root_dir):
+        """
+        返回某类插件的列表，每项为 {"folder_name", "name", "year"}，外部插件额外带有 "class"
+        :param kind: 插件类型，见 PLUGIN_DIRS
+        :param root_dir: 插件根目录
+        """
+        if kind not in PLUGIN_DIRS:
+            raise ValueError(f"Unknown plugin kind: {kind}")
+        self._load_entry_points()
+        target_dir = os.path.join(root_dir, *PLUGIN_DIRS[kind])
+
+        plugins = []
+        for info_path, folder_path in self._scan(target_dir):
+            info = self._info(info_path, folder_path, kind)
+            if info is not None:
+                plugins.append(dict(info))
+        with self._lock:
+            plugins.extend(dict(info) for info in self._registered[kind].values())
+        return plugins
+
+    def find(self, kind, name, root_dir):
+        return next((plugin for plugin in self.plugins(kind, root_dir) if plugin["name"] == name), None)
+
+    def _scan(self, target_dir):
+        """插件目录下所有带 info.json 的文件夹，目录 mtime 未变时直接返回上次的结果"""
+        mtime = _mtime(target_dir)
+        with self._lock:
+            cached = self._scans.get(target_dir)
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
+        entries = []
+        for folder_name in os.listdir(target_dir):
+            folder_path = os.path.join(target_dir, folder_name)
+            info_path = os.path.join(folder_path, "info.json")
+            # 确保这是一个文件夹，并且 info.json 存在
+            if os.path.isfile(info_path):
+                entries.append((info_path, folder_path))
+        with self._lock:
+            self._scans[target_dir] = (mtime, entries)
+        return entries
+
+    def _info(self, info_path, folder_path, kind):
+        mtime = _mtime(info_path)
+        with self._lock:
+            cached = self._infos.get(info_path)
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
+        try:
+            config_data = _read_json(info_path)
+        except Exception as e:
+            print(f"Error reading config for {os.path.basename(folder_path)}: {e}")
+            return None
+        info = {"folder_name": folder_path, "name": config_data.get("name")}
+        if kind != 'problem':
+            info["year"] = config_data.get("year")
+        with self._lock:
+            self._infos[info_path] = (mtime, info)
+        return info
+
+    # ---------------- 默认配置 ----------------
+    def config(self, plugin):
+        """
+        插件的默认配置（config.json），返回副本，调用方可以直接修改
+        :param plugin: plugins() 返回的插件信息，None 时返回空配置
+        """
+        if plugin is None:
+            return {}
+        if plugin.get("folder_name") is None:
+            return copy.deepcopy(plugin.get("config", {}))
+        config_path = os.path.join(plugin["folder_name"], "config.json")
+        mtime = _mtime(config_path)
+        if mtime is None:
+            return {}
+        with self._lock:
+            cached = self._configs.get(config_path)
+        if cached is None or cached[0] != mtime:
+            try:
+                cached = (mtime, _read_json(config_path))
+            except Exception as e:
+                print(f"Error reading config for {config_path}: {e}")
+                return {}
+            with self._lock:
+                self._configs[config_path] = cached
+        return copy.deepcopy(cached[1])
+
+    # ---------------- 类加载 ----------------
+    def load_class(self, folder_path):
+        """
+        加载文件夹中 main.py 定义的与文件夹同名的类，main.py 未修改时直接返回已加载的类
+        """
+        main_path = os.path.join(folder_path, "main.py")
+        if not os.path.isfile(main_path):
+            raise FileNotFoundError(f"No main.py found in {folder_path}")
+        mtime = _mtime(main_path)
+        with self._lock:
+            cached = self._classes.get(main_path)
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
+
+            module_name = os.path.basename(folder_path)
+            spec = importlib.util.spec_from_file_location(module_name, main_path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+
+            # 默认类名就是文件夹名，例如 NSGA2 目录下就是 NSGA2 类
+            class_name = os.path.basename(folder_path)
+            if not hasattr(module, class_name):
+                raise AttributeError(f"{class_name} class not found in {main_path}")
+            cls = getattr(module, class_name)
+            self._classes[main_path] = (mtime, cls)
+            return cls
+
+    def load_plugin_class(self, plugin):
+        """返回插件信息对应的类（外部插件直接返回注册的类）"""
+        if plugin.get("class") is not None:
+            return plugin["class"]
+        return self.load_class(plugin["folder_name"])
+
+    # ---------------- 外部插件 ----------------
+    def register(self, kind, name, cls, config=None, year=None):
+        """
+        注册一个不在插件目录中的插件
+        :param kind: 插件类型，见 PLUGIN_DIRS
+        :param name: 插件名（界面和实验网格中使用的名称）
+        :param cls: 插件类
+        :param config: 默认配置，默认使用类属性 default_config
+        :param year: 年份
+        """
+        if kind not in PLUGIN_DIRS:
+            raise ValueError(f"Unknown plugin kind: {kind}")
+        info = {"folder_name": None, "name": name, "class": cls,
+                "config": dict(config if config is not None else getattr(cls, 'default_config', {}))}
+        if kind != 'problem':
+            info["year"] = year
+        with self._lock:
+            self._registered[kind][name] = info
+
+    def _load_entry_points(self):
+        with self._lock:
+            if self._entry_points_loaded:
+                return
+            self._entry_points_loaded = True
+        from importlib import metadata  # 导入较慢，第一次列出插件时再导入
+        for kind in PLUGIN_DIRS:
+            try:
+                entry_points = metadata.entry_points(group=ENTRY_POINT_PREFIX + kind)
+            except Exception as e:
+                print(f"Error reading entry points for {kind}: {e}")
+                continue
+            for entry_point in entry_points:
+                try:
+                    self.register(kind, entry_point.name, entry_point.load())
+                except Exception as e:
+                    print(f"Error loading plugin {entry_point.name}: {e}")
+
+    def clear(self):
+        """清空缓存（外部注册的插件保留）"""
+        with self._lock:
+            self._scans.clear()
+            self._infos.clear()
+            self._configs.clear()
+            self._classes.clear()
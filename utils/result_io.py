@@ -1,38 +1,19 @@
-import os
+import hashlib
 import json
+import os
 import traceback
+from multiprocessing import Pool
 import numpy as np
-import tkinter as tk
-import tkinter.ttk as ttk
 
-from utils.information_parser import convert_config_to_numeric, find_match_problem, get_problem_config
+from utils.information_parser import convert_config_to_numeric, find_match_problem, get_problem_config, \
+    load_plugin_class
+from utils.result_store import RESULT_FORMATS, find_result_files, open_result, result_extensions, write_result
+from utils.hypervolume import MC_SAMPLES
+from utils.metric_cache import get_metric_cache
+from utils.metrics import calculate_MGD, calculate_MHV, calculate_MIGD, problem_key
 from views.common.GlobalVar import global_vars
-from components.Population import Population
-from components.Individual import Individual
-from views.components.progress_dialog import ProgressDialog
-
-
-def _save_json_with_numpy(data, file_path):
-    """通用的JSON保存函数，处理numpy数据类型
-    
-    Args:
-        data: 要保存的数据
-        file_path: 保存路径
-    """
-    def convert(obj):
-        if isinstance(obj, np.ndarray):
-            return obj.tolist()
-        if isinstance(obj, (np.float32, np.float64)):
-            return float(obj)
-        if isinstance(obj, (np.int32, np.int64)):
-            return int(obj)
-        return str(obj)
-
-    # 保存为 JSON 文件
-    with open(file_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=None, separators=(',', ':'), default=convert)
+from components.ArrayPopulation import ArrayPopulation
 
-    print(f"[保存成功] -> {file_path}")
 
 def _build_base_filename(settings):
     """构建基础文件名
@@ -55,7 +36,7 @@ def _build_base_filename(settings):
     base_name = f"{response}_on_{algo}_on_{problem}_tau{tau}_n{n}"
     return base_name
 
-def _get_next_filename(save_path, base_filename):
+def _get_next_filename(save_path, base_filename, extension='.json'):
     """获取下一个可用的文件名
     
     Args:
@@ -65,20 +46,19 @@ def _get_next_filename(save_path, base_filename):
     Returns:
         str: 完整的文件名
     """
-    # 获取当前已有文件数量
+    # 获取当前已有文件数量（所有结果格式一起编号）
     existing_files = [f for f in os.listdir(save_path)
-                      if f.startswith(base_filename) and f.endswith('.json')]
+                      if f.startswith(base_filename) and f.lower().endswith(result_extensions())]
     index = len(existing_files) + 1
-    return f"{base_filename}_{index}.json"
+    return f"{base_filename}_{index}{extension}"
 
-def save_module_results(data, save_path):
+def save_module_results(data, save_path, result_format='json'):
     """通用的模块结果保存函数
     
     Args:
         data: 要保存的数据，包含settings信息
         save_path: 保存路径
-        extra_info: 额外的文件名信息，如tau、n等
-        auto_index: 是否自动添加索引号，默认True
+        result_format: 结果文件格式，'json' 或 'npz'（见 utils.result_store）
     """
     os.makedirs(save_path, exist_ok=True)
     
@@ -88,20 +68,63 @@ def save_module_results(data, save_path):
     
     # 构建文件名
     base_filename = _build_base_filename(settings)
-    filename = _get_next_filename(save_path, base_filename)
+    filename = _get_next_filename(save_path, base_filename, RESULT_FORMATS[result_format]['extension'])
     
     full_path = os.path.join(save_path, filename)
-    _save_json_with_numpy(data, full_path)
+    write_result(full_path, data, result_format)
+    print(f"[保存成功] -> {full_path}")
+
+def _simple_attrs(obj):
+    return {
+        k: v for k, v in vars(obj).items()
+        if isinstance(v, (int, float, str, bool, type(None)))
+    }
+
+def problem_checksum(problem_class, problem_params):
+    """问题参数的校验和，用于确认保存的目标值与加载时的问题设置一致
 
-def save_experiment_module_information_results(history, save_path):
+    Args:
+        problem_class: 问题类名
+        problem_params: 问题参数字典（与 settings['problem_params'] 相同）
+
+    Returns:
+        str: sha1 校验和
+    """
+    # 时间步、评估次数等运行状态、总环境数（只决定运行长度）和私有缓存不影响目标值，不参与校验
+    volatile = {'t', 'evaluate_time', 'need_change', 'total_change_time'}
+    params = {k: v for k, v in problem_params.items() if k not in volatile and not k.startswith('_')}
+    text = json.dumps([problem_class, params], sort_keys=True, default=str)
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+def _with_checksum(settings):
+    settings = dict(settings)
+    settings['problem_checksum'] = problem_checksum(settings.get('problem_class', ''),
+                                                    settings.get('problem_params', {}))
+    return settings
+
+def _population_record(population, save_objectives):
+    """单代种群的保存记录：决策矩阵，以及可选的目标/约束矩阵"""
+    record = {"decision": population.get_decision_matrix()}
+    if save_objectives:
+        F = population.get_objective_matrix()
+        G = population.get_constrain_matrix()
+        if F.size and len(F) == len(record["decision"]):
+            record["objective"] = F
+        if G.size and len(G) == len(record["decision"]):
+            record["constrain"] = G
+    return record
+
+def save_experiment_module_information_results(history, save_path, result_format='json', save_objectives=True):
     """保存实验模块的结果
     
     Args:
         history: 算法运行的历史记录
         save_path: 保存路径
+        result_format: 结果文件格式，'json' 或 'npz'
+        save_objectives: 是否同时保存目标值和约束值，加载时可免去重新评估
     """
     # 从settings中获取算法组合信息
-    settings = history.get('settings', {})
+    settings = _with_checksum(history.get('settings', {}))
     response = settings.get('response_strategy_class', 'UnknownResponse')
     search = settings.get('search_algorithm_class', 'UnknownAlgo')
     problem = settings.get('problem_class', 'UnknownProblem')
@@ -115,28 +138,32 @@ def save_experiment_module_information_results(history, save_path):
     for t, populations in history.get('runtime', {}).items():
         runtime_dict[str(t)] = {}
         for eval_time, population in populations.items():
-            runtime_dict[str(t)][str(eval_time)] = population.to_dict()
+            runtime_dict[str(t)][str(eval_time)] = _population_record(population, save_objectives)
 
+    metrics = history.get('metrics', {})
     final_result = {
         "settings": settings,
-        "information": runtime_dict
+        "information": runtime_dict,
+        "metrics": {str(t): dict(values) for t, values in metrics.items()}
     }
     
-    save_module_results(final_result, result_dir)
+    save_module_results(final_result, result_dir, result_format)
 
-def save_test_module_information_results(save_path="results/test_module/"):
+def save_test_module_information_results(save_path="results/test_module/", save_objectives=True):
     """保存 test_module 中所有环境的 settings 和各时间点的 population 字符串表示，结构为 settings + information"""
     runtime_populations = global_vars['test_module']["runtime_populations"]
 
     # 获取 settings 信息（从任意环境任意时间点提取一次即可）
     any_env = next(iter(runtime_populations.values()))
     any_result = next(iter(any_env.values()))
-    settings = any_result.get('settings', {})
+    settings = _with_checksum(any_result.get('settings', {}))
     
     # 构建总结果结构
+    metrics = global_vars['test_module'].get("metrics", {})
     final_result = {
         "settings": settings,
-        "information": {}
+        "information": {},
+        "metrics": {str(t): dict(values) for t, values in metrics.items()}
     }
 
     # 遍历每个环境
@@ -146,111 +173,135 @@ def save_test_module_information_results(save_path="results/test_module/"):
         # 提取该环境下的每个时间点 population
         for time_key, info in population_info.items():
             if "population" in info:
-                env_population_record[str(time_key)] = info["population"].to_dict()
+                env_population_record[str(time_key)] = _population_record(info["population"], save_objectives)
 
         final_result["information"][str(env_key)] = env_population_record
 
     # 使用通用保存函数
     save_module_results(final_result, save_path)
 
-def load_test_module_information_results(file_path):
-    """从JSON文件中加载测试模块的结果信息
+def _open_problem(settings):
+    """按 settings 重建问题实例
     
     Args:
-        file_path (str): JSON文件的完整路径
+        settings: 结果文件中的 settings
         
     Returns:
-        dict: 包含settings和各环境population信息的字典
+        tuple: (问题实例, 是否可以直接使用文件中保存的目标值)
     """
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            
-        # 恢复settings
-        settings = data.get('settings', {})
-        
-        # 获取问题配置
-        problem_config = settings.get('problem_params', {})
-        problem_class = settings.get('problem_class', '')
-        
-        # 动态导入问题类
-        from utils.run_executor import load_main_class_from_folder
-        ProblemClass = load_main_class_from_folder(find_match_problem(problem_class)['folder_name'])
-        
-        # 获取默认配置并更新
-        config = get_problem_config(problem_class)
-        for key, value in problem_config.items():
-            if key in config:
-                config[key] = value
+    # 获取问题配置
+    problem_config = settings.get('problem_params', {})
+    problem_class = settings.get('problem_class', '')
+    
+    # 动态导入问题类
+    ProblemClass = load_plugin_class(find_match_problem(problem_class))
+    
+    # 获取默认配置并更新
+    config = get_problem_config(problem_class)
+    for key, value in problem_config.items():
+        if key in config:
+            config[key] = value
+    
+    # 初始化问题类
+    problem = ProblemClass(**convert_config_to_numeric(config))
+
+    # 文件中保存了目标值且问题参数一致时直接使用，否则重新评估
+    use_stored = settings.get('problem_checksum') == problem_checksum(problem_class, _simple_attrs(problem))
+    return problem, use_stored
+
+def _load_environment(problem, settings, t, generations, use_stored):
+    """重建一个环境中各代的信息字典
+    
+    Args:
+        problem: 问题实例
+        settings: 结果文件中的 settings
+        t: 环境编号
+        generations: {评估次数: {字段名: 数组}}
+        use_stored: 是否直接使用保存的目标值
         
-        # 初始化问题类
-        problem = ProblemClass(**convert_config_to_numeric(config))
+    Returns:
+        dict: {评估次数: 信息字典}，结构与运行时的 runtime_populations 相同
+    """
+    # 设置问题的时间步，同一环境的 POF/POS 只计算一次
+    problem.t = t
+    POF = problem.get_pareto_front(t)
+    POS = problem.get_pareto_set(t)
+
+    env_populations = {}
+    for time_key, pop_data in generations.items():
+        decisions = np.asarray(pop_data.get('decision', []))
+        # 有约束的问题还需要保存的约束值，缺失时（例如旧的测试模式结果）重新评估
+        if use_stored and 'objective' in pop_data and ('constrain' in pop_data or problem.n_con == 0):
+            objectives, constrains = pop_data['objective'], pop_data.get('constrain')
+        else:
+            objectives, constrains = problem.evaluate(decisions, False, t=t)
+
+        # 确保所有列表长度一致
+        min_length = min(len(decisions), len(objectives))
+        if min_length == 0:
+            continue
+        G = None if constrains is None or len(constrains) == 0 else np.asarray(constrains)[:min_length]
+        population = ArrayPopulation(X=decisions[:min_length], F=np.asarray(objectives)[:min_length], G=G)
+
+        # 重建每个时间点的信息字典
+        env_populations[int(time_key)] = {
+            'population': population,
+            'settings': settings,  # 每个时间点都包含相同的settings
+            'POS': POS,
+            'POF': POF,
+            'bound': [np.array(b) for b in pop_data.get('bound', [[], []])],
+            't': t,
+            'evaluate_times': int(time_key)
+        }
+    return env_populations
+
+def iter_result_environments(file_path, last_only=False):
+    """逐个环境加载结果文件，不构建完整的 runtime_populations，内存占用与运行长度无关
+    
+    Args:
+        file_path: 结果文件路径
+        last_only: 只加载每个环境的最后一代（响应策略与 MIGD 等指标只需要这一代）
         
-        # 恢复runtime_populations
-        runtime_populations = {}
-        information = data.get('information', {})
+    Yields:
+        (t, {评估次数: 信息字典})
+    """
+    with open_result(file_path, stream=True) as result_file:
+        settings = result_file.settings
+        problem, use_stored = _open_problem(settings)
+        for t, generations in result_file.iter_environments(last_only):
+            yield t, _load_environment(problem, settings, t, generations, use_stored)
+
+def load_test_module_information_results(file_path):
+    """从结果文件中加载测试模块的结果信息
+    
+    Args:
+        file_path (str): 结果文件的完整路径
         
-        for env_key, env_data in information.items():
-            env_populations = {}
-            
-            for time_key, pop_data in env_data.items():
-                # 从字典重建Population对象
-                individuals = []
-                decisions = pop_data.get('decision', [])
-                objectives,constrains = problem.evaluate(np.array(decisions),False,t=int(env_key))
-       
-                
-                # 确保所有列表长度一致
-                min_length = min(len(decisions), len(objectives))
-                if min_length == 0:
-                    continue
-                    
-                for i in range(min_length):
-                    # 创建个体
-                    individual = Individual(np.array(decisions[i]))
-                    
-                    # 设置目标值
-                    if i < len(objectives):
-                        individual.F = np.array(objectives[i])
-                    
-                    # 设置约束值
-                    if constrains is not None:
-                        individual.G = np.array(constrains[i])
-                        individual.feasible = np.all(constrains[i] <= 0)
-                    
-                    individuals.append(individual)
-                    
-                # 创建种群
-                population = Population(individuals=individuals)
-                
-                # 设置问题的时间步
-                t = int(env_key)
-                problem.t = t
-                
-                # 使用问题类获取当前时间步的POF和POS
-                POF = problem.get_pareto_front(t)
-                POS = problem.get_pareto_set(t)
-                
-                # 重建每个时间点的信息字典
-                env_populations[int(time_key)] = {
-                    'population': population,
-                    'settings': settings,  # 每个时间点都包含相同的settings
-                    'POS': POS,
-                    'POF': POF,
-                    'bound': [np.array(b) for b in pop_data.get('bound', [[], []])],
-                    't': t,
-                    'evaluate_times': int(time_key)
-                }
-                
-            runtime_populations[int(env_key)] = env_populations
+    Returns:
+        dict: 包含settings和各环境population信息的字典
+    """
+    try:
+        with open_result(file_path) as result_file:
+            # 恢复settings
+            settings = result_file.settings
+            problem, use_stored = _open_problem(settings)
+
+            # 恢复runtime_populations，按需读取每个环境的数据
+            runtime_populations = {}
+            for t, generations in result_file.iter_environments():
+                runtime_populations[t] = _load_environment(problem, settings, t, generations, use_stored)
+
+            # 运行时累积的各环境指标（旧文件中没有时为空）
+            metrics = {int(t): values for t, values in result_file.metrics.items()}
             
         # 更新global_vars中的数据
         if 'test_module' not in global_vars:
             global_vars['test_module'] = {}
         global_vars['test_module']['runtime_populations'] = runtime_populations
+        global_vars['test_module']['metrics'] = metrics
         
         print(f"[加载成功] <- {file_path}")
-        return {'settings': settings, 'runtime_populations': runtime_populations}
+        return {'settings': settings, 'runtime_populations': runtime_populations, 'metrics': metrics}
         
     except Exception as e:
         print(f"[加载失败] {str(e)}")
@@ -258,31 +309,34 @@ def load_test_module_information_results(file_path):
         return None
 
 def _get_all_files(path):
-    """递归获取文件夹下的所有.json文件
+    """递归获取文件夹下的所有结果文件（.json / .npz）
     
     Args:
         path: 文件或文件夹路径
         
     Returns:
-        list: 所有.json文件的路径列表
+        list: 所有结果文件的路径列表
     """
-    if os.path.isfile(path):
-        return [path] if path.endswith('.json') else []
-        
-    files = []
-    for item in os.listdir(path):
-        item_path = os.path.join(path, item)
-        if os.path.isfile(item_path) and item_path.endswith('.json'):
-            files.append(item_path)
-        elif os.path.isdir(item_path):
-            files.extend(_get_all_files(item_path))
-    return files
-
-def load_result_from_files(input_paths):
+    return find_result_files(path)
+
+def _open_progress_dialog(show_progress, title):
+    """创建进度条对话框，界面依赖只在这里导入；不显示或没有主窗口（命令行）时返回 None"""
+    if not show_progress:
+        return None
+    try:
+        from views.components.progress_dialog import ProgressDialog
+        progress_dialog = ProgressDialog(title="Loading Results")
+    except (ImportError, ValueError):
+        return None
+    progress_dialog.set_title(title)
+    return progress_dialog
+
+def load_result_from_files(input_paths, show_progress=True):
     """从文件中加载结果
     
     Args:
         input_paths: 输入路径列表，可以是文件或文件夹的混合
+        show_progress: 是否显示进度条对话框
         
     Yields:
         每个文件的加载结果
@@ -295,15 +349,14 @@ def load_result_from_files(input_paths):
     # 计算需要加载的文件总数
     file_count = len(expanded_paths)
     
-    # 创建进度条对话框
-    progress_dialog = ProgressDialog(title="Loading Results")
-    progress_dialog.set_title("Loading files...")
+    progress_dialog = _open_progress_dialog(show_progress, "Loading files...")
     
     # 加载所有文件
     for i, file_path in enumerate(expanded_paths):
         try:
             # 更新状态
-            progress_dialog.update_status(f"Loading: {os.path.basename(file_path)}")
+            if progress_dialog:
+                progress_dialog.update_status(f"Loading: {os.path.basename(file_path)}")
             
             # 加载文件并yield结果
             result = load_test_module_information_results(file_path)
@@ -312,12 +365,146 @@ def load_result_from_files(input_paths):
                 yield result
             
             # 更新进度
-            progress = (i + 1) / file_count * 100
-            progress_dialog.update_progress(progress)
+            if progress_dialog:
+                progress_dialog.update_progress((i + 1) / file_count * 100)
             
         except Exception as e:
             print(f"Error loading file {file_path}: {str(e)}")
             continue
             
     # 关闭进度条对话框
-    progress_dialog.close()
+    if progress_dialog:
+        progress_dialog.close()
+
+# 可并行计算的文件级指标：名称 -> (运行时累积的环境指标名, 计算函数, 计算参数)
+# 计算参数同时写入缓存键；蒙特卡洛 HV 固定随机种子，缓存的就是该种子下可复现的估计值
+FILE_METRICS = {
+    'MIGD': ('IGD', calculate_MIGD, {}),
+    'MGD': ('GD', calculate_MGD, {}),
+    'MHV': ('HV', calculate_MHV, {'method': 'auto', 'samples': MC_SAMPLES, 'seed': 0}),
+}
+
+def file_metric(file_path, metric, runtime_populations, metrics=None, use_cache=True, settings=None):
+    """计算已加载结果的文件级指标，优先读取指标缓存
+    
+    Args:
+        file_path: 结果文件路径，为 None 时不使用缓存
+        metric: 指标名，见 FILE_METRICS
+        runtime_populations: 运行时种群数据
+        metrics: 运行时累积的各环境指标
+        use_cache: 是否读写指标缓存
+        settings: 结果的 settings，用于按 (问题, t) 缓存参考前沿
+        
+    Returns:
+        float: 指标值
+    """
+    if metric not in FILE_METRICS:
+        raise ValueError(f"未知的指标: {metric}")
+    _, compute, params = FILE_METRICS[metric]
+    problem = problem_key(settings)
+    if not file_path or not use_cache:
+        return float(compute(runtime_populations, metrics=metrics, problem=problem, **params))
+    return get_metric_cache(os.path.dirname(os.path.abspath(file_path))).get_or_compute(
+        file_path, metric, lambda: float(compute(runtime_populations, metrics=metrics, problem=problem, **params)),
+        params, settings)
+
+def compute_file_metric(file_path, metric='MIGD', use_cache=True, cache_root=None):
+    """加载单个结果文件并计算指标，只返回标量（在进程池中运行，避免把整个种群传回主进程）
+    
+    Args:
+        file_path: 结果文件路径
+        metric: 指标名，见 FILE_METRICS
+        use_cache: 是否读写指标缓存（命中时连文件都不解析）
+        cache_root: 指标缓存所在目录（通常是被扫描的结果根目录），默认为文件所在目录
+        
+    Returns:
+        dict: {'file_path', 'settings', 'value'}，加载失败时返回 None
+    """
+    if metric not in FILE_METRICS:
+        raise ValueError(f"未知的指标: {metric}")
+    name, compute, params = FILE_METRICS[metric]
+    cache = get_metric_cache(cache_root or os.path.dirname(os.path.abspath(file_path))) if use_cache else None
+    try:
+        if use_cache:
+            value, settings = cache.get(file_path, metric, params)
+            if value is not None and settings is not None:
+                return {'file_path': file_path, 'settings': settings, 'value': value}
+
+        with open_result(file_path, stream=True) as result_file:
+            settings = result_file.settings
+            metrics = {int(t): values for t, values in result_file.metrics.items()}
+        # 运行结束时每个环境（包括最后一个）都会记录指标，环境从 0 连续编号；
+        # 指标覆盖全部环境时只读文件开头的 settings 和指标，不扫描 information
+        if metrics and sorted(metrics) == list(range(len(metrics))) and \
+                all(name in values for values in metrics.values()):
+            value = float(compute({}, metrics=metrics, **params))
+        else:
+            # 逐个环境只加载最后一代计算，算完即丢弃
+            values = {t: values[name] for t, values in metrics.items() if name in values}
+            problem = problem_key(settings)
+            for t, env_populations in iter_result_environments(file_path, last_only=True):
+                if t not in values and env_populations:
+                    values[t] = float(compute({t: env_populations}, problem=problem, **params))
+            value = float(np.mean(list(values.values()))) if values else 0.0
+
+        if use_cache:
+            cache.put(file_path, metric, value, params, settings)
+        return {'file_path': file_path, 'settings': settings, 'value': value}
+    except Exception as e:
+        print(f"Error loading file {file_path}: {str(e)}")
+        return None
+
+def _compute_file_metric_task(args):
+    return compute_file_metric(*args)
+
+def load_metrics_from_files(input_paths, metric='MIGD', workers=None, show_progress=True, use_cache=True):
+    """用进程池并行加载结果文件并计算指标，主进程只接收每个文件的指标标量
+    
+    Args:
+        input_paths: 输入路径列表，可以是文件或文件夹的混合
+        metric: 指标名，见 FILE_METRICS
+        workers: 进程数，默认使用全部 CPU 核心；为 1 时在当前进程中顺序计算
+        show_progress: 是否显示进度条对话框
+        use_cache: 是否使用指标缓存（位于各输入文件夹下），已缓存且未修改的文件不重新计算
+        
+    Yields:
+        每个文件的 {'file_path', 'settings', 'value'}，顺序与文件列表一致
+    """
+    if metric not in FILE_METRICS:
+        raise ValueError(f"未知的指标: {metric}")
+    # 每个文件使用其所在扫描根目录下的指标缓存
+    expanded_paths, roots = [], []
+    for path in input_paths:
+        files = _get_all_files(path)
+        expanded_paths.extend(files)
+        roots.extend([path if os.path.isdir(path) else os.path.dirname(os.path.abspath(path))] * len(files))
+    file_count = len(expanded_paths)
+    if file_count == 0:
+        return
+
+    workers = min(int(workers or os.cpu_count() or 1), file_count)
+    progress_dialog = _open_progress_dialog(show_progress, f"Computing {metric}...")
+    tasks = [(file_path, metric, use_cache, root) for file_path, root in zip(expanded_paths, roots)]
+
+    def finish(i, result):
+        if progress_dialog:
+            progress_dialog.update_progress((i + 1) / file_count * 100, f"{i + 1}/{file_count}")
+        return result
+
+    try:
+        if workers <= 1:
+            for i, task in enumerate(tasks):
+                result = finish(i, compute_file_metric(*task))
+                if result:
+                    yield result
+        else:
+            # 每个子进程一次取一小批文件，减少进程间通信次数
+            chunksize = max(1, min(16, file_count // (workers * 4)))
+            with Pool(workers) as pool:
+                for i, result in enumerate(pool.imap(_compute_file_metric_task, tasks, chunksize)):
+                    result = finish(i, result)
+                    if result:
+                        yield result
+    finally:
+        if progress_dialog:
+            progress_dialog.close()
@@ -0,0 +1,326 @@
+import json
+import os
+
+import numpy as np
+
+try:
+    import ijson
+except ImportError:  # requirements.txt 中已列出；没有安装时 JSON 结果只能整体解析
+    ijson = None
+
+# 结果文件存储后端。结果在内存中的统一结构为：
+#   {"settings": {...}, "information": {t: {evaluate_time: {字段名: 数组}}}, "metrics": {t: {指标: 值}}}
+# json：原有格式，整个文件一次解析；
+# npz：列式二进制格式（zip 压缩），每个 (t, evaluate_time, 字段) 一个独立数据集，读取时按需解压。
+# 逐环境读取（iter_environments）时内存中只有一个环境的数据：npz 本身按需读取，
+# json 需要 ijson 才能流式解析（open_result(path, stream=True)），没有安装时退回整体解析并给出提示。
+
+
+def _to_builtin(obj):
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, (np.float32, np.float64)):
+        return float(obj)
+    if isinstance(obj, (np.int32, np.int64)):
+        return int(obj)
+    return str(obj)
+
+
+class ResultFile:
+    """已打开的结果文件，按环境/评估次数惰性读取"""
+
+    def __init__(self, path):
+        self.path = path
+        self.settings = {}
+        self.metrics = {}
+
+    def environments(self):
+        """所有环境 t（升序）"""
+        raise NotImplementedError
+
+    def evaluations(self, t):
+        """环境 t 下记录的所有评估次数（升序）"""
+        raise NotImplementedError
+
+    def fields(self, t, evaluate_time):
+        """某一代保存的字段名"""
+        raise NotImplementedError
+
+    def get(self, t, evaluate_time, fields=None):
+        """读取某一代的数据 {字段名: 数组}，fields 为 None 时读取全部字段"""
+        raise NotImplementedError
+
+    def iter_environments(self, last_only=False, fields=None):
+        """
+        逐个环境读取数据，同一时刻只有一个环境在内存中
+        :param last_only: 只读取每个环境的最后一代
+        :param fields: 读取的字段名，None 表示全部
+        :return: 生成器，每项为 (t, {evaluate_time: {字段名: 数组}})
+        """
+        for t in self.environments():
+            evaluations = self.evaluations(t)
+            if last_only:
+                evaluations = evaluations[-1:]
+            yield t, {e: self.get(t, e, fields) for e in evaluations}
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class JsonResultFile(ResultFile):
+    def __init__(self, path):
+        super().__init__(path)
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        self.settings = data.get('settings', {})
+        self.metrics = data.get('metrics', {})
+        self._information = {int(t): {int(e): record for e, record in env.items()}
+                             for t, env in data.get('information', {}).items()}
+
+    def environments(self):
+        return sorted(self._information)
+
+    def evaluations(self, t):
+        return sorted(self._information.get(int(t), {}))
+
+    def fields(self, t, evaluate_time):
+        return list(self._information[int(t)][int(evaluate_time)].keys())
+
+    def get(self, t, evaluate_time, fields=None):
+        record = self._information[int(t)][int(evaluate_time)]
+        fields = record.keys() if fields is None else fields
+        return {name: np.array(record[name]) for name in fields if name in record}
+
+
+class StreamingJsonResultFile(ResultFile):
+    """用 ijson 流式解析的 JSON 结果，不会一次把整个 information 读入内存
+
+    打开时只解析 information 之前的 settings/metrics，读到 information 即停止；
+    在 information 之后才写 metrics 的旧文件不读取其 metrics（指标由种群重新计算）。
+    环境和评估次数的索引在第一次用到时扫描一遍建立，之后复用
+    """
+
+    def __init__(self, path):
+        super().__init__(path)
+        self._index = None
+        header = self._header()
+        self.settings = header.get('settings', {})
+        self.metrics = header.get('metrics', {})
+
+    def _header(self):
+        header = {}
+        with open(self.path, 'rb') as f:
+            events = ijson.parse(f, use_float=True)
+            for prefix, event, value in events:
+                if prefix != '' or event != 'map_key':
+                    continue
+                if value == 'information':
+                    break
+                # 用 ObjectBuilder 构建该键的值，容器闭合（或读到标量）时停止
+                builder = ijson.ObjectBuilder()
+                depth = 0
+                for _, event, item in events:
+                    builder.event(event, item)
+                    depth += (event in ('start_map', 'start_array')) - (event in ('end_map', 'end_array'))
+                    if depth == 0:
+                        break
+                header[value] = builder.value
+        return header
+
+    def _build_index(self):
+        if self._index is None:
+            index = {}
+            with open(self.path, 'rb') as f:
+                for current, event, value in ijson.parse(f, use_float=True):
+                    if event != 'map_key':
+                        continue
+                    if current == 'information':
+                        index[int(value)] = []
+                    elif current.startswith('information.') and current.count('.') == 1:
+                        index[int(current[len('information.'):])].append(int(value))
+            self._index = {t: sorted(evaluations) for t, evaluations in index.items()}
+        return self._index
+
+    def environments(self):
+        return sorted(self._build_index())
+
+    def evaluations(self, t):
+        return self._build_index().get(int(t), [])
+
+    def fields(self, t, evaluate_time):
+        return list(self.get(t, evaluate_time).keys())
+
+    def get(self, t, evaluate_time, fields=None):
+        # 随机读取某一代需要扫描到该记录为止；逐环境读取请用 iter_environments
+        with open(self.path, 'rb') as f:
+            record = next(ijson.items(f, f'information.{int(t)}.{int(evaluate_time)}', use_float=True), None)
+        if record is None:
+            raise KeyError((t, evaluate_time))
+        fields = record.keys() if fields is None else fields
+        return {name: np.array(record[name]) for name in fields if name in record}
+
+    def iter_environments(self, last_only=False, fields=None):
+        # 一次顺序扫描，每次只构建一个环境
+        with open(self.path, 'rb') as f:
+            for t, env in ijson.kvitems(f, 'information', use_float=True):
+                evaluations = sorted(env, key=int)
+                if last_only:
+                    evaluations = evaluations[-1:]
+                selected = {}
+                for e in evaluations:
+                    names = env[e].keys() if fields is None else [name for name in fields if name in env[e]]
+                    selected[int(e)] = {name: np.array(env[e][name]) for name in names}
+                yield int(t), selected
+
+
+class NpzResultFile(ResultFile):
+    def __init__(self, path):
+        super().__init__(path)
+        self._npz = np.load(path, allow_pickle=False)
+        self.settings = json.loads(str(self._npz['__settings__'])) if '__settings__' in self._npz.files else {}
+        self.metrics = json.loads(str(self._npz['__metrics__'])) if '__metrics__' in self._npz.files else {}
+        # 只解析数据集名称建立索引，数据本身在 get 时才解压
+        self._index = {}
+        for key in self._npz.files:
+            if not key.startswith('info/'):
+                continue
+            _, t, e, name = key.split('/', 3)
+            self._index.setdefault(int(t), {}).setdefault(int(e), []).append(name)
+
+    def environments(self):
+        return sorted(self._index)
+
+    def evaluations(self, t):
+        return sorted(self._index.get(int(t), {}))
+
+    def fields(self, t, evaluate_time):
+        return list(self._index[int(t)][int(evaluate_time)])
+
+    def get(self, t, evaluate_time, fields=None):
+        available = self._index[int(t)][int(evaluate_time)]
+        fields = available if fields is None else [name for name in fields if name in available]
+        return {name: self._npz[f"info/{int(t)}/{int(evaluate_time)}/{name}"] for name in fields}
+
+    def close(self):
+        self._npz.close()
+
+
+def write_json(path, result):
+    # settings/metrics 放在 information 之前，流式读取时不必扫描整个文件
+    order = ('settings', 'metrics', 'information')
+    result = dict({key: result[key] for key in order if key in result}, **result)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=None, separators=(',', ':'), default=_to_builtin)
+
+
+def write_npz(path, result):
+    arrays = {
+        '__settings__': np.array(json.dumps(result.get('settings', {}), default=_to_builtin)),
+        '__metrics__': np.array(json.dumps(result.get('metrics', {}), default=_to_builtin)),
+    }
+    for t, env in result.get('information', {}).items():
+        for e, record in env.items():
+            for name, value in record.items():
+                arrays[f"info/{int(t)}/{int(e)}/{name}"] = np.asarray(value)
+    # np.savez_compressed 需要文件对象以避免自动追加 .npz 后缀
+    with open(path, 'wb') as f:
+        np.savez_compressed(f, **arrays)
+
+
+# stream_reader：逐环境读取时使用的读取器，没有时使用 reader
+RESULT_FORMATS = {
+    'json': {'extension': '.json', 'writer': write_json, 'reader': JsonResultFile,
+             'stream_reader': StreamingJsonResultFile if ijson is not None else None},
+    'npz': {'extension': '.npz', 'writer': write_npz, 'reader': NpzResultFile},
+}
+
+
+def register_result_format(name, extension, writer, reader, stream_reader=None):
+    """注册新的结果存储后端，例如 HDF5/Parquet"""
+    RESULT_FORMATS[name] = {'extension': extension, 'writer': writer, 'reader': reader,
+                            'stream_reader': stream_reader}
+
+
+def result_extensions():
+    return tuple(spec['extension'] for spec in RESULT_FORMATS.values())
+
+
+def format_of(path):
+    """根据扩展名判断结果格式"""
+    extension = os.path.splitext(path)[1].lower()
+    for name, spec in RESULT_FORMATS.items():
+        if spec['extension'] == extension:
+            return name
+    raise ValueError(f"未知的结果文件格式: {path}")
+
+
+def write_result(path, result, result_format=None):
+    result_format = result_format or format_of(path)
+    if result_format not in RESULT_FORMATS:
+        raise ValueError(f"未知的结果文件格式: {result_format}")
+    RESULT_FORMATS[result_format]['writer'](path, result)
+
+
+_warned_formats = set()
+
+
+def open_result(path, stream=False):
+    """
+    打开结果文件，返回 ResultFile
+    :param stream: 是否优先使用流式读取器（只需要逐环境读取时使用）。npz 本身按需读取；
+                   json 只有安装了 ijson 时才是流式的，内存占用与运行长度无关，
+                   否则退回整体解析（内存随运行长度增长），并提示一次
+    """
+    result_format = format_of(path)
+    spec = RESULT_FORMATS[result_format]
+    reader = spec.get('stream_reader') if stream else None
+    if stream and reader is None and result_format == 'json' and result_format not in _warned_formats:
+        _warned_formats.add(result_format)
+        print("[结果读取] 未安装 ijson，JSON 结果将整体解析，内存占用随运行长度增长；"
+              "请执行 pip install ijson，或使用 npz 格式保存结果")
+    return (reader or spec['reader'])(path)
+
+
+def find_result_files(path):
+    """递归获取文件夹下所有受支持格式的结果文件"""
+    extensions = result_extensions()
+    if os.path.isfile(path):
+        return [path] if path.lower().endswith(extensions) else []
+    files = []
+    for root, _, names in os.walk(path):
+        for name in sorted(names):
+            if name.lower().endswith(extensions):
+                files.append(os.path.join(root, name))
+    return files
+
+
+def convert_result(path, result_format, remove=False):
+    """将单个结果文件转换为另一种格式，返回新文件路径"""
+    target = os.path.splitext(path)[0] + RESULT_FORMATS[result_format]['extension']
+    if target == path:
+        return path
+    with open_result(path) as source:
+        information = {t: {e: source.get(t, e) for e in source.evaluations(t)} for t in source.environments()}
+        result = {"settings": source.settings, "information": information, "metrics": source.metrics}
+    write_result(target, result, result_format)
+    if remove:
+        os.remove(path)
+    return target
+
+
+def convert_results(path, result_format='npz', remove=False):
+    """批量转换文件夹下的结果文件（已是目标格式的跳过）"""
+    converted = []
+    for file_path in find_result_files(path):
+        if format_of(file_path) == result_format:
+            continue
+        target = convert_result(file_path, result_format, remove)
+        print(f"[转换完成] {file_path} -> {target}")
+        converted.append(target)
+    return converted
@@ -1,38 +1,18 @@
-import importlib
-import os
 import time
 import traceback
 
 from matplotlib.gridspec import GridSpec
 
 from plots.test_module.draw_population import draw_IGD_curve, draw_PF, draw_PS, draw_selected_chart
-from utils.information_parser import convert_config_to_numeric
+from utils.information_parser import convert_config_to_numeric, load_plugin_class
 from utils.result_io import save_test_module_information_results
 from views.common.GlobalVar import global_vars
+from utils.pipe_listener import get_pipe_listener
+from utils.stream_protocol import StreamReceiver
 from multiprocessing import Manager, Pipe, Process
-import threading
-
-def load_main_class_from_folder(folder_path):
-    """
-    给定一个文件夹路径，加载其中的 main.py 并返回其中定义的类（与文件夹同名）
-    """
-    main_path = os.path.join(folder_path, "main.py")
-    module_name = os.path.basename(folder_path)
-
-    if not os.path.isfile(main_path):
-        raise FileNotFoundError(f"No main.py found in {folder_path}")
-
-    spec = importlib.util.spec_from_file_location(module_name, main_path)
-    module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(module)
-
-    # 默认类名就是文件夹名，例如 NSGA2 目录下就是 NSGA2 类
-    class_name = os.path.basename(folder_path)
-    if not hasattr(module, class_name):
-        raise AttributeError(f"{class_name} class not found in {main_path}")
-
-    return getattr(module, class_name)
 
+# 测试模式下两次重绘图表的最小间隔（秒），可通过 global_vars['test_module']['redraw_interval'] 调整
+REDRAW_INTERVAL = 0.1
 
 def run_in_test_mode(response_strategy, search_algorithm, problem_name, result_to_show: str, runtime_config: dict):
     """运行测试模式：已有子进程则恢复，否则启动新进程"""
@@ -61,11 +41,7 @@ def start_new_test_process(response_strategy, search_algorithm, problem_name, re
 
     save_state_in_test_mode(state, p, parent_conn,child_conn)
     p.start()
-    threading.Thread(
-        target=listen_pipe,
-        args=(parent_conn, p),
-        daemon=True
-    ).start()
+    listen_pipe(parent_conn, p)
 
 
 
@@ -76,9 +52,9 @@ def run_in_test_mode_process(response_strategy, search_algorithm, problem_name,
         print("Subprocess started for test mode optimization...")
 
         # 加载类
-        ResponseClass = load_main_class_from_folder(response_strategy['folder_name'])
-        SearchClass = load_main_class_from_folder(search_algorithm['folder_name'])
-        ProblemClass = load_main_class_from_folder(problem_name['folder_name'])
+        ResponseClass = load_plugin_class(response_strategy)
+        SearchClass = load_plugin_class(search_algorithm)
+        ProblemClass = load_plugin_class(problem_name)
 
         # 实例化对象
         response_instance = ResponseClass(**convert_config_to_numeric(runtime_config['selected_dynamic']))
@@ -86,6 +62,7 @@ def run_in_test_mode_process(response_strategy, search_algorithm, problem_name,
         problem_instance = ProblemClass(**convert_config_to_numeric(runtime_config['selected_problem']))
 
         search_instance.optimize(problem_instance, response_instance)
+        search_instance.finish(problem_instance)
     except Exception as e:
         print(f"[Error in subprocess]: {traceback.print_exc()}")
 
@@ -97,6 +74,7 @@ def save_state_in_test_mode(state, p, parent_conn,child_conn):
     global_vars['test_module']["child_conn"] = child_conn
     global_vars['process_manager'][p.name] = {"process_state": state, "current_process": p, "parent_conn": parent_conn, "child_conn":child_conn}
     global_vars['test_module']["runtime_populations"] = {}
+    global_vars['test_module']["metrics"] = {}
 
 
 def delete_state_in_test_mode():
@@ -132,6 +110,7 @@ def delete_state_in_test_mode():
         test_module["parent_conn"] = None
         test_module["child_conn"] = None
         test_module["runtime_populations"] = {}
+        test_module["metrics"] = {}
         
     except Exception as e:
         print(f"[错误] 清理状态时出错: {str(e)}")
@@ -143,45 +122,49 @@ def delete_state_in_test_mode():
 
 # 主进程监听 pipe
 def listen_pipe(parent_conn, process):
+    """把测试进程的管道注册到共用的事件驱动监听器上（不再单独开忙等线程）
+
+    消息按 utils.stream_protocol 还原后保存到 runtime_populations，图表刷新按 redraw_interval 秒合并为最新一帧
+    """
     print("[主进程] Pipe监听已启动")
+    # 在启动时禁用进度条
+    scale = global_vars['test_module'].get('scale')
+    if scale:
+        scale.configure(state='disabled')
+
+    receiver = StreamReceiver()
+
+    def on_message(message):
+        information = receiver.receive(message)
+        if information is not None:
+            save_runtime_population_information(information)
+
+    get_pipe_listener().register(
+        parent_conn,
+        on_message=on_message,
+        # 环境头和指标消息不触发重绘，重绘总是使用最新还原出的一代
+        on_latest=lambda message: draw_chart(receiver.last_information),
+        key=lambda message: None if message.get('type') in ('environment', 'metrics') else 0,
+        interval=global_vars['test_module'].get('redraw_interval', REDRAW_INTERVAL),
+        process=process,
+        on_close=lambda: on_test_pipe_closed(parent_conn)
+    )
+
+
+def on_test_pipe_closed(parent_conn):
+    """测试进程结束后的收尾：按需保存结果并恢复进度条"""
+    print("[主进程] 子进程已结束，Pipe监听结束")
+    scale = global_vars['test_module'].get('scale')
     try:
-        # 在启动时禁用进度条
-        scale = global_vars['test_module'].get('scale')
-        if scale:
-            scale.configure(state='disabled')
-            
-        while True:
-
-            # 检查子进程是否还活着
-            if not process.is_alive():
-                print("[主进程] 子进程已结束，Pipe监听线程退出")
-                break
-            # 安全地 poll Pipe
-            if parent_conn.poll():
-                try:
-                    information = parent_conn.recv()
-                    # print(f"[主进程] 收到子进程信息")
-                    save_runtime_population_information(information)
-                    draw_chart(information)
-                except EOFError:
-                    print("[主进程] Pipe连接已关闭（EOF）")
-                    break
-    except (BrokenPipeError, OSError) as e:
-        print(f"[主进程] Pipe监听异常中止: {e}")
-    finally:
-        print("[主进程] close parent")
-        # 在结束时启用进度条
-        scale = global_vars['test_module'].get('scale')
-        try:
-            # 检查是否需要保存结果
-            if global_vars['test_module']['save_result'].get():
-                print("正在保存运行数据")
-                save_test_module_information_results()
-        except Exception as e:
-            print(f"[主进程] 保存数据异常")
-        if scale:
-            scale.configure(state='normal')
-        parent_conn.close()
+        # 检查是否需要保存结果
+        if global_vars['test_module']['save_result'].get():
+            print("正在保存运行数据")
+            save_test_module_information_results()
+    except Exception as e:
+        print(f"[主进程] 保存数据异常")
+    if scale:
+        scale.configure(state='normal')
+    parent_conn.close()
 
 def canvas_draw(canvas,canvas_version):
     lock = global_vars['test_module']['canvas_lock']
@@ -206,6 +189,9 @@ def save_runtime_population_information(information):
 
     # 保存信息
     global_vars['test_module']["runtime_populations"][t][evaluate_times] = information
+    # 子进程累积的各环境指标
+    if "metrics" in information:
+        global_vars['test_module']["metrics"] = information["metrics"]
 
 
 def draw_chart(information):
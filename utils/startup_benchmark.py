@@ -0,0 +1,139 @@
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from utils.information_parser import get_root_dir
+
+# 启动阶段不应导入的重量级模块（应在第一次使用时才导入）
+HEAVY_MODULES = ('torch', 'scipy.stats', 'scipy.spatial', 'openpyxl', 'pandas')
+
+# 在子进程中创建主窗口：替换 mainloop，窗口第一次绘制完成后输出标记并退出
+_WINDOW_SCRIPT = """
+import sys, tkinter
+def _mainloop(self, n=0):
+    self.update()
+    loaded = [name for name in {heavy!r} if name in sys.modules]
+    print('WINDOW_READY', ','.join(loaded), flush=True)
+    self.destroy()
+tkinter.Misc.mainloop = _mainloop
+sys.path.insert(0, {root!r})
+from views.app_view import create_main_window
+create_main_window()
+"""
+
+_IMPORT_SCRIPT = """
+import sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+for name in {modules!r}:
+    __import__(name)
+loaded = [name for name in {heavy!r} if name in sys.modules]
+print('IMPORTED', time.perf_counter() - start, ','.join(loaded), flush=True)
+"""
+
+
+def _run_script(script, marker, timeout):
+    """在新的解释器中运行脚本，返回 (从启动进程到输出标记的秒数, 标记行其余字段)"""
+    root = get_root_dir()
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, '-c', script], cwd=root, stdout=subprocess.PIPE,
+                               stderr=subprocess.PIPE, text=True)
+    try:
+        for line in process.stdout:
+            if line.startswith(marker):
+                elapsed = time.perf_counter() - start
+                process.wait(timeout)
+                return elapsed, line.split()[1:]
+        _, error = process.communicate(timeout=timeout)
+        raise RuntimeError(error.strip().splitlines()[-1] if error.strip() else "子进程没有输出结果")
+    finally:
+        if process.poll() is None:
+            process.kill()
+
+
+def _loaded_modules(fields):
+    return [name for name in (fields[-1].split(',') if fields and fields[-1] else []) if name]
+
+
+def measure_import(modules=('views.app_view',), timeout=120):
+    """
+    在新的解释器中导入模块，统计导入耗时以及被连带导入的重量级模块
+    :return: {'seconds': 导入耗时, 'heavy_loaded': [重量级模块]}
+    """
+    script = _IMPORT_SCRIPT.format(root=get_root_dir(), modules=list(modules), heavy=HEAVY_MODULES)
+    _, fields = _run_script(script, 'IMPORTED', timeout)
+    heavy = _loaded_modules(fields[1:])
+    return {'seconds': float(fields[0]), 'heavy_loaded': heavy}
+
+
+def measure_time_to_window(timeout=120):
+    """
+    python main.py 从启动进程到主窗口第一次绘制完成的时间（需要图形界面）
+    :return: {'seconds': 耗时, 'heavy_loaded': [此时已导入的重量级模块]}
+    """
+    script = _WINDOW_SCRIPT.format(root=get_root_dir(), heavy=HEAVY_MODULES)
+    seconds, fields = _run_script(script, 'WINDOW_READY', timeout)
+    return {'seconds': seconds, 'heavy_loaded': _loaded_modules(fields)}
+
+
+def measure_time_to_first_generation(task, runs=2, timeout=600):
+    """
+    工作进程从启动到回传第一代进度的时间。同一个常驻工作进程上依次运行 runs 次，
+    第一次包含进程启动和模块导入（冷启动），之后的为热启动
+    :param task: 任务信息，字段与 ExperimentScheduler.submit 的 task 相同
+    :return: 每次运行的耗时列表（秒）
+    """
+    from utils.experiment_scheduler import ExperimentScheduler
+
+    scheduler = ExperimentScheduler(workers=1, progress_interval=0)
+    first_progress = threading.Event()
+    timings = []
+    try:
+        with tempfile.TemporaryDirectory() as save_path:
+            for i in range(runs):
+                first_progress.clear()
+
+                def on_progress(key, progress):
+                    if not first_progress.is_set():
+                        first_progress.set()
+                        scheduler.stop(key)
+
+                start = time.perf_counter()
+                scheduler.submit(task, save_path, key=i, on_progress=on_progress)
+                if not first_progress.wait(timeout):
+                    raise RuntimeError("等待第一代进度超时")
+                timings.append(time.perf_counter() - start)
+                scheduler.join(timeout)
+    finally:
+        scheduler.shutdown()
+    return timings
+
+
+def run_startup_benchmark(task, window=True, runs=2):
+    """输出启动耗时报告，返回结果字典"""
+    report = {}
+
+    try:
+        imported = measure_import()
+        report['import'] = imported
+        print(f"[启动] 导入界面模块: {imported['seconds']:.3f}s，"
+              f"重量级模块: {', '.join(imported['heavy_loaded']) or '无'}")
+    except Exception as e:
+        print(f"[启动] 无法导入界面模块: {e}")
+
+    if window:
+        try:
+            shown = measure_time_to_window()
+            report['window'] = shown
+            print(f"[启动] 主窗口显示: {shown['seconds']:.3f}s，"
+                  f"重量级模块: {', '.join(shown['heavy_loaded']) or '无'}")
+        except Exception as e:
+            print(f"[启动] 无法测量主窗口显示时间: {e}")
+
+    timings = measure_time_to_first_generation(task, runs)
+    report['first_generation'] = timings
+    for i, seconds in enumerate(timings):
+        print(f"[启动] 工作进程第 {i + 1} 个任务到第一代: {seconds:.3f}s{'（冷启动）' if i == 0 else ''}")
+    return report
@@ -0,0 +1,112 @@
+import numpy as np
+
+from components.ArrayPopulation import ArrayPopulation
+
+# 测试模式下子进程 -> 主进程的流式消息协议：
+#   environment 消息：每个环境（t 变化时）发送一次，携带 POS/POF/边界，首条额外携带 settings
+#   frame 消息：每代发送一次，只携带 X/F（有约束时还有 G）数组（可选 float32）和新增的环境指标
+#   metrics 消息：运行结束时发送一次，携带最后结束的环境指标
+# 主进程用 StreamReceiver 还原出与原来相同结构的 information 字典，界面与保存逻辑无需改动。
+
+
+class StreamSender:
+    def __init__(self, conn, dtype='float64'):
+        """
+        :param conn: 子进程端管道
+        :param dtype: 每代 X/F 的传输精度，'float64' 或 'float32'
+        """
+        self.conn = conn
+        self.dtype = np.dtype(dtype)
+        self._t = None
+        self._settings_sent = False
+        self._metrics_sent = set()
+
+    def send(self, problem, population, settings, metrics):
+        t = problem.t
+        if t != self._t:
+            message = {
+                'type': 'environment',
+                't': t,
+                'POS': problem.get_pareto_set(),
+                'POF': problem.get_pareto_front(),
+                'bound': [problem.xl, problem.xu],
+            }
+            if not self._settings_sent:
+                message['settings'] = settings
+                self._settings_sent = True
+            self.conn.send(message)
+            self._t = t
+
+        F = population.get_objective_matrix()
+        frame = {
+            'type': 'frame',
+            't': t,
+            'evaluate_times': problem.evaluate_time,
+            'X': np.asarray(population.get_decision_matrix(), dtype=self.dtype),
+            'F': np.asarray(F, dtype=self.dtype) if F.size else None,
+        }
+        G = population.get_constrain_matrix()
+        if G.size:
+            # 有约束的问题需要 G 判断可行性，保存结果时也会写入
+            frame['G'] = np.asarray(G, dtype=self.dtype)
+        new_metrics = self._new_metrics(metrics)
+        if new_metrics:
+            frame['metrics'] = new_metrics
+        self.conn.send(frame)
+
+    def send_metrics(self, metrics):
+        """发送尚未发送的环境指标（运行结束时最后一个环境的指标不会再随 frame 发送）"""
+        new_metrics = self._new_metrics(metrics)
+        if new_metrics:
+            self.conn.send({'type': 'metrics', 'metrics': new_metrics})
+
+    def _new_metrics(self, metrics):
+        # 只发送新结束环境的指标
+        new_metrics = {key: value for key, value in metrics.items() if key not in self._metrics_sent}
+        self._metrics_sent.update(new_metrics)
+        return new_metrics
+
+
+class StreamReceiver:
+    def __init__(self):
+        self.settings = None
+        self.environments = {}  # t -> {'POS', 'POF', 'bound'}
+        self.metrics = {}
+        self.last_information = None
+
+    def receive(self, message):
+        """
+        处理一条消息
+        :return: 还原后的 information 字典；environment 消息返回 None。旧格式的完整字典原样返回
+        """
+        kind = message.get('type') if isinstance(message, dict) else None
+        if kind is None:
+            self.last_information = message
+            return message
+        if kind == 'metrics':
+            # 原地更新：已还原的 information['metrics'] 与界面保存的指标引用同一个字典
+            self.metrics.update(message['metrics'])
+            return None
+        if kind == 'environment':
+            if 'settings' in message:
+                self.settings = message['settings']
+            self.environments[message['t']] = {key: message[key] for key in ('POS', 'POF', 'bound')}
+            return None
+
+        t = message['t']
+        environment = self.environments.get(t, {})
+        bound = environment.get('bound', [None, None])
+        self.metrics.update(message.get('metrics', {}))
+        population = ArrayPopulation(X=message['X'], F=message['F'], G=message.get('G'), xl=bound[0], xu=bound[1])
+        information = {
+            'settings': self.settings,
+            'POS': environment.get('POS'),
+            'POF': environment.get('POF'),
+            'bound': bound,
+            't': t,
+            'evaluate_times': message['evaluate_times'],
+            'population': population,
+            'metrics': self.metrics,
+        }
+        self.last_information = information
+        return information
@@ -2,7 +2,6 @@ import os
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import traceback
-import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
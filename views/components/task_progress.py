@@ -69,8 +69,7 @@ class TaskProgress(ttk.Frame):
         
 
 
-        self.process = None
-        self.process_state = None
+        self.process_state = None  # 运行该任务的工作进程状态（由调度器分配）
 
     
     def update_progress(self, value):
@@ -91,25 +90,7 @@ class TaskProgress(ttk.Frame):
     
     def destroy(self):            
         """销毁任务卡片，清理所有资源"""
-        # 清理进程
-        if hasattr(self, 'process') and self.process:
-            try:
-                self.process.terminate()
-                self.process.join(timeout=1)
-                if self.process.is_alive():
-                    self.process.kill()
-            except:
-                pass
-            self.process = None
-            
-        # 清理Manager
-        if hasattr(self, 'manager'):
-            try:
-                self.manager.shutdown()
-            except:
-                pass
-            self.manager = None
-            
+        # 任务运行在调度器的常驻工作进程中，卡片本身不持有进程
         # 清理状态
         if hasattr(self, 'process_state'):
             self.process_state = None
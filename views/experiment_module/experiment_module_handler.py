@@ -5,7 +5,7 @@ import os
 import ttkbootstrap as ttk
 from ttkbootstrap.dialogs import Messagebox
 
-from utils.run_executor_for_experiment import begin_running
+from utils.run_executor_for_experiment import begin_running, get_scheduler
 from views.common.GlobalVar import global_vars
 from utils.information_parser import get_dynamic_response_config, get_search_algorithm_config, get_problem_config
 from views.components.collapsible_frame import CollapsibleFrame
@@ -241,13 +241,10 @@ def on_remove_button_click(event=None):
             task.destroy()
         # 清空任务列表
         global_vars['experiment_module']['tasks'] = []
-        # 释放监听线程
-        
-        for task in tasks:
-            if task.process:
-                task.process.terminate()
-                task.process.join()
-                task.process = None
+        # 清空调度器队列并停止正在运行的任务（工作进程常驻，不终止）
+        scheduler = global_vars['experiment_module'].get('scheduler')
+        if scheduler is not None:
+            scheduler.cancel_all()
         gc.collect()
 
 def on_pause_button_click(event=None):
@@ -255,67 +252,59 @@ def on_pause_button_click(event=None):
     # 获取所有任务卡片
     task_cards = global_vars['experiment_module']['tasks']
     
-    # 找到所有运行中的任务
-    running_tasks = [card for card in task_cards if card.get_info()['status'] == 'running']
+    # 找到所有运行中（包括已提交排队）的任务
+    running_tasks = [card for card in task_cards if card.get_info()['status'] in ('running', 'queued')]
     # 找到所有暂停中的任务
     paused_tasks = [card for card in task_cards if card.get_info()['status'] == 'pause']
     
     if running_tasks:  # 如果有运行中的任务，则暂停它们
         # 更新所有运行中任务的状态
         for task in running_tasks:
-            if hasattr(task, 'process_state') and task.process_state:
-                task.process_state.value = 'pause'
+            if getattr(task, 'scheduler', None) is not None:
+                task.scheduler.pause(task)
             task.update_status('pause')
             task.status_label.configure(foreground='orange')  # 暂停状态显示为橙色
     elif paused_tasks:  # 如果有暂停的任务，则恢复它们
         # 更新所有暂停任务的状态
         for task in paused_tasks:
-            if hasattr(task, 'process_state') and task.process_state:
-                task.process_state.value = 'running'
-            task.update_status('running')
+            if getattr(task, 'scheduler', None) is not None:
+                task.scheduler.resume(task)
+            task.update_status('running' if task.process_state is not None else 'queued')
             task.status_label.configure(foreground='blue')  # 运行状态显示为蓝色
 
 def on_start_button_click(event=None):
     """开始按钮点击事件处理"""
-    # 获取并行进程数
-    parallel_processes = int(global_vars['experiment_module']['process_num'].get())
-    
     # 获取所有任务卡片
-    task_cards = global_vars['experiment_module']['tasks']
-    
-    # 计算当前运行中的任务数
-    running_count = sum(1 for card in task_cards if card.get_info()['status'] == 'running')
-    
-    # 如果运行中的任务数已经达到或超过并行进程数，直接返回
-    if running_count >= parallel_processes:
-        return
+    task_cards = global_vars['experiment_module'].get('tasks', [])
     
-    # 计算还可以启动多少个任务
-    available_slots = parallel_processes - running_count
-    
-    # 获取所有等待中的任务
+    # 所有等待中的任务一次性提交给调度器，由调度器按并行进程数和估计耗时（最长优先）安排运行
     waiting_tasks = [card for card in task_cards if card.get_info()['status'] == 'waiting']
-    
-    # 更新等待中的任务状态
-    for task in waiting_tasks[:available_slots]:
-        start_task(task)
+    for task in waiting_tasks:
+        start_task(task, dispatch=False)
+    if waiting_tasks:
+        get_scheduler().dispatch()
 
-def start_task(task):
-    """启动单个任务"""
-    # 更新任务状态为running
-    task.update_status('running')
+def start_task(task, dispatch=True):
+    """提交单个任务"""
+    # 更新任务状态为queued，真正开始运行时由调度器回调改为running
+    task.update_status('queued')
     # 更新界面显示
     task.update_progress(0)  # 重置进度条
-    # 更新任务卡片样式（如果需要）
-    task.status_label.configure(foreground='blue')  # 可以根据需要修改颜色
     # 开始运行任务，并传入完成回调函数
-    begin_running(task, on_task_complete)
+    begin_running(task, on_task_complete, dispatch)
+
+# 任务结束状态对应的显示颜色
+STATUS_COLORS = {'completed': 'green', 'stopped': 'gray', 'error': 'red'}
 
-def on_task_complete(completed_task):
-    """任务完成时的回调函数"""
-    # 任务完成后，尝试启动新的等待任务
+def on_task_complete(completed_task, status='completed'):
+    """任务结束（完成、停止或出错）时的回调函数
+    
+    Args:
+        completed_task: 结束的任务卡片
+        status: 调度器报告的结束状态
+    """
+    # 任务结束后，尝试启动新的等待任务
     on_start_button_click()
     
-    # 这里可以添加其他完成后的处理逻辑
-    completed_task.update_status('completed')
-    completed_task.status_label.configure(foreground='green')
\ No newline at end of file
+    completed_task.update_status(status)
+    completed_task.status_label.configure(foreground=STATUS_COLORS.get(status, 'black'))
\ No newline at end of file
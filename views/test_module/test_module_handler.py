@@ -250,6 +250,7 @@ def load_selected_result(selected_result):
     # 加载结果
     result = load_test_module_information_results(file_path)
     if result:
+        result['file_path'] = file_path
         # 更新global_vars中的数据
         if 'test_module' not in global_vars:
             global_vars['test_module'] = {}
@@ -425,16 +426,10 @@ def update_metric_display(result, metric_name, metric_value):
             metric_value.config(text="0.0000")
             return
             
-        # 根据指标类型计算值
-        from utils.metrics import calculate_MIGD, calculate_MGD, calculate_MHV
-        if metric_name == "MIGD":
-            value = calculate_MIGD(runtime_populations)
-        elif metric_name == "MGD":
-            value = calculate_MGD(runtime_populations)
-        elif metric_name == "MHV":
-            value = calculate_MHV(runtime_populations)
-        else:
-            raise ValueError(f"Unknown metric name: {metric_name}")
+        # 根据指标类型计算值，优先使用指标缓存和运行时已累积的各环境指标
+        from utils.result_io import file_metric
+        value = file_metric(result.get('file_path'), metric_name, runtime_populations, result.get('metrics'),
+                            settings=result.get('settings'))
             
         # 更新标签显示
         metric_value.config(text=f"{value:.4f}")